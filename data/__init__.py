@@ -2,7 +2,9 @@
 
 from . import matrix;
 from . import graph;
+from . import heap;
 from . import annoType;
 
 from .matrix import Matrix;
-from .graph import Graph;
+from .graph import Graph, CompactGraph;
+from .heap import IndexedHeap;
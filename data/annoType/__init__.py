@@ -8,11 +8,15 @@
 import typing;
 from typing import Type as _T;
 
+import abc;
+import random;
+import weakref;
 import collections as c;
 import functools as fts;
+import itertools as its;
 
-from ..shared import objName, objFullName, _slots, identity;
-from ..iters import iterAppend;
+from ...shared import objName, objFullName, _slots, identity;
+from ...iters import iterAppend;
 
 # meta = c.abc.ABCMeta;
 
@@ -30,6 +34,60 @@ def _same() -> typing.Sequence:
         NotImplemented,
     );
 
+def typeSignature(
+        obj: typing.Any,
+        budget: typing.Optional[int] = None) -> typing.Optional[typing.Hashable]:
+    '''
+        Return the structural type signature of `obj`
+
+        The signature is the type of `obj`, except for tuples (builtin,
+        subclasses such as named tuples, or annotated `Tuple`), whose
+        signature also contains the signatures of their elements; two objects with the same signature are therefore
+        indistinguishable by `isinstance` against `Union` and `Tuple`.
+
+        With `budget`, at most that many objects (`obj` and its nested
+        elements) are visited, and None is returned for larger structures.
+    '''
+    if budget is None:
+        cls: type = type(obj);
+        if issubclass(cls, tuple) or type(cls) is Subscript and cls.__bare__ is Tuple:
+            return (cls, *map(typeSignature, obj));
+        return cls;
+
+    left: typing.List[int] = [budget];
+    def signature(item: typing.Any) -> typing.Hashable:
+        left[0] -= 1;
+        cls: type = type(item);
+        if issubclass(cls, tuple) or type(cls) is Subscript and cls.__bare__ is Tuple:
+            if len(item) > left[0]:
+                raise OverflowError;
+            return (cls, *map(signature, item));
+        return cls;
+    try:
+        return signature(obj) if budget > 0 else None;
+    except OverflowError:
+        return None;
+
+def signatureDetermined(cls: typing.Any) -> bool:
+    '''
+        Whether `isinstance(obj, cls)` is determined by `typeSignature(obj)`;
+        true for plain classes and for `Union` and `Tuple` of such classes,
+        false for the element-checking containers such as `List`
+    '''
+    if not isinstance(cls, Subscript):
+        return True;
+    return cls.__bare__ in (Union, Tuple) and all(
+        signatureDetermined(arg) for arg in cls
+    );
+
+def _checkerOf(arg: typing.Any) -> typing.Callable[[object], bool]:
+    'Return the instance checker of a type argument; see Subscript'
+    if isinstance(arg, Subscript):
+        return arg._check; # pylint: disable=protected-access
+    if arg in _same():
+        arg = type(arg);
+    return lambda obj: isinstance(obj, arg);
+
 def _debugPrintArgs(func: callable, *args, **kwargs) -> typing.Any:
     print(f'func={func}; args={args}, kwargs={kwargs}');
     return func(*args, **kwargs);
@@ -50,6 +108,10 @@ class Subscript(type):
               defined to customize instance/subclass checking. Raising
               NotImplementedError is supported to indicate that the class
               cannot determine for the given situation.
+            * `cls.__instanceCompile__` can be defined as a classmethod of
+              format `(cls) -> ((obj) -> bool)` instead of `__instancehook__`;
+              it is called once when the class is created and the returned
+              checker, stored as `cls._check`, answers every `isinstance`.
             * `obj.__argValidate__` can be defined as a classmethod of
               format `(cls, arg) -> bool` to check whether current argument
               `arg` is of the desired type(s). `cls.__argsValidate__` is
@@ -72,6 +134,20 @@ class Subscript(type):
     #     '_args',
     # );
 
+    # parameterized classes interned by (class, canonical arguments);
+    # weak-valued so that unused parameterizations can be collected
+    __interned: typing.MutableMapping[
+        typing.Tuple['Subscript', typing.Hashable], 'Subscript'
+    ] = weakref.WeakValueDictionary();
+
+    # memoized `issubclass(subcls, cls)` as {cls: {subcls: bool}};
+    # weak-keyed on both levels, cleared whenever a new class is created
+    # or a class is registered with an ABC (see `abc.get_cache_token`)
+    __subclassMemo: typing.MutableMapping[
+        'Subscript', typing.MutableMapping[type, bool]
+    ] = weakref.WeakKeyDictionary();
+    __subclassToken: object = abc.get_cache_token();
+
     @property
     def isBare(cls: 'Subscript') -> bool:
         'Property to determine whether this class is bare class'
@@ -95,6 +171,12 @@ class Subscript(type):
         'Returns the desired class of args'
         return set if getattr(cls, '_useSet', False) else tuple;
 
+    def __canonical(cls: 'Subscript', args: typing.Iterable) -> typing.Hashable:
+        'Returns the hashable canonical form of args'
+        return (
+            frozenset if getattr(cls, '_useSet', False) else tuple
+        )(args);
+
     def __new__(
             cls: type,
             name: str,
@@ -118,8 +200,11 @@ class Subscript(type):
 
             Use `cls.__modArgs__` classmethod if present
         '''
-        # save the bare type in case someone needs it
-        if not getattr(cls, '_args', ''):
+        # save the bare type in case someone needs it; a class given its
+        # own (e.g. a sampling variant of a bare class) keeps it
+        if '__bare__' in vars(cls):
+            pass;
+        elif not getattr(cls, '_args', ''):
             cls.__bare__: 'Subscript' = cls;
         else:
             cls.__bare__: 'Subscript' = cls.__bare__ or cls;
@@ -142,10 +227,45 @@ class Subscript(type):
             cls, '_args', ()
         );
 
-    @fts.lru_cache()
-    def __class_getitem__(
+        # compile the instance checker once per class
+        cls._check: typing.Callable[[object], bool] = cls.__compileCheck();
+
+        # a new class can change subclass relations; forget them
+        Subscript.__subclassMemo.clear();
+
+    def __compileCheck(cls: 'Subscript') -> typing.Callable[[object], bool]:
+        '''
+            Return the instance checker of the class: `__instanceCompile__`
+            if defined; otherwise `__instancehook__` falling back to the
+            subclass check on NotImplementedError
+        '''
+        compiler: typing.Optional[callable] = getattr(
+            cls, '__instanceCompile__', None
+        );
+        if compiler is not None:
+            return compiler();
+
+        def fallback(obj: typing.Any) -> bool:
+            return issubclass(type(obj), cls);
+        hook: typing.Optional[callable] = getattr(cls, '__instancehook__', None);
+        if hook is None:
+            return fallback;
+        def check(obj: typing.Any) -> bool:
+            try:
+                return hook(obj);
+            except NotImplementedError:
+                return fallback(obj);
+        return check;
+
+    def __getitem__(
             cls: 'Subscript', args: typing.Sequence[typing.Any]) -> 'Subscript':
-        'Return a new type from cls[...] (cached)'
+        '''
+            Return a new type from cls[...]
+
+            The new types are interned: equivalent arguments (after
+            `__argsReduce__`, and regardless of order when `_useSet`)
+            always return the same class.
+        '''
         if not isinstance(args, (c.abc.Sequence, c.abc.Set)):
             return cls[args,];
         if not args:
@@ -157,7 +277,17 @@ class Subscript(type):
         if not all(_validate(arg) for arg in args):
             raise TypeError('Some args are not of the desired types. ');
 
-        return Subscript(
+        # reduce before interning so that equivalent args share one class
+        args = getattr(cls, '__argsReduce__', identity)(cls.__collection()(args));
+        key: typing.Tuple['Subscript', typing.Hashable] = (
+            cls, cls.__canonical(args)
+        );
+        try:
+            return Subscript.__interned[key];
+        except KeyError:
+            pass;
+
+        Subscript.__interned[key] = newcls = Subscript(
             # name of anonymous class
             f'{str(cls)}',
             # the new class is a descendent of current class `self`
@@ -169,24 +299,14 @@ class Subscript(type):
                 '__bare__': cls.__bare__,
             },
         );
+        return newcls;
 
-    # pylint: disable=protected-access
     def __eq__(cls: 'Subscript', other: type) -> bool:
         '''
-            Check equality:
-                first Subscript,
-                then checking `id(bare)`,
-                finally args
+            Check equality; since parameterized classes are interned,
+            equal classes are identical
         '''
-        return (
-            # Subscript
-            isinstance(other, Subscript) and
-            # check id of bare
-            id(cls.__bare__) == id(other.__bare__) and
-            # then check args
-            cls.__collection()(cls._args) ==
-            other.__collection()(other._args)
-        );
+        return cls is other;
 
     def __len__(cls: 'Subscript') -> int:
         'Return the length of pre-supplied arguments'
@@ -221,11 +341,8 @@ class Subscript(type):
             Determine whether `obj` is within the desired types;
             override isinstance function
         '''
-        # if __instancehook__ available, call it; otherwise not-implemented
-        try:
-            return getattr(cls, '__instancehook__', _notImplemented)(obj);
-        except NotImplementedError:
-            return issubclass(type(obj), cls);
+        # the checker is compiled when the class is created
+        return cls._check(obj);
 
     def __subclasscheck__(
             cls: 'Subscript',
@@ -233,7 +350,31 @@ class Subscript(type):
         '''
             Determine whether `subcls` is a subclass of desired types;
             override issubclass function
+
+            Results are memoized per `(cls, subcls)` until a new class is
+            created or a class is registered with an ABC.
         '''
+        token: object = abc.get_cache_token();
+        if token != Subscript.__subclassToken:
+            Subscript.__subclassMemo.clear();
+            Subscript.__subclassToken = token;
+        memo: typing.Optional[typing.MutableMapping[type, bool]] = \
+            Subscript.__subclassMemo.get(cls);
+        if memo is None:
+            memo = Subscript.__subclassMemo[cls] = weakref.WeakKeyDictionary();
+        try:
+            return memo[subcls];
+        except KeyError:
+            pass;
+        except TypeError:
+            # not weakly referenceable; do not memoize
+            return cls.__subclassCompute(subcls);
+        result: bool = cls.__subclassCompute(subcls);
+        memo[subcls] = result;
+        return result;
+
+    def __subclassCompute(cls: 'Subscript', subcls: type) -> bool:
+        'Compute `issubclass(subcls, cls)` without memoization'
         # if __subclasshook__ available, call it; otherwise not implemented
         try:
             return getattr(cls, '__subclasshook__', _notImplemented)(subcls);
@@ -259,8 +400,8 @@ class Subscript(type):
         return cls.__bare__[tuple(_add(cls._args, other._args))];
 
     def __hash__(cls: 'Subscript') -> int:
-        'Return the hash of this class'
-        return hash(tuple(cls._args));
+        'Return the hash of this class; consistent with identity equality'
+        return type.__hash__(cls);
 
 class Union(metaclass=Subscript):
     '''
@@ -321,12 +462,14 @@ class Union(metaclass=Subscript):
     __argValidate__: callable = classmethod(_argType);
 
     @classmethod
-    def __instancehook__(cls: Subscript, obj: object) -> bool:
+    def __instanceCompile__(cls: Subscript) -> typing.Callable[[object], bool]:
         '''
-            Called by metaclass `__instancecheck__` from `isinstance(obj, cls)`;
-            determine whether `obj` is of desired types
+            Called by metaclass when the class is created; return the checker
+            for `isinstance(obj, cls)` determining whether `obj` is of
+            desired types
         '''
-        return isinstance(obj, tuple(cls._args));
+        types: typing.Tuple[type, ...] = tuple(cls._args);
+        return lambda obj: isinstance(obj, types);
 
     @classmethod
     def __subclasshook__(cls: Subscript, subcls: type) -> bool:
@@ -385,7 +528,7 @@ class Tuple(metaclass=Subscript):
         if not cls._args:
             # if empty, override cls
             # pylint: disable=self-cls-assignment
-            cls = cls[[type(elem) for elem in data]];
+            cls = cls[tuple(type(elem) for elem in data)];
         # now return the created instance
         return super().__new__(cls);
 
@@ -397,26 +540,41 @@ class Tuple(metaclass=Subscript):
     __argValidate__: callable = classmethod(_argType);
 
     @classmethod
-    def __instancehook__(cls: Subscript, obj: object) -> bool:
+    def __instanceCompile__(cls: Subscript) -> typing.Callable[[object], bool]:
         '''
-            Invoked by metaclass `__instancecheck__` to check
-            whether `obj` is of type `cls`
+            Invoked by metaclass when the class is created; return the
+            checker for whether `obj` is of type `cls`
+
+            Builtin tuples are checked element by element in place, without
+            wrapping them into `Tuple` objects.
         '''
-        ## when obj not from Subscript
-        if not isinstance(type(obj), Subscript):
-            if not isinstance(obj, tuple):
-                raise NotImplementedError;
-            return isinstance(Tuple(obj), cls);
-        ## now obj meta'd from Subscript
-        # call subclasshook
-        # return issubclass(type(obj), cls);
-
-        # call it recursively to support recursive types
-        # check bare to avoid bad bare types causing invalid iter calls
-        return obj.__bare__ == cls and all(
-            isinstance(elem, _cls)
-            for (_cls, elem) in zip(cls, obj)
+        bare: Subscript = cls.__bare__;
+        isBare: bool = cls.isBare;
+        checkers: typing.Tuple[typing.Callable[[object], bool], ...] = tuple(
+            map(_checkerOf, cls._args)
         );
+        size: int = len(checkers);
+
+        def check(obj: typing.Any) -> bool:
+            objType: type = type(obj);
+            if isinstance(obj, tuple):
+                data: tuple = obj;
+            elif getattr(objType, '__bare__', None) is bare:
+                data: tuple = obj._tuple;
+            else:
+                ## when obj is neither tuple nor from Tuple
+                return issubclass(objType, cls);
+            # bare checker classes accept every tuple
+            if isBare:
+                return True;
+            if len(data) != size:
+                return False;
+            # call it recursively to support recursive types
+            for (_check, elem) in zip(checkers, data):
+                if not _check(elem):
+                    return False;
+            return True;
+        return check;
 
     @classmethod
     def __subclasshook__(cls: Subscript, subcls: type) -> bool:
@@ -486,30 +644,294 @@ class Tuple(metaclass=Subscript):
             raise TypeError;
         if isinstance(other, tuple):
             return self + Tuple(other);
-        return type(self).__bare__[
+        return (
+            # adding the classes already returns the concatenated class
             type(self) + type(other)
             # pylint: disable=protected-access
-        ](self._tuple + other._tuple);
+        )(self._tuple + other._tuple);
 
-class Iterable(metaclass=Subscript):
-    pass
+def _pick(
+        data: typing.Iterable, count: typing.Optional[int],
+        randomly: bool) -> typing.Iterable:
+    '''
+        Return the elements of `data` to check: all of them when `count` is
+        None, otherwise the first `count`, or `count` random ones of a
+        sequence when `randomly`
+    '''
+    if count is None:
+        return data;
+    if randomly and isinstance(data, c.abc.Sequence) and len(data) > count:
+        return map(data.__getitem__, random.sample(range(len(data)), count));
+    return its.islice(data, count);
+
+class _Sampled(metaclass=Subscript):
+    '''
+        The base of the element-checking containers
+
+        `isinstance` checks the container type, then a bounded number of
+        elements decided by the sampling mode of the class:
+            - `cls.head(n)`: the first `n` elements (default, n=64);
+            - `cls.sample(k)`: `k` random elements of a sequence (the first
+              `k` of other iterables, whose random access is not O(1));
+              mappings cannot be sampled randomly;
+            - `cls.full()`: every element.
+        Iterators are never consumed by `isinstance`, which only checks
+        their type; use `cls.wrap(iterable)` to check their elements lazily.
+    '''
+    __slots__: _slots = ();
+
+    # the builtin container type and the maximum number of arguments
+    _kind: type = object;
+    _arity: int = 1;
+    # (count or None for every element, whether randomly)
+    _sample: typing.Tuple[typing.Optional[int], bool] = (64, False);
+
+    __argValidate__: callable = classmethod(_argType);
+
+    @classmethod
+    def __new__(cls: Subscript, *_, **__) -> '_Sampled':
+        'Container checkers cannot be instantiated'
+        raise NotImplementedError;
+
+    @classmethod
+    def _elements(
+            cls: Subscript, obj: typing.Any) -> typing.Iterable[typing.Tuple]:
+        'Return the elements to check, each as the tuple of its parts'
+        (count, randomly) = cls._sample;
+        return zip(_pick(obj, count, randomly));
+
+    @classmethod
+    def __instanceCompile__(cls: Subscript) -> typing.Callable[[object], bool]:
+        '''
+            Invoked by metaclass when the class is created; return the
+            checker of the container type and of the sampled elements
+        '''
+        if len(cls._args) > cls._arity:
+            raise TypeError(
+                f'{cls.__bare__} takes at most {cls._arity} arguments'
+            );
+        kind: type = cls._kind;
+        if cls.isBare:
+            return lambda obj: isinstance(obj, kind);
+        checkers: typing.Tuple[typing.Callable[[object], bool], ...] = tuple(
+            map(_checkerOf, cls._args)
+        );
+        elements: callable = cls._elements;
+
+        def check(obj: typing.Any) -> bool:
+            if not isinstance(obj, kind):
+                return False;
+            for parts in elements(obj):
+                for (_check, part) in zip(checkers, parts):
+                    if not _check(part):
+                        return False;
+            return True;
+        return check;
+
+    @classmethod
+    def withSample(
+            cls: Subscript, count: typing.Optional[int],
+            randomly: bool = False) -> Subscript:
+        '''
+            Return the same checker with another sampling mode;
+            see `head`, `sample` and `full`
+        '''
+        if count is not None and count < 0:
+            raise ValueError(f'Sample size must be non-negative: {count}');
+        key: typing.Tuple = (cls, count, randomly);
+        try:
+            return _sampledClasses[key];
+        except KeyError:
+            pass;
+        _sampledClasses[key] = newcls = Subscript(
+            cls.__qualname__, (cls,),
+            {
+                '_args': cls._args,
+                '__bare__': cls.__bare__,
+                '_sample': (count, randomly),
+            },
+        );
+        return newcls;
+
+    @classmethod
+    def head(cls: Subscript, count: int) -> Subscript:
+        'Return the checker of the first `count` elements'
+        return cls.withSample(count);
+
+    @classmethod
+    def sample(cls: Subscript, count: int) -> Subscript:
+        'Return the checker of `count` random elements'
+        return cls.withSample(count, True);
+
+    @classmethod
+    def full(cls: Subscript) -> Subscript:
+        'Return the checker of every element'
+        return cls.withSample(None);
+
+# the sampling variants, interned as the parameterized classes
+_sampledClasses: typing.MutableMapping[typing.Tuple, Subscript] = \
+    weakref.WeakValueDictionary();
+
+class List(_Sampled):
+    '''
+        Check a list and its elements; `List[int]` checks a list of int
+
+        See `_Sampled` for the number of elements checked.
+    '''
+    __slots__: _slots = ();
+    _kind: type = list;
+
+class Mapping(_Sampled):
+    '''
+        Check a mapping and its items; `Mapping[str, int]` checks keys of
+        str and values of int, `Mapping[str]` checks only keys
+
+        See `_Sampled` for the number of items checked.
+    '''
+    __slots__: _slots = ();
+    _kind: type = c.abc.Mapping;
+    _arity: int = 2;
+
+    @classmethod
+    def _elements(
+            cls: Subscript, obj: typing.Any) -> typing.Iterable[typing.Tuple]:
+        'Return the (key, value) pairs to check'
+        (count, _) = cls._sample;
+        return _pick(obj.items(), count, False);
+
+    @classmethod
+    def withSample(
+            cls: Subscript, count: typing.Optional[int],
+            randomly: bool = False) -> Subscript:
+        '''
+            Return the same checker with another sampling mode; ValueError
+            if `randomly`, as items have no O(1) random access
+        '''
+        if randomly:
+            raise ValueError(f'{cls.__bare__} cannot be sampled randomly');
+        return super().withSample(count);
+
+class Iterable(_Sampled):
+    '''
+        Check an iterable; the elements of re-iterable collections are
+        checked as in `List`, iterators are checked by type only
+
+        `Iterable[int].wrap(iterable)` returns an iterator checking every
+        element as it is consumed, raising TypeError on the first bad one.
+    '''
+    __slots__: _slots = ();
+    _kind: type = c.abc.Iterable;
+
+    @classmethod
+    def _elements(
+            cls: Subscript, obj: typing.Any) -> typing.Iterable[typing.Tuple]:
+        'Return the elements to check; never consume an iterator'
+        if isinstance(obj, c.abc.Iterator):
+            return ();
+        return super()._elements(obj);
+
+    @classmethod
+    def wrap(cls: Subscript, iterable: typing.Iterable) -> typing.Iterator:
+        'Return an iterator over `iterable` checking elements lazily'
+        check: typing.Callable[[object], bool] = (
+            _checkerOf(cls._args[0]) if cls._args else lambda _: True
+        );
+        for (ind, elem) in enumerate(iterable):
+            if not check(elem):
+                raise TypeError(f'Element {ind} is not of {cls}: {elem!r}');
+            yield elem;
 
 class Iterator(Iterable):
-    pass
+    '''
+        Check an iterator by type; see `Iterable.wrap` to check its elements
+    '''
+    __slots__: _slots = ();
+    _kind: type = c.abc.Iterator;
 
-class Generator(metaclass=Subscript):
-    pass
+class Generator(Iterator):
+    '''
+        Check a generator by type; `Generator[Y, S, R]` follows typing,
+        with yield, send and return types
 
-class List(metaclass=Subscript):
-    pass
+        `Generator[Y, S, R].wrap(gen)` returns a generator checking every
+        yielded, sent (except None) and returned value, raising TypeError
+        on the first bad one.
+    '''
+    __slots__: _slots = ();
+    _kind: type = c.abc.Generator;
+    _arity: int = 3;
 
-class Mapping(metaclass=Subscript):
-    pass
+    @classmethod
+    def wrap(cls: Subscript, gen: typing.Generator) -> typing.Generator:
+        'Return a generator over `gen` checking values lazily'
+        return _CheckedGenerator(cls, gen);
 
+class _CheckedGenerator(c.abc.Generator):
+    'A generator proxy checking the values through it; see `Generator.wrap`'
+    __slots__: _slots = (
+        '_cls', '_gen',
+        # checkers for yield, send and return values
+        '_checks',
+    );
+
+    def __init__(
+            self: '_CheckedGenerator',
+            cls: Subscript, gen: typing.Generator) -> None:
+        'Record the checking class and the generator'
+        self._cls: Subscript = cls;
+        self._gen: typing.Generator = gen;
+        self._checks: typing.Tuple[typing.Callable[[object], bool], ...] = (
+            *map(_checkerOf, cls._args),
+            *(lambda _: True,) * (3 - len(cls._args)),
+        );
 
+    def __step(self: '_CheckedGenerator', step: callable) -> typing.Any:
+        'Advance the generator by `step` and check its outcome'
+        try:
+            value: typing.Any = step();
+        except StopIteration as stop:
+            if not self._checks[2](stop.value):
+                raise TypeError(
+                    f'Return value is not of {self._cls}: {stop.value!r}'
+                ) from None;
+            raise;
+        if not self._checks[0](value):
+            raise TypeError(f'Yield value is not of {self._cls}: {value!r}');
+        return value;
+
+    def send(self: '_CheckedGenerator', value: typing.Any) -> typing.Any:
+        'Send `value` into the generator; None is never checked'
+        if value is not None and not self._checks[1](value):
+            raise TypeError(f'Send value is not of {self._cls}: {value!r}');
+        return self.__step(lambda: self._gen.send(value));
+
+    def throw(
+            self: '_CheckedGenerator', typ: typing.Any,
+            val: typing.Any = None, tb: typing.Any = None) -> typing.Any:
+        'Raise an exception in the generator'
+        if val is None and tb is None:
+            return self.__step(lambda: self._gen.throw(typ));
+        return self.__step(lambda: self._gen.throw(typ, val, tb));
+
+# pylint: disable=wrong-import-position
+from . import bulk;
+from .bulk import ValidationReport, validate, validateColumns;
+from . import enforce;
+from .enforce import checked;
 
 __all__: typing.Tuple[str, ...] = (
     'Subscript',
     'Union',
     'Tuple',
+    'typeSignature',
+    'signatureDetermined',
+    'Iterable',
+    'Iterator',
+    'Generator',
+    'List',
+    'Mapping',
+    'ValidationReport',
+    'validate',
+    'validateColumns',
+    'checked',
 );
@@ -0,0 +1,237 @@
+#!/usr/bin/env -S python3 -i
+'''
+    Validate streams of records or column buffers against annoType schemas
+    in batches, instead of calling `isinstance` once per record
+'''
+# pylint: disable=invalid-name
+# pylint: disable=protected-access
+
+import typing;
+import itertools as its;
+
+from . import Subscript, Tuple, Union, _same;
+from ...shared import _slots;
+
+# the Python type produced by each kind of numeric buffer
+_kindType: typing.Mapping[str, type] = {
+    # NumPy dtype.kind
+    'b': bool, 'i': int, 'u': int, 'f': float, 'c': complex,
+    'U': str, 'S': bytes,
+};
+_codeType: typing.Mapping[str, type] = {
+    # array.array typecodes and memoryview formats
+    **dict.fromkeys('bBhHiIlLqQnN', int),
+    **dict.fromkeys('efd', float),
+    **dict.fromkeys('uw', str),
+    '?': bool,
+};
+
+class ValidationReport:
+    '''
+        The result of a bulk validation
+
+        A report is true when no failing row was found. `failures` holds
+        the indices of failing rows in ascending order; it contains every
+        failing row when validated with `full=True`, and only the first
+        one otherwise.
+    '''
+    __slots__: _slots = (
+        '_schema',
+        '_failures',
+        '_count',
+    );
+
+    def __init__(
+            self: 'ValidationReport', schema: type,
+            failures: typing.Sequence[int], count: int) -> None:
+        'Record the schema, the failing indices and the number of rows checked'
+        self._schema: type = schema;
+        self._failures: typing.Sequence[int] = failures;
+        self._count: int = count;
+
+    @property
+    def ok(self: 'ValidationReport') -> bool:
+        'Whether every checked row is valid'
+        return not self._failures;
+
+    @property
+    def first(self: 'ValidationReport') -> typing.Optional[int]:
+        'The index of the first failing row, or None'
+        return self._failures[0] if self._failures else None;
+
+    @property
+    def failures(self: 'ValidationReport') -> typing.Sequence[int]:
+        'The indices of failing rows'
+        return self._failures;
+
+    @property
+    def count(self: 'ValidationReport') -> int:
+        'The number of rows checked'
+        return self._count;
+
+    def __bool__(self: 'ValidationReport') -> bool:
+        return self.ok;
+
+    def __repr__(self: 'ValidationReport') -> str:
+        return (
+            f'{self.__class__.__qualname__}('
+            f'schema={self._schema}, '
+            f'failures={list(self._failures)!r}, '
+            f'count={self._count!r})'
+        );
+
+def _plain(schema: typing.Any) -> typing.Any:
+    'Interpret None and NotImplemented as their types'
+    return type(schema) if schema in _same() else schema;
+
+def _byType(schema: typing.Any) -> bool:
+    'Whether `isinstance(obj, schema)` depends only on `type(obj)`'
+    if not isinstance(schema, Subscript):
+        return True;
+    return schema.__bare__ is Union and not any(
+        isinstance(arg, Subscript) for arg in schema
+    );
+
+def _badIndices(
+        schema: typing.Any, items: typing.Sequence,
+        first: bool = False) -> typing.List[int]:
+    '''
+        Return the (ascending) indices of `items` that are not of `schema`;
+        only the first one, found without checking further, if `first`
+    '''
+    def pick(indices: typing.Iterable[int]) -> typing.List[int]:
+        return list(its.islice(indices, 1) if first else indices);
+
+    schema = _plain(schema);
+    check: typing.Callable[[object], bool] = (
+        schema._check if isinstance(schema, Subscript)
+        else lambda obj: isinstance(obj, schema)
+    );
+
+    if _byType(schema):
+        # check one representative per type, then map the verdicts back
+        representatives: typing.Dict[type, typing.Any] = dict(
+            zip(map(type, items), items)
+        );
+        badTypes: typing.Set[type] = {
+            cls for (cls, obj) in representatives.items() if not check(obj)
+        };
+        if not badTypes:
+            return [];
+        return pick(
+            ind for (ind, cls) in enumerate(map(type, items))
+            if cls in badTypes
+        );
+
+    if (
+            schema.__bare__ is Tuple and not schema.isBare and
+            set(map(type, items)) <= {tuple} and
+            set(map(len, items)) <= {len(schema)}):
+        # uniform builtin tuples: validate column by column
+        return _badColumns(schema, tuple(zip(*items)), len(items), first);
+
+    # otherwise check one by one
+    return pick(ind for (ind, ok) in enumerate(map(check, items)) if not ok);
+
+def _badColumns(
+        schema: Subscript, columns: typing.Sequence[typing.Sequence],
+        count: int, first: bool) -> typing.Sequence[int]:
+    '''
+        Return the (ascending) indices of the failing rows of `columns`
+        against the arguments of a `Tuple[...]` schema; only the first one
+        if `first`, checking each column only up to the first failing row
+        found so far
+
+        Typed buffers are checked once by their dtype; when one fails, every
+        row fails and `range(count)` is returned.
+    '''
+    bad: typing.Set[int] = set();
+    # the end of the rows still worth checking when `first`
+    end: int = count;
+    for (arg, column) in zip(schema, columns):
+        if not end:
+            break;
+        cls: typing.Optional[type] = _bufferType(column);
+        if cls is not None:
+            if not issubclass(cls, _plain(arg)):
+                # a typed buffer either passes or fails as a whole
+                return range(min(1, count)) if first else range(count);
+            continue;
+        found: typing.List[int] = _badIndices(
+            arg, column if end == count else column[:end], first
+        );
+        if first and found:
+            end = found[0];
+        bad.update(found);
+    return [end] if first and end < count else sorted(bad);
+
+def validate(
+        schema: type, rows: typing.Iterable[typing.Any],
+        *, full: bool = False, batch: int = 4096) -> ValidationReport:
+    '''
+        Validate every row of `rows` against `schema` in batches of `batch`
+
+        Within a batch, rows are checked one representative per type when
+        the schema only depends on types, and uniform builtin tuples against
+        a `Tuple[...]` schema are checked column by column. Unless `full`,
+        stop at the first batch with a failure and report only the first
+        failing row.
+    '''
+    if batch <= 0:
+        raise ValueError(f'Batch size must be positive: {batch}');
+    failures: typing.List[int] = [];
+    count: int = 0;
+    rows = iter(rows);
+    while True:
+        chunk: typing.List[typing.Any] = list(its.islice(rows, batch));
+        if not chunk:
+            break;
+        failures.extend(count + ind for ind in _badIndices(schema, chunk, not full));
+        count += len(chunk);
+        if failures and not full:
+            return ValidationReport(schema, failures[:1], count);
+    return ValidationReport(schema, failures, count);
+
+def _bufferType(column: typing.Any) -> typing.Optional[type]:
+    'Return the Python type stored in a typed buffer, or None if untyped'
+    dtype: typing.Any = getattr(column, 'dtype', None);
+    if dtype is not None:
+        # NumPy (or NumPy-like) arrays; object arrays are untyped
+        return _kindType.get(getattr(dtype, 'kind', 'O'));
+    code: typing.Optional[str] = getattr(
+        column, 'typecode', getattr(column, 'format', None)
+    );
+    return _codeType.get(code) if isinstance(code, str) else None;
+
+def validateColumns(
+        schema: type, columns: typing.Sequence[typing.Sequence[typing.Any]],
+        *, full: bool = False) -> ValidationReport:
+    '''
+        Validate column buffers against a `Tuple[...]` schema with one
+        argument per column; row `i` is `tuple(col[i] for col in columns)`
+
+        Typed buffers (NumPy arrays, `array.array`, `memoryview`) are
+        checked once by their dtype; a NumPy integer column is accepted
+        where `int` is expected, and a failing one fails every row. Other
+        columns are checked as in `validate`; unless `full`, each of them
+        only up to the first failing row found so far.
+    '''
+    if not isinstance(schema, Subscript) or schema.__bare__ is not Tuple:
+        raise TypeError(f'Column schema must be a Tuple[...]: {schema}');
+    if len(schema) != len(columns):
+        raise ValueError(
+            f'Expected {len(schema)} columns, got {len(columns)}'
+        );
+    lengths: typing.Set[int] = set(map(len, columns));
+    if len(lengths) > 1:
+        raise ValueError(f'Columns of different lengths: {sorted(lengths)}');
+    count: int = lengths.pop() if lengths else 0;
+    return ValidationReport(
+        schema, _badColumns(schema, columns, count, not full), count
+    );
+
+__all__: _slots = (
+    'ValidationReport',
+    'validate',
+    'validateColumns',
+);
@@ -0,0 +1,278 @@
+#!/usr/bin/env -S python3 -i
+'''
+    Enforce function annotations at runtime using annoType checkers
+'''
+# pylint: disable=invalid-name
+# pylint: disable=protected-access
+
+import os;
+import typing;
+import inspect;
+import weakref;
+import functools as fts;
+
+from . import _checkerOf, _same;
+from ...shared import _slots, objFullName;
+
+# environment variable overriding the mode of every decorated function;
+# read when a function is decorated
+ENV_MODE: str = 'ALGO_ANNOTYPE_CHECK';
+_modes: typing.Tuple[str, ...] = ('always', 'sampled', 'off',);
+
+_Check = typing.Callable[[object], bool];
+
+class CheckStats:
+    'The call and violation counters of a checked function'
+    __slots__: _slots = (
+        'calls',
+        'checked',
+        'violations',
+    );
+
+    def __init__(self: 'CheckStats') -> None:
+        'Start all counters from zero'
+        self.calls: int = 0;
+        self.checked: int = 0;
+        self.violations: int = 0;
+
+    def toDict(self: 'CheckStats') -> typing.Dict[str, int]:
+        'Turn the object into a dict'
+        return dict(
+            calls=self.calls,
+            checked=self.checked,
+            violations=self.violations,
+        );
+
+    def __repr__(self: 'CheckStats') -> str:
+        return f'stats{self.toDict()}';
+
+# counters by checked wrapper, so that functions of the same name (e.g.
+# redefined ones, or closures) are counted apart; dropped with the wrapper
+_stats: typing.MutableMapping[typing.Callable, CheckStats] = \
+    weakref.WeakKeyDictionary();
+
+def metrics() -> typing.Dict[str, typing.Dict[str, int]]:
+    '''
+        Return a snapshot of the counters of every live checked function,
+        by full name; later functions of the same name are numbered, as
+        in `name#2`
+    '''
+    result: typing.Dict[str, typing.Dict[str, int]] = {};
+    for (func, stats) in list(_stats.items()):
+        name: str = objFullName(func);
+        key: str = name;
+        num: int = 1;
+        while key in result:
+            num += 1;
+            key = f'{name}#{num}';
+        result[key] = stats.toDict();
+    return result;
+
+def resetMetrics() -> None:
+    'Reset the counters of every checked function'
+    for stats in list(_stats.values()):
+        stats.__init__();
+
+def _annotations(func: typing.Callable) -> typing.Mapping[str, typing.Any]:
+    'Return the resolved annotations of `func`, or the raw ones if unresolvable'
+    try:
+        return typing.get_type_hints(func);
+    except Exception: # pylint: disable=broad-except
+        return getattr(func, '__annotations__', {});
+
+def _checkable(annotation: typing.Any) -> bool:
+    'Whether the annotation is a class (including annoType ones) or None'
+    return isinstance(annotation, type) or annotation in _same();
+
+class _Signature:
+    '''
+        The precompiled argument checkers of a function
+
+        Positional parameters are looked up by index and then by name,
+        keyword-only ones by name; variadic parameters check each element.
+    '''
+    __slots__: _slots = (
+        '_pos', '_kw', '_varPos', '_varKw', '_names', '_ret',
+    );
+
+    def __init__(self: '_Signature', func: typing.Callable) -> None:
+        'Parse the annotations of `func` once'
+        hints: typing.Mapping[str, typing.Any] = _annotations(func);
+        def checkerOf(name: str) -> typing.Optional[typing.Tuple[_Check, typing.Any]]:
+            if name not in hints or not _checkable(hints[name]):
+                return None;
+            return (_checkerOf(hints[name]), hints[name]);
+
+        self._pos: typing.List[typing.Tuple[int, str, _Check, typing.Any]] = [];
+        self._kw: typing.List[typing.Tuple[str, _Check, typing.Any]] = [];
+        self._varPos: typing.Optional[typing.Tuple[int, str, _Check, typing.Any]] = None;
+        self._varKw: typing.Optional[typing.Tuple[str, _Check, typing.Any]] = None;
+        self._names: typing.Set[str] = set();
+
+        kind: type = inspect.Parameter;
+        params: typing.List[inspect.Parameter] = list(
+            inspect.signature(func).parameters.values()
+        );
+        for (ind, param) in enumerate(params):
+            self._names.add(param.name);
+            entry: typing.Optional[tuple] = checkerOf(param.name);
+            if param.kind in (kind.POSITIONAL_ONLY, kind.POSITIONAL_OR_KEYWORD):
+                if entry:
+                    self._pos.append((ind, param.name, *entry));
+            elif param.kind is kind.KEYWORD_ONLY:
+                if entry:
+                    self._kw.append((param.name, *entry));
+            elif param.kind is kind.VAR_POSITIONAL:
+                self._names.discard(param.name);
+                if entry:
+                    self._varPos = (ind, param.name, *entry);
+            elif param.kind is kind.VAR_KEYWORD:
+                self._names.discard(param.name);
+                if entry:
+                    self._varKw = (param.name, *entry);
+        self._ret: typing.Optional[typing.Tuple[_Check, typing.Any]] = \
+            checkerOf('return');
+
+    @property
+    def empty(self: '_Signature') -> bool:
+        'Whether there is nothing to check'
+        return not (
+            self._pos or self._kw or self._varPos or self._varKw or self._ret
+        );
+
+    def violation(
+            self: '_Signature', args: tuple,
+            kwargs: dict) -> typing.Optional[typing.Tuple[str, typing.Any, typing.Any]]:
+        'Return the first bad `(name, value, annotation)` of the arguments'
+        for (ind, name, check, ann) in self._pos:
+            if ind < len(args):
+                value: typing.Any = args[ind];
+            elif name in kwargs:
+                value: typing.Any = kwargs[name];
+            else:
+                # defaults are not checked
+                continue;
+            if not check(value):
+                return (name, value, ann);
+        for (name, check, ann) in self._kw:
+            if name in kwargs and not check(kwargs[name]):
+                return (name, kwargs[name], ann);
+        if self._varPos:
+            (ind, name, check, ann) = self._varPos;
+            for value in args[ind:]:
+                if not check(value):
+                    return (f'*{name}', value, ann);
+        if self._varKw:
+            (name, check, ann) = self._varKw;
+            for (key, value) in kwargs.items():
+                if key not in self._names and not check(value):
+                    return (f'**{name}[{key!r}]', value, ann);
+        return None;
+
+    def returnViolation(
+            self: '_Signature',
+            value: typing.Any) -> typing.Optional[typing.Tuple[str, typing.Any, typing.Any]]:
+        'Return `(name, value, annotation)` if the return value is bad'
+        if self._ret and not self._ret[0](value):
+            return ('return', value, self._ret[1]);
+        return None;
+
+def checked(
+        func: typing.Optional[typing.Callable] = None,
+        *, mode: str = 'always', every: int = 100, raises: bool = True,
+        onViolation: typing.Optional[typing.Callable[..., typing.Any]] = None
+        ) -> typing.Callable:
+    '''
+        Check the arguments and the return value of a function against its
+        annotations; only classes (including annoType classes such as
+        `Union[...]` and `Tuple[...]`) are checked, `typing` constructs and
+        unresolvable annotations are ignored
+
+        The annotations are parsed once into precompiled checkers.
+
+        How to decorate:
+            - @checked
+              def yourFunc(...): pass
+            - @checked(mode='sampled', every=1000, raises=False)
+              def yourFunc(...): pass
+        Modes:
+            - 'always': check every call;
+            - 'sampled': check one call out of `every`;
+            - 'off': return the function itself, without any wrapper.
+        The environment variable `ALGO_ANNOTYPE_CHECK`, when set to a mode,
+        overrides the mode of every function decorated afterwards.
+
+        Every wrapper counts its calls in its own `CheckStats`, its `stats`
+        attribute, also listed in `metrics()`. On violation, the counters
+        are updated, `onViolation(func, name, value, annotation)` is called
+        if supplied, and TypeError is raised if `raises`.
+    '''
+    if func is None:
+        return fts.partial(
+            checked,
+            mode=mode, every=every, raises=raises, onViolation=onViolation
+        );
+    mode = os.environ.get(ENV_MODE, '').strip().lower() or mode;
+    if mode not in _modes:
+        raise ValueError(f'Unknown mode {mode!r}; expected one of {_modes}');
+    if every <= 0:
+        raise ValueError(f'Sampling interval must be positive: {every}');
+
+    sig: _Signature = _Signature(func);
+    if mode == 'off' or sig.empty:
+        return func;
+    name: str = objFullName(func);
+    stats: CheckStats = CheckStats();
+
+    def violate(bad: typing.Tuple[str, typing.Any, typing.Any]) -> None:
+        stats.violations += 1;
+        if onViolation is not None:
+            onViolation(func, *bad);
+        if raises:
+            (what, value, ann) = bad;
+            raise TypeError(f'{name}: {what}={value!r} is not of {ann}');
+
+    def shouldCheck() -> bool:
+        stats.calls += 1;
+        if mode == 'sampled' and stats.calls % every:
+            return False;
+        stats.checked += 1;
+        return True;
+
+    def before(args: tuple, kwargs: dict) -> bool:
+        if not shouldCheck():
+            return False;
+        bad: typing.Optional[tuple] = sig.violation(args, kwargs);
+        if bad:
+            violate(bad);
+        return True;
+
+    def after(ret: typing.Any) -> typing.Any:
+        bad: typing.Optional[tuple] = sig.returnViolation(ret);
+        if bad:
+            violate(bad);
+        return ret;
+
+    if inspect.iscoroutinefunction(func):
+        @fts.wraps(func)
+        async def asyncWrapper(*args: typing.Any, **kwargs: typing.Any) -> typing.Any:
+            if not before(args, kwargs):
+                return await func(*args, **kwargs);
+            return after(await func(*args, **kwargs));
+        asyncWrapper.stats = _stats[asyncWrapper] = stats;
+        return asyncWrapper;
+
+    @fts.wraps(func)
+    def wrapper(*args: typing.Any, **kwargs: typing.Any) -> typing.Any:
+        if not before(args, kwargs):
+            return func(*args, **kwargs);
+        return after(func(*args, **kwargs));
+    wrapper.stats = _stats[wrapper] = stats;
+    return wrapper;
+
+__all__: _slots = (
+    'CheckStats',
+    'checked',
+    'metrics',
+    'resetMetrics',
+);
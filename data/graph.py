@@ -4,13 +4,17 @@
     A graph data structure
 '''
 
+import math;
 import typing;
+import operator as op;
 
 import itertools as its;
 import functools as fts;
+from array import array;
 
 from ..funcs import kd;
-from ..shared import funcChain, _slots, objName;
+from .heap import IndexedHeap;
+from ..shared import _slots, objName;
 
 Or = typing.Union;
 
@@ -31,13 +35,31 @@ class Vertex: #(int):
             value: int = 0,
             *, flag: bool = True, **__) -> None:
         ''
-        self._int: int = value;
+        self._int: int = int(value);
         self._flag: bool = flag;
 
     def __int__(self: 'Vertex') -> int:
         'Integer representation of this object'
         return self._int;
 
+    def __index__(self: 'Vertex') -> int:
+        return self._int;
+
+    def __hash__(self: 'Vertex') -> int:
+        'Hash as the vertex value, so that `Vertex(1)` and `1` share set slots'
+        return hash(self._int);
+
+    def __eq__(self: 'Vertex', other: typing.Any) -> bool:
+        'Vertices are equal to vertices and integers of the same value'
+        if isinstance(other, (Vertex, int)):
+            return self._int == int(other);
+        return NotImplemented;
+
+    def __lt__(self: 'Vertex', other: typing.Any) -> bool:
+        if isinstance(other, (Vertex, int)):
+            return self._int < int(other);
+        return NotImplemented;
+
     def __repr__(self: 'Vertex') -> str:
         return (
             f'{self.__class__.__qualname__}'
@@ -135,17 +157,19 @@ class Edge:
         'Return the tuple form of edge disregarding bidir flag'
         return (self._from, self._to);
 
+    def key(self: 'Edge') -> _Edge:
+        '''
+            Return the integer pair identifying the edge; sorted if
+            bidirectional, so that both orientations share the key
+        '''
+        (fromInt, toInt) = (self._from._int, self._to._int);
+        if self._bidir and toInt < fromInt:
+            return (toInt, fromInt);
+        return (fromInt, toInt);
+
     def __hash__(self: 'Edge') -> int:
         'Return the hash of an edge; if bidirectional, sort vertices first'
-        # if single directional
-        return hash(
-            funcChain(
-                # if bidirectional: sort and then to tuple
-                (tuple, sorted,) if self._bidir
-                # otherwise: do nothing
-                else ()
-            )(self.toTuple())
-        );
+        return hash(self.key());
 
     def __repr__(self: 'Edge') -> str:
         return self.__class__.__qualname__ + repr({
@@ -161,7 +185,9 @@ class Edge:
     def __eq__(self: 'Edge', other: 'Edge') -> bool:
         'Compare `self` and `other` and determine whether they are the same'
         # pylint: disable=protected-access
-        return self._bidir == other._bidir and hash(self) == hash(other);
+        if not isinstance(other, Edge):
+            return NotImplemented;
+        return self._bidir == other._bidir and self.key() == other.key();
 
     @classmethod
     def map(
@@ -175,13 +201,468 @@ class Edge:
         return map(lambda fromTo: Edge(fromTo=fromTo, bidir=bidir), iters);
         # return map(fts.partial(Edge, bidir=bidir), iters);
 
-class Graph:
+_Sources = Or[_V, typing.Iterable[_V]];
+# (ptr, ind, weights or None) of a CSR adjacency
+_CSR = typing.Tuple[array, array, typing.Optional[array]];
+class Traversal:
+    '''
+        Iterative traversals shared by the graph classes
+
+        A host class provides dense vertex slots: `numVerts`, `_slotOf`
+        (vertex value to slot, None if absent), `_valueOf` (the inverse),
+        `_succ` and `_pred` (out- and in-neighbor slots) and their
+        `_succWeighted` and `_predWeighted` variants, pairing slots with edge
+        weights for the shortest-path searches.  Visited slots are tracked in a
+        `bytearray` and parents in an `array('q')`, so that memory is a few
+        bytes per vertex; the walks are generators driven by an explicit
+        stack or queue, so they stop as soon as the caller does.
+    '''
+    __slots__: _slots = ();
+
+    def _slotOf(self: 'Traversal', vert: _V) -> typing.Optional[int]:
+        raise NotImplementedError;
+
+    def _valueOf(self: 'Traversal', slot: int) -> int:
+        raise NotImplementedError;
+
+    def _succ(self: 'Traversal', slot: int) -> typing.Iterable[int]:
+        raise NotImplementedError;
+
+    def _pred(self: 'Traversal', slot: int) -> typing.Iterable[int]:
+        raise NotImplementedError;
+
+    def _succWeighted(self: 'Traversal', slot: int) -> typing.Iterable[typing.Tuple[int, float]]:
+        raise NotImplementedError;
+
+    def _predWeighted(self: 'Traversal', slot: int) -> typing.Iterable[typing.Tuple[int, float]]:
+        raise NotImplementedError;
+
+    def _start(
+            self: 'Traversal',
+            sources: _Sources,
+            exclude: typing.Iterable[_V]) -> typing.Tuple[typing.List[int], bytearray]:
+        'Return the source slots and the visited bitmap with `exclude` marked'
+        if isinstance(sources, (int, Vertex)):
+            sources = (sources,);
+        visited: bytearray = bytearray(self.numVerts);
+        for vert in exclude:
+            slot: typing.Optional[int] = self._slotOf(vert);
+            if slot is not None:
+                visited[slot] = 1;
+        slots: typing.List[int] = [];
+        for vert in sources:
+            slot: typing.Optional[int] = self._slotOf(vert);
+            if slot is None:
+                raise KeyError(f'No such vertex: {vert!r}');
+            slots.append(slot);
+        return (slots, visited);
+
+    def _walkDFS(
+            self: 'Traversal', sources: _Sources,
+            depthLimit: typing.Optional[int] = None,
+            exclude: typing.Iterable[_V] = ()) -> typing.Iterator[typing.Tuple[int, int, int]]:
+        '''
+            Yield `(slot, parentSlot, depth)` in depth-first preorder, the
+            same order as the recursive traversal; `parentSlot` is -1 for
+            sources
+        '''
+        (slots, visited) = self._start(sources, exclude);
+        succ: typing.Callable = self._succ;
+        for source in slots:
+            if visited[source]:
+                continue;
+            visited[source] = 1;
+            yield (source, -1, 0);
+            if depthLimit is not None and depthLimit <= 0:
+                continue;
+            # stack of (slot, iterator over its remaining neighbors)
+            stack: typing.List[typing.Tuple[int, typing.Iterator[int]]] = [
+                (source, iter(succ(source)))
+            ];
+            while stack:
+                (parent, neighbors) = stack[-1];
+                for slot in neighbors:
+                    if not visited[slot]:
+                        break;
+                else:
+                    stack.pop();
+                    continue;
+                visited[slot] = 1;
+                yield (slot, parent, len(stack));
+                if depthLimit is None or len(stack) < depthLimit:
+                    stack.append((slot, iter(succ(slot))));
+
+    def _walkBFS(
+            self: 'Traversal', sources: _Sources,
+            depthLimit: typing.Optional[int] = None,
+            exclude: typing.Iterable[_V] = ()) -> typing.Iterator[typing.Tuple[int, int, int]]:
+        '''
+            Yield `(slot, parentSlot, depth)` level by level from all the
+            sources at once; `parentSlot` is -1 for sources
+        '''
+        (slots, visited) = self._start(sources, exclude);
+        succ: typing.Callable = self._succ;
+        frontier: typing.List[int] = [];
+        for source in slots:
+            if not visited[source]:
+                visited[source] = 1;
+                frontier.append(source);
+                yield (source, -1, 0);
+        depth: int = 0;
+        while frontier and (depthLimit is None or depth < depthLimit):
+            depth += 1;
+            level: typing.List[int] = [];
+            for parent in frontier:
+                for slot in succ(parent):
+                    if not visited[slot]:
+                        visited[slot] = 1;
+                        level.append(slot);
+                        yield (slot, parent, depth);
+            frontier = level;
+
+    def _walk(self: 'Traversal', mode: str) -> typing.Callable:
+        if mode not in ('dfs', 'bfs'):
+            raise ValueError(f"Unknown mode {mode!r}; expected 'dfs' or 'bfs'");
+        return self._walkDFS if mode == 'dfs' else self._walkBFS;
+
+    def iterDFS(
+            self: 'Traversal', sources: _Sources,
+            *, depthLimit: typing.Optional[int] = None,
+            exclude: typing.Iterable[_V] = ()) -> typing.Iterator[int]:
+        'Lazily yield the vertices reachable from `sources` in depth-first preorder'
+        valueOf: typing.Callable = self._valueOf;
+        return (valueOf(slot) for (slot, _, _) in self._walkDFS(sources, depthLimit, exclude));
+
+    def iterBFS(
+            self: 'Traversal', sources: _Sources,
+            *, depthLimit: typing.Optional[int] = None,
+            exclude: typing.Iterable[_V] = ()) -> typing.Iterator[int]:
+        'Lazily yield the vertices reachable from `sources` in breadth-first order'
+        valueOf: typing.Callable = self._valueOf;
+        return (valueOf(slot) for (slot, _, _) in self._walkBFS(sources, depthLimit, exclude));
+
+    def iterTreeEdges(
+            self: 'Traversal', sources: _Sources,
+            *, mode: str = 'dfs',
+            depthLimit: typing.Optional[int] = None,
+            exclude: typing.Iterable[_V] = ()) -> typing.Iterator[_Edge]:
+        '''
+            Lazily yield the `(parent, child)` edges of the DFS or BFS tree
+            (forest, for several sources) in visit order
+        '''
+        valueOf: typing.Callable = self._valueOf;
+        return (
+            (valueOf(parent), valueOf(slot))
+            for (slot, parent, _) in self._walk(mode)(sources, depthLimit, exclude)
+            if parent >= 0
+        );
+
+    def parents(
+            self: 'Traversal', sources: _Sources,
+            *, mode: str = 'bfs',
+            depthLimit: typing.Optional[int] = None,
+            exclude: typing.Iterable[_V] = ()) -> typing.Dict[int, typing.Optional[int]]:
+        'Return the parent of every reached vertex (None for sources)'
+        return {
+            self._valueOf(slot): None if parent < 0 else self._valueOf(parent)
+            for (slot, parent, _) in self._walk(mode)(sources, depthLimit, exclude)
+        };
+
+    def depths(
+            self: 'Traversal', sources: _Sources,
+            *, depthLimit: typing.Optional[int] = None,
+            exclude: typing.Iterable[_V] = ()) -> typing.Dict[int, int]:
+        'Return the number of edges on a shortest path to every reached vertex'
+        return {
+            self._valueOf(slot): depth
+            for (slot, _, depth) in self._walkBFS(sources, depthLimit, exclude)
+        };
+
+    def _path(
+            self: 'Traversal', mode: str,
+            fromVert: _Sources, toVert: _V,
+            exclude: typing.Iterable[_V],
+            depthLimit: typing.Optional[int]) -> typing.Tuple[Vertex, ...]:
+        'Walk until `toVert` is reached and follow the parents back'
+        target: typing.Optional[int] = self._slotOf(toVert);
+        if target is None:
+            return ();
+        return self._trace(
+            self._walk(mode)(fromVert, depthLimit, exclude), target, None
+        )[1];
+
+    def _trace(
+            self: 'Traversal',
+            walk: typing.Iterator[typing.Tuple[int, int, typing.Any]],
+            target: int, missing: typing.Any) -> typing.Tuple[typing.Any, typing.Tuple[Vertex, ...]]:
+        '''
+            Consume `walk` up to `target` and follow the parents back;
+            return the last field of the walk at `target` (depth or
+            distance) and the path, or `(missing, ())`
+        '''
+        parent: array = array('q', (-1,)) * self.numVerts;
+        for (slot, before, measure) in walk:
+            parent[slot] = before;
+            if slot == target:
+                break;
+        else:
+            return (missing, ());
+        path: typing.List[int] = [target];
+        while parent[path[-1]] >= 0:
+            path.append(parent[path[-1]]);
+        return (measure, tuple(Vertex.map(map(self._valueOf, reversed(path)))));
+
+    def dfs(
+            self: 'Traversal',
+            fromVert: _Sources, toVert: _V,
+            exclude: typing.Iterable[_V] = (),
+            *, depthLimit: typing.Optional[int] = None) -> typing.Sequence[Vertex]:
+        '''
+            Perform DFS (depth first) on graph and return the
+            first found path, avoiding `exclude`, or () if none
+        '''
+        return self._path('dfs', fromVert, toVert, exclude, depthLimit);
+
+    def bfs(
+            self: 'Traversal',
+            fromVert: _Sources, toVert: _V,
+            exclude: typing.Iterable[_V] = (),
+            *, depthLimit: typing.Optional[int] = None) -> typing.Sequence[Vertex]:
+        '''
+            Perform BFS (breadth first) on graph and return a path with the
+            fewest edges, avoiding `exclude`, or () if none
+        '''
+        return self._path('bfs', fromVert, toVert, exclude, depthLimit);
+
+    # region shortest paths
+    def _walkDijkstra(
+            self: 'Traversal', sources: _Sources,
+            exclude: typing.Iterable[_V] = (),
+            heuristic: typing.Optional[typing.Callable[[int], float]] = None,
+    ) -> typing.Iterator[typing.Tuple[int, int, float]]:
+        '''
+            Yield `(slot, parentSlot, distance)` as vertices are settled, in
+            order of distance from the nearest source or, with `heuristic`
+            (of a vertex value), of distance plus heuristic as in A*
+        '''
+        (slots, done) = self._start(sources, exclude);
+        (succ, valueOf) = (self._succWeighted, self._valueOf);
+        dist: array = array('d', (math.inf,)) * self.numVerts;
+        parent: array = array('q', (-1,)) * self.numVerts;
+        starts: typing.List[typing.Tuple[int, float]] = [];
+        for source in slots:
+            if not done[source] and dist[source]:
+                dist[source] = 0.0;
+                starts.append((source, 0.0 if heuristic is None else heuristic(valueOf(source))));
+        # one entry per unsettled vertex, lowered in place on relaxation
+        heap: IndexedHeap = IndexedHeap(starts);
+        while heap:
+            (slot, _) = heap.pop();
+            done[slot] = 1;
+            base: float = dist[slot];
+            yield (slot, parent[slot], base);
+            for (nextSlot, weight) in succ(slot):
+                total: float = base + weight;
+                if total < dist[nextSlot] and not done[nextSlot]:
+                    dist[nextSlot] = total;
+                    parent[nextSlot] = slot;
+                    heap.pushOrDecrease(
+                        nextSlot,
+                        total if heuristic is None
+                        else total + heuristic(valueOf(nextSlot))
+                    );
+
+    def dijkstra(
+            self: 'Traversal', sources: _Sources,
+            *, exclude: typing.Iterable[_V] = ()) -> typing.Tuple[
+                typing.Dict[int, float], typing.Dict[int, typing.Optional[int]]]:
+        '''
+            Return the distances from the nearest of `sources` and the
+            shortest-path parents (None for sources) of every reached vertex
+        '''
+        (dist, parents) = ({}, {});
+        valueOf: typing.Callable = self._valueOf;
+        for (slot, parent, distance) in self._walkDijkstra(sources, exclude):
+            dist[valueOf(slot)] = distance;
+            parents[valueOf(slot)] = None if parent < 0 else valueOf(parent);
+        return (dist, parents);
+
+    def nearestSources(
+            self: 'Traversal', sources: _Sources,
+            *, exclude: typing.Iterable[_V] = ()) -> typing.Dict[int, typing.Tuple[int, float]]:
+        'Return the nearest source and its distance for every reached vertex'
+        root: array = array('q', (-1,)) * self.numVerts;
+        nearest: typing.Dict[int, typing.Tuple[int, float]] = {};
+        valueOf: typing.Callable = self._valueOf;
+        for (slot, parent, distance) in self._walkDijkstra(sources, exclude):
+            # parents are settled before their children
+            root[slot] = slot if parent < 0 else root[parent];
+            nearest[valueOf(slot)] = (valueOf(root[slot]), distance);
+        return nearest;
+
+    def shortestPath(
+            self: 'Traversal',
+            fromVert: _Sources, toVert: _V,
+            *, heuristic: typing.Optional[typing.Callable[[int, int], float]] = None,
+            exclude: typing.Iterable[_V] = ()) -> typing.Tuple[float, typing.Tuple[Vertex, ...]]:
+        '''
+            Return the length and the vertices of a shortest path from
+            (the nearest of) `fromVert` to `toVert`, or `(inf, ())`
+
+            Dijkstra stops as soon as `toVert` is settled; with `heuristic`,
+            a function of `(vertex, toVert)` that never overestimates the
+            remaining distance and is consistent, the search is A*
+        '''
+        target: typing.Optional[int] = self._slotOf(toVert);
+        if target is None:
+            return (math.inf, ());
+        toValue: int = self._valueOf(target);
+        return self._trace(self._walkDijkstra(
+            fromVert, exclude,
+            None if heuristic is None else lambda value: heuristic(value, toValue)
+        ), target, math.inf);
+
+    def aStar(
+            self: 'Traversal',
+            fromVert: _Sources, toVert: _V,
+            heuristic: typing.Callable[[int, int], float],
+            *, exclude: typing.Iterable[_V] = ()) -> typing.Tuple[float, typing.Tuple[Vertex, ...]]:
+        'A* search; see `shortestPath`'
+        return self.shortestPath(fromVert, toVert, heuristic=heuristic, exclude=exclude);
+
+    def _ends(
+            self: 'Traversal',
+            fromVert: _V, toVert: _V,
+            exclude: typing.Iterable[_V]) -> typing.Optional[typing.Tuple[int, int, bytearray]]:
+        '''
+            Return the source and target slots and the bitmap of `exclude`,
+            or None if `toVert` is missing or either end is excluded;
+            KeyError if `fromVert` is missing, as in `shortestPath`
+        '''
+        ((source,), blocked) = self._start((fromVert,), exclude);
+        target: typing.Optional[int] = self._slotOf(toVert);
+        if target is None or blocked[source] or blocked[target]:
+            return None;
+        return (source, target, blocked);
+
+    def _join(
+            self: 'Traversal',
+            forward: array, backward: array, meet: int) -> typing.Tuple[Vertex, ...]:
+        'Join the paths from the source to `meet` and from `meet` to the target'
+        path: typing.List[int] = [meet];
+        while forward[path[-1]] >= 0:
+            path.append(forward[path[-1]]);
+        path.reverse();
+        while backward[path[-1]] >= 0:
+            path.append(backward[path[-1]]);
+        return tuple(Vertex.map(map(self._valueOf, path)));
+
+    def bidirectionalDijkstra(
+            self: 'Traversal',
+            fromVert: _V, toVert: _V,
+            *, exclude: typing.Iterable[_V] = ()) -> typing.Tuple[float, typing.Tuple[Vertex, ...]]:
+        '''
+            Return the length and the vertices of a shortest path from
+            `fromVert` to `toVert`, or `(inf, ())`, growing Dijkstra
+            searches from both ends (backwards along in-edges from
+            `toVert`) and stopping once their frontiers cannot improve on
+            the best meeting found; this settles far fewer vertices than a
+            one-sided search on large graphs
+        '''
+        ends: typing.Optional[typing.Tuple[int, int, bytearray]] = self._ends(
+            fromVert, toVert, exclude
+        );
+        if ends is None:
+            return (math.inf, ());
+        (source, target, blocked) = ends;
+        if source == target:
+            return (0.0, (Vertex(self._valueOf(source)),));
+        count: int = self.numVerts;
+        dist: typing.Tuple[array, array] = (
+            array('d', (math.inf,)) * count, array('d', (math.inf,)) * count,
+        );
+        parent: typing.Tuple[array, array] = (
+            array('q', (-1,)) * count, array('q', (-1,)) * count,
+        );
+        done: typing.Tuple[bytearray, bytearray] = (blocked, bytearray(blocked));
+        (dist[0][source], dist[1][target]) = (0.0, 0.0);
+        heaps: typing.Tuple[IndexedHeap, IndexedHeap] = (
+            IndexedHeap(((source, 0.0),)), IndexedHeap(((target, 0.0),)),
+        );
+        neighbors: typing.Tuple[typing.Callable, typing.Callable] = (
+            self._succWeighted, self._predWeighted,
+        );
+        (best, meet) = (math.inf, -1);
+        while heaps[0] and heaps[1] and heaps[0].peek()[1] + heaps[1].peek()[1] < best:
+            side: int = 0 if len(heaps[0]) <= len(heaps[1]) else 1;
+            (slot, base) = heaps[side].pop();
+            done[side][slot] = 1;
+            (near, far) = (dist[side], dist[1 - side]);
+            for (nextSlot, weight) in neighbors[side](slot):
+                total: float = base + weight;
+                if total < near[nextSlot] and not done[side][nextSlot]:
+                    near[nextSlot] = total;
+                    parent[side][nextSlot] = slot;
+                    heaps[side].pushOrDecrease(nextSlot, total);
+                if near[nextSlot] + far[nextSlot] < best:
+                    (best, meet) = (near[nextSlot] + far[nextSlot], nextSlot);
+        if meet < 0:
+            return (math.inf, ());
+        return (best, self._join(parent[0], parent[1], meet));
+
+    def bidirectionalBFS(
+            self: 'Traversal',
+            fromVert: _V, toVert: _V,
+            *, exclude: typing.Iterable[_V] = ()) -> typing.Tuple[Vertex, ...]:
+        '''
+            Return a path with the fewest edges from `fromVert` to `toVert`,
+            or (), expanding whole levels of the smaller of the two
+            frontiers until they meet
+        '''
+        ends: typing.Optional[typing.Tuple[int, int, bytearray]] = self._ends(
+            fromVert, toVert, exclude
+        );
+        if ends is None:
+            return ();
+        (source, target, blocked) = ends;
+        if source == target:
+            return (Vertex(self._valueOf(source)),);
+        count: int = self.numVerts;
+        parent: typing.Tuple[array, array] = (
+            array('q', (-1,)) * count, array('q', (-1,)) * count,
+        );
+        seen: typing.Tuple[bytearray, bytearray] = (blocked, bytearray(blocked));
+        (seen[0][source], seen[1][target]) = (1, 1);
+        frontier: typing.List[typing.List[int]] = [[source], [target]];
+        neighbors: typing.Tuple[typing.Callable, typing.Callable] = (self._succ, self._pred);
+        while frontier[0] and frontier[1]:
+            side: int = 0 if len(frontier[0]) <= len(frontier[1]) else 1;
+            (mine, other) = (seen[side], seen[1 - side]);
+            level: typing.List[int] = [];
+            for slot in frontier[side]:
+                for nextSlot in neighbors[side](slot):
+                    if mine[nextSlot]:
+                        continue;
+                    mine[nextSlot] = 1;
+                    parent[side][nextSlot] = slot;
+                    if other[nextSlot]:
+                        return self._join(parent[0], parent[1], nextSlot);
+                    level.append(nextSlot);
+            frontier[side] = level;
+        return ();
+    # endregion
+
+class Graph(Traversal):
     '''
         A graph contains a set of vertices and edges
 
         Use integers to represent unique vertices;
         use tuple of integers to represent unique edge pairs
 
+        Alongside the edge set the graph keeps adjacency indexes over dense
+        vertex slots (in order of first appearance), so that neighbor queries
+        cost O(degree); `freeze` packs them into CSR arrays
+
         See `__init__` for details on arguments
     '''
     __slots__: _slots = (
@@ -189,6 +670,13 @@ class Graph:
         '_verts', '_edges',
         # mode
         '_bidir',
+        # vertex value -> dense slot, and slot -> vertex value
+        '_ids', '_values',
+        # per slot: dict of out- and in-neighbor slots to edge weights
+        '_out', '_in',
+        # CSR form of (_out, _in) with weight columns built by freeze;
+        # None when mutable
+        '_csr',
     );
     def __init__(self: 'Graph', *args, **kwargs) -> None:
         '''
@@ -235,9 +723,18 @@ class Graph:
             Constructor with given vertices and edges;
             optionally specify whether the graph is bidirectional
         '''
-        self._verts: typing.Set[Vertex] = {*Vertex.map(verts)};
-        self._edges: typing.Set[Edge] = {*Edge.map(edges, bidir=bidir)};
+        self._verts: typing.Set[Vertex] = set();
+        self._edges: typing.Set[Edge] = set();
         self._bidir: bool = bidir;
+        self._ids: typing.Dict[int, int] = {};
+        self._values: typing.List[int] = [];
+        self._out: typing.List[typing.Dict[int, float]] = [];
+        self._in: typing.List[typing.Dict[int, float]] = [];
+        self._csr: typing.Optional[typing.Tuple[array, ...]] = None;
+        for vert in verts:
+            self.addVertex(vert);
+        for edge in Edge.map(edges, bidir=bidir):
+            self._link(edge);
     # (numVerts) and (edges or edgeMode)
     @__construct.register('numVerts',)
     @__construct.register('edges', 'edgeMode', mode='or', inner=True)
@@ -258,16 +755,17 @@ class Graph:
             raise NotImplementedError;
 
         # vertices currently is the range [0, nV)
-        verts = Vertex.map(range(numVerts));
+        verts = range(numVerts);
 
         # override edges if edgeMode is supplied
         if edgeMode == 'all':
-            edges = Edge.map(its.permutations(verts), bidir=bidir);
+            edges = (
+                its.combinations(verts, 2) if bidir
+                else its.permutations(verts, 2)
+            );
         elif edgeMode == 'none':
             edges = {};
 
-        # todo: extract vertex indices from edges
-        # currently: range of [0, nV)
         return self.__construct(
             self,
             # throw in the ignored just in case
@@ -310,67 +808,516 @@ class Graph:
             ')'
         );
 
-    def iterFromVert(self: 'Graph', fromVert: Vertex) -> typing.Iterable[Vertex]:
-        'A generator for all vertices B such that edge(A->B) exists'
-        return (
-            edge._to for edge in self._edges
-            if (
-                fromVert in edge.toTuple()
-                if self._bidir
-                else fromVert == edge._from
-            )
+    # region adjacency
+    @property
+    def numVerts(self: 'Graph') -> int:
+        return len(self._values);
+
+    @property
+    def numEdges(self: 'Graph') -> int:
+        return len(self._edges);
+
+    @property
+    def frozen(self: 'Graph') -> bool:
+        'Whether the adjacency is currently packed by `freeze`'
+        return self._csr is not None;
+
+    def _slot(self: 'Graph', vert: _V) -> int:
+        'Return the dense slot of `vert`, registering it if new'
+        value: int = int(vert);
+        slot: typing.Optional[int] = self._ids.get(value);
+        if slot is None:
+            slot = self._ids[value] = len(self._values);
+            self._values.append(value);
+            self._out.append({});
+            self._in.append({});
+            self._verts.add(vert if isinstance(vert, Vertex) else Vertex(value));
+            self._csr = None;
+        return slot;
+
+    def _link(self: 'Graph', edge: Edge, weight: float = 1.0) -> bool:
+        'Add `edge` to the edge set and the adjacency; False if present'
+        if weight < 0:
+            raise ValueError(f'Negative edge weight: {weight!r}');
+        if edge in self._edges:
+            return False;
+        self._edges.add(edge);
+        (source, target) = (self._slot(edge._from), self._slot(edge._to));
+        self._out[source][target] = weight;
+        self._in[target][source] = weight;
+        if self._bidir:
+            self._out[target][source] = weight;
+            self._in[source][target] = weight;
+        self._csr = None;
+        return True;
+
+    def addVertex(self: 'Graph', vert: _V) -> bool:
+        'Add a vertex; return False if it was already present'
+        count: int = len(self._values);
+        self._slot(vert);
+        return len(self._values) > count;
+
+    def addEdge(
+            self: 'Graph', fromVert: _V, toVert: _V,
+            weight: float = 1.0) -> bool:
+        '''
+            Add the edge `fromVert -> toVert` with a non-negative `weight`
+            (both ways if the graph is bidirectional), registering new
+            vertices; return False, keeping the old weight, if the edge was
+            already present
+        '''
+        return self._link(
+            Edge(fromVert=fromVert, toVert=toVert, bidir=self._bidir), weight
         );
 
-    def iterToVert(self: 'Graph', toVert: Vertex) -> typing.Iterable[Vertex]:
+    def removeEdge(self: 'Graph', fromVert: _V, toVert: _V) -> bool:
+        'Remove the edge `fromVert -> toVert`; return False if absent'
+        edge: Edge = Edge(fromVert=fromVert, toVert=toVert, bidir=self._bidir);
+        if edge not in self._edges:
+            return False;
+        self._edges.discard(edge);
+        (source, target) = (self._ids[int(fromVert)], self._ids[int(toVert)]);
+        self._out[source].pop(target, None);
+        self._in[target].pop(source, None);
+        if self._bidir:
+            self._out[target].pop(source, None);
+            self._in[source].pop(target, None);
+        self._csr = None;
+        return True;
+
+    def hasEdge(self: 'Graph', fromVert: _V, toVert: _V) -> bool:
+        'Whether the edge `fromVert -> toVert` exists, in O(1)'
+        source: typing.Optional[int] = self._ids.get(int(fromVert));
+        target: typing.Optional[int] = self._ids.get(int(toVert));
+        return source is not None and target is not None and target in self._out[source];
+
+    def weight(self: 'Graph', fromVert: _V, toVert: _V) -> float:
+        'The weight of the edge `fromVert -> toVert`; KeyError if absent'
+        source: typing.Optional[int] = self._ids.get(int(fromVert));
+        target: typing.Optional[int] = self._ids.get(int(toVert));
+        if source is None or target not in self._out[source]:
+            raise KeyError(f'No such edge: {(fromVert, toVert)!r}');
+        return self._out[source][target];
+
+    def freeze(self: 'Graph') -> 'Graph':
+        '''
+            Pack the adjacency into CSR arrays, `(outPtr, outInd, outWeight,
+            inPtr, inInd, inWeight)`, so that neighbors of slot `s` are the
+            contiguous run `ind[ptr[s]:ptr[s + 1]]`; any later mutation
+            drops them
+        '''
+        if self._csr is None:
+            csr: typing.List[array] = [];
+            for lists in (self._out, self._in):
+                ptr: array = array('q', its.accumulate(map(len, lists), initial=0));
+                ind: array = array('q', its.chain.from_iterable(lists));
+                weights: array = array('d', its.chain.from_iterable(
+                    map(dict.values, lists)
+                ));
+                csr.extend((ptr, ind, weights));
+            self._csr = tuple(csr);
+        return self;
+
+    def _slotOf(self: 'Graph', vert: _V) -> typing.Optional[int]:
+        return self._ids.get(int(vert));
+
+    def _valueOf(self: 'Graph', slot: int) -> int:
+        return self._values[slot];
+
+    def _succ(self: 'Graph', slot: int) -> typing.Iterable[int]:
+        'Out-neighbor slots of `slot`, in O(degree)'
+        if self._csr is not None:
+            (ptr, ind, _) = self._csr[:3];
+            return ind[ptr[slot]:ptr[slot + 1]];
+        return self._out[slot].keys();
+
+    def _pred(self: 'Graph', slot: int) -> typing.Iterable[int]:
+        'In-neighbor slots of `slot`, in O(degree)'
+        if self._csr is not None:
+            (ptr, ind, _) = self._csr[3:];
+            return ind[ptr[slot]:ptr[slot + 1]];
+        return self._in[slot].keys();
+
+    def _succWeighted(self: 'Graph', slot: int) -> typing.Iterable[typing.Tuple[int, float]]:
+        'Out-neighbor slots of `slot` with the edge weights'
+        if self._csr is not None:
+            (ptr, ind, weights) = self._csr[:3];
+            (start, stop) = (ptr[slot], ptr[slot + 1]);
+            return zip(ind[start:stop], weights[start:stop]);
+        return self._out[slot].items();
+
+    def _predWeighted(self: 'Graph', slot: int) -> typing.Iterable[typing.Tuple[int, float]]:
+        'In-neighbor slots of `slot` with the edge weights'
+        if self._csr is not None:
+            (ptr, ind, weights) = self._csr[3:];
+            (start, stop) = (ptr[slot], ptr[slot + 1]);
+            return zip(ind[start:stop], weights[start:stop]);
+        return self._in[slot].items();
+
+    def outDegree(self: 'Graph', vert: _V) -> int:
+        slot: typing.Optional[int] = self._ids.get(int(vert));
+        return 0 if slot is None else len(self._out[slot]);
+
+    def inDegree(self: 'Graph', vert: _V) -> int:
+        slot: typing.Optional[int] = self._ids.get(int(vert));
+        return 0 if slot is None else len(self._in[slot]);
+
+    def iterFromVert(self: 'Graph', fromVert: _V) -> typing.Iterable[Vertex]:
+        'A generator for all vertices B such that edge(A->B) exists'
+        slot: typing.Optional[int] = self._ids.get(int(fromVert));
+        if slot is None:
+            return iter(());
+        return Vertex.map(map(self._values.__getitem__, self._succ(slot)));
+
+    def iterToVert(self: 'Graph', toVert: _V) -> typing.Iterable[Vertex]:
         'A generator for all vertices A such that edge(A->B) exists'
+        slot: typing.Optional[int] = self._ids.get(int(toVert));
+        if slot is None:
+            return iter(());
+        return Vertex.map(map(self._values.__getitem__, self._pred(slot)));
+    # endregion
+
+class CompactGraph(Traversal):
+    '''
+        A graph over the dense vertices `[0, numVerts)` stored as columns
+
+        Edges are the parallel `array('q')` columns `_src` and `_dst`;
+        membership is a set of packed 64-bit keys `src << 32 | dst` (sorted
+        pair if bidirectional), kept unless `unique=False`, which allows
+        parallel edges and saves the set altogether.  Edge weights are the
+        `array('d')` column `_weights`, created by the first weight other
+        than 1.  Neighbor queries use CSR indexes built from the columns on
+        first use and dropped on mutation.  `Vertex` and `Edge` objects are only created on demand,
+        by `vertices`, `edges`, `iterFromVert` and `iterToVert`.
+    '''
+    __slots__: _slots = (
+        # number of vertices
+        '_count',
+        # edge columns; weights are None while all weights are 1
+        '_src', '_dst', '_weights',
+        # packed edge keys, or None if parallel edges are allowed
+        '_keys',
+        # mode
+        '_bidir',
+        # CSR (ptr, ind, weights) of out- and in-neighbors; None until needed
+        '_outCSR', '_inCSR',
+    );
+
+    def __init__(
+            self: 'CompactGraph',
+            numVerts: int = 0,
+            edges: typing.Iterable[_Edge] = (),
+            weights: typing.Optional[typing.Iterable[float]] = None,
+            *, bidir: bool = True, unique: bool = True) -> None:
+        '''
+            Initialize the graph with `numVerts` vertices and `edges` as
+            pairs of ints, optionally with the parallel iterable `weights`;
+            vertices named by edges are added as needed
+        '''
+        if numVerts < 0:
+            raise ValueError(f'Negative number of vertices: {numVerts}');
+        self._count: int = numVerts;
+        self._src: array = array('q');
+        self._dst: array = array('q');
+        self._weights: typing.Optional[array] = None;
+        self._keys: typing.Optional[typing.Set[int]] = set() if unique else None;
+        self._bidir: bool = bidir;
+        self._outCSR: typing.Optional[_CSR] = None;
+        self._inCSR: typing.Optional[_CSR] = None;
+        self.addEdges(edges, weights);
+
+    @classmethod
+    def fromGraph(cls: type, graph: 'Graph') -> 'CompactGraph':
+        '''
+            Convert a `Graph`; vertex `v` of the result is the `v`-th
+            vertex of `graph` in order of first appearance
+        '''
+        # pylint: disable=protected-access
+        compact: CompactGraph = cls(len(graph._values), bidir=graph._bidir);
+        pairs: typing.List[_Edge] = [
+            (graph._ids[edge._from._int], graph._ids[edge._to._int])
+            for edge in graph._edges
+        ];
+        compact.addEdges(pairs, (graph._out[source][target] for (source, target) in pairs));
+        return compact;
+
+    def __repr__(self: 'CompactGraph') -> str:
         return (
-            edge._from for edge in self._edges
-            if (
-                toVert in edge.toTuple()
-                if self._bidir
-                else toVert == edge._to
-            )
+            f'{objName(type(self))}('
+            f'numVerts={self._count!r}, '
+            f'numEdges={len(self._src)!r}, '
+            f'bidir={self._bidir!r}'
+            ')'
         );
 
-    def dfs(
-            self: 'Graph',
-            fromVert: Vertex, toVert: Vertex,
-            exclude: typing.Set[Vertex] = set()) -> typing.Sequence[Vertex]:
+    @property
+    def numVerts(self: 'CompactGraph') -> int:
+        return self._count;
+
+    @property
+    def numEdges(self: 'CompactGraph') -> int:
+        return len(self._src);
+
+    def _key(self: 'CompactGraph', fromVert: int, toVert: int) -> int:
+        'Pack an edge into a 64-bit key'
+        if self._bidir and toVert < fromVert:
+            (fromVert, toVert) = (toVert, fromVert);
+        return fromVert << 32 | toVert;
+
+    def _pair(self: 'CompactGraph', fromVert: _V, toVert: _V) -> _Edge:
         '''
-            Perform DFS (depth first) on graph and return the
-            first found path
+            Return the ends of an edge as ints; TypeError if they are not
+            integers, ValueError if out of the packable range [0, 2**32)
         '''
-        fromVert = Vertex(fromVert);
-        toVert = Vertex(toVert);
+        (fromVert, toVert) = (op.index(fromVert), op.index(toVert));
+        if not (0 <= fromVert < 1 << 32 and 0 <= toVert < 1 << 32):
+            raise ValueError(f'Vertex out of range [0, 2**32): {(fromVert, toVert)}');
+        return (fromVert, toVert);
 
-        if fromVert == toVert:
-            # return value includes from and to
-            return (fromVert,);
+    def addVertex(self: 'CompactGraph') -> int:
+        'Add a vertex and return it'
+        self._count += 1;
+        self._outCSR = self._inCSR = None;
+        return self._count - 1;
 
-        for nextVert in self.iterFromVert(fromVert):
-            # iterate over each neighbor
-            _dfs: typing.Sequence[Vertex] = self.dfs(
-                nextVert, toVert, exclude.union({fromVert,})
-            );
-            if _dfs:
-                return (fromVert,) + _dfs;
-        return ();
+    def _weightColumn(self: 'CompactGraph') -> array:
+        'Return the weight column, creating it with unit weights'
+        if self._weights is None:
+            self._weights = array('d', (1.0,)) * len(self._src);
+        return self._weights;
 
-    def bfs(
-            self: 'Graph',
-            fromVert: Vertex, toVert: Vertex,
-            exclude: typing.Set[Vertex] = set()) -> typing.Sequence[Vertex]:
-        'Perform BFS (breadth first) on graph and return the first found path'
-        fromVert = Vertex(fromVert);
-        toVert = Vertex(toVert);
+    def addEdge(
+            self: 'CompactGraph', fromVert: _V, toVert: _V,
+            weight: float = 1.0) -> bool:
+        '''
+            Add the edge `fromVert -> toVert` with a non-negative `weight`,
+            growing the vertex range if needed; return False if the edge was
+            already present
+        '''
+        (fromVert, toVert) = self._pair(fromVert, toVert);
+        if weight < 0:
+            raise ValueError(f'Negative edge weight: {weight!r}');
+        if self._keys is not None:
+            key: int = self._key(fromVert, toVert);
+            if key in self._keys:
+                return False;
+            self._keys.add(key);
+        if weight != 1 or self._weights is not None:
+            self._weightColumn().append(weight);
+        self._src.append(fromVert);
+        self._dst.append(toVert);
+        self._count = max(self._count, fromVert + 1, toVert + 1);
+        self._outCSR = self._inCSR = None;
+        return True;
 
-        if fromVert == toVert:
-            # return value includes from and to
-            return (fromVert,);
+    def addEdges(
+            self: 'CompactGraph',
+            edges: typing.Iterable[_Edge],
+            weights: typing.Optional[typing.Iterable[float]] = None) -> int:
+        '''
+            Add edges given as pairs of ints, optionally with the parallel
+            iterable `weights`; return the number added
 
-        raise NotImplementedError;
+            Each pair is checked as by `addEdge` before it is packed; on
+            the first bad pair or weight, the edges added so far by this
+            call are taken back and the error is raised.
+        '''
+        count: int = len(self._src);
+        (src, dst, keys, pack) = (self._src, self._dst, self._keys, self._key);
+        top: int = self._count - 1;
+        column: typing.Optional[array] = (
+            self._weightColumn() if weights is not None else self._weights
+        );
+        try:
+            for ((fromVert, toVert), weight) in zip(
+                    edges, its.repeat(1.0) if weights is None else weights):
+                (fromVert, toVert) = self._pair(fromVert, toVert);
+                if weight < 0:
+                    raise ValueError(f'Negative edge weight: {weight!r}');
+                if keys is not None:
+                    key: int = pack(fromVert, toVert);
+                    if key in keys:
+                        continue;
+                    keys.add(key);
+                src.append(fromVert);
+                dst.append(toVert);
+                if column is not None:
+                    column.append(weight);
+                top = max(top, fromVert, toVert);
+        except BaseException:
+            if keys is not None:
+                keys.difference_update(map(pack, src[count:], dst[count:]));
+            del src[count:], dst[count:];
+            if column is not None:
+                del column[count:];
+            raise;
+        self._count = top + 1;
+        self._outCSR = self._inCSR = None;
+        return len(src) - count;
+
+    def removeEdge(self: 'CompactGraph', fromVert: _V, toVert: _V) -> bool:
+        '''
+            Remove the edge `fromVert -> toVert` (one copy of it if parallel
+            edges are allowed) in O(E), by moving the last edge into its
+            place; return False if absent
+        '''
+        key: int = self._key(int(fromVert), int(toVert));
+        if self._keys is not None:
+            if key not in self._keys:
+                return False;
+            self._keys.discard(key);
+        (src, dst) = (self._src, self._dst);
+        for ind in range(len(src)):
+            if self._key(src[ind], dst[ind]) == key:
+                (src[ind], dst[ind]) = (src[-1], dst[-1]);
+                del src[-1], dst[-1];
+                if self._weights is not None:
+                    self._weights[ind] = self._weights[-1];
+                    del self._weights[-1];
+                self._outCSR = self._inCSR = None;
+                return True;
+        return False;
+
+    def hasEdge(self: 'CompactGraph', fromVert: _V, toVert: _V) -> bool:
+        '''
+            Whether the edge `fromVert -> toVert` exists; O(1) with the key
+            set, O(degree) otherwise
+        '''
+        (fromVert, toVert) = (int(fromVert), int(toVert));
+        if self._keys is not None:
+            return self._key(fromVert, toVert) in self._keys;
+        return 0 <= fromVert < self._count and toVert in self._succ(fromVert);
+
+    def weight(self: 'CompactGraph', fromVert: _V, toVert: _V) -> float:
+        '''
+            The weight of the edge `fromVert -> toVert` (the first one, if
+            parallel), in O(degree); KeyError if absent
+        '''
+        (fromVert, toVert) = (int(fromVert), int(toVert));
+        if 0 <= fromVert < self._count:
+            for (vert, weight) in self._succWeighted(fromVert):
+                if vert == toVert:
+                    return weight;
+        raise KeyError(f'No such edge: {(fromVert, toVert)!r}');
+
+    # region CSR
+    def _buildCSR(self: 'CompactGraph', heads: array, tails: array) -> _CSR:
+        'Counting sort of edges by `heads` (and by `tails` if bidirectional)'
+        column: typing.Optional[array] = self._weights;
+        if self._bidir:
+            (heads, tails) = (heads + tails, tails + heads);
+            column = None if column is None else column + column;
+        ptr: array = array('q', bytes(8 * (self._count + 1)));
+        for head in heads:
+            ptr[head + 1] += 1;
+        ptr = array('q', its.accumulate(ptr));
+        fill: array = ptr[:-1];
+        ind: array = array('q', bytes(8 * len(heads)));
+        weights: typing.Optional[array] = None;
+        if column is None:
+            for (head, tail) in zip(heads, tails):
+                ind[fill[head]] = tail;
+                fill[head] += 1;
+        else:
+            weights = array('d', bytes(8 * len(heads)));
+            for (head, tail, weight) in zip(heads, tails, column):
+                ind[fill[head]] = tail;
+                weights[fill[head]] = weight;
+                fill[head] += 1;
+        return (ptr, ind, weights);
+
+    def freeze(self: 'CompactGraph') -> 'CompactGraph':
+        'Build the CSR indexes now rather than on first use'
+        self._out();
+        if not self._bidir:
+            self._in();
+        return self;
+
+    def _out(self: 'CompactGraph') -> _CSR:
+        if self._outCSR is None:
+            self._outCSR = self._buildCSR(self._src, self._dst);
+        return self._outCSR;
+
+    def _in(self: 'CompactGraph') -> _CSR:
+        if self._bidir:
+            return self._out();
+        if self._inCSR is None:
+            self._inCSR = self._buildCSR(self._dst, self._src);
+        return self._inCSR;
+
+    def _slotOf(self: 'CompactGraph', vert: _V) -> typing.Optional[int]:
+        vert = int(vert);
+        return vert if 0 <= vert < self._count else None;
+
+    def _valueOf(self: 'CompactGraph', slot: int) -> int:
+        return slot;
+
+    def _succ(self: 'CompactGraph', vert: int) -> typing.Sequence[int]:
+        'Out-neighbors of `vert`, in O(degree)'
+        (ptr, ind, _) = self._out();
+        return ind[ptr[vert]:ptr[vert + 1]];
+
+    def _pred(self: 'CompactGraph', vert: int) -> typing.Sequence[int]:
+        'In-neighbors of `vert`, in O(degree)'
+        (ptr, ind, _) = self._in();
+        return ind[ptr[vert]:ptr[vert + 1]];
+
+    def _weighted(
+            self: 'CompactGraph', csr: _CSR,
+            vert: int) -> typing.Iterable[typing.Tuple[int, float]]:
+        (ptr, ind, weights) = csr;
+        (start, stop) = (ptr[vert], ptr[vert + 1]);
+        return zip(
+            ind[start:stop],
+            its.repeat(1.0) if weights is None else weights[start:stop]
+        );
+
+    def _succWeighted(self: 'CompactGraph', vert: int) -> typing.Iterable[typing.Tuple[int, float]]:
+        'Out-neighbors of `vert` with the edge weights'
+        return self._weighted(self._out(), vert);
+
+    def _predWeighted(self: 'CompactGraph', vert: int) -> typing.Iterable[typing.Tuple[int, float]]:
+        'In-neighbors of `vert` with the edge weights'
+        return self._weighted(self._in(), vert);
+    # endregion
+
+    def outDegree(self: 'CompactGraph', vert: _V) -> int:
+        slot: typing.Optional[int] = self._slotOf(vert);
+        if slot is None:
+            return 0;
+        (ptr, _, _) = self._out();
+        return ptr[slot + 1] - ptr[slot];
+
+    def inDegree(self: 'CompactGraph', vert: _V) -> int:
+        slot: typing.Optional[int] = self._slotOf(vert);
+        if slot is None:
+            return 0;
+        (ptr, _, _) = self._in();
+        return ptr[slot + 1] - ptr[slot];
+
+    def iterFromVert(self: 'CompactGraph', fromVert: _V) -> typing.Iterable[Vertex]:
+        'A generator for all vertices B such that edge(A->B) exists'
+        slot: typing.Optional[int] = self._slotOf(fromVert);
+        if slot is None:
+            return iter(());
+        return Vertex.map(self._succ(slot));
+
+    def iterToVert(self: 'CompactGraph', toVert: _V) -> typing.Iterable[Vertex]:
+        'A generator for all vertices A such that edge(A->B) exists'
+        slot: typing.Optional[int] = self._slotOf(toVert);
+        if slot is None:
+            return iter(());
+        return Vertex.map(self._pred(slot));
+
+    def vertices(self: 'CompactGraph') -> typing.Iterable[Vertex]:
+        return Vertex.map(range(self._count));
 
+    def edges(self: 'CompactGraph') -> typing.Iterable[Edge]:
+        return Edge.map(zip(self._src, self._dst), bidir=self._bidir);
 
+    def edge(self: 'CompactGraph', ind: int) -> Edge:
+        'The `ind`-th edge in insertion order (as changed by removals)'
+        return Edge(self._src[ind], self._dst[ind], bidir=self._bidir);
 
 def debug() -> None:
     # pylint: disable=all
@@ -405,5 +1352,7 @@ debug();
 __all__: _slots = (
     'Vertex',
     'Edge',
+    'Traversal',
     'Graph',
+    'CompactGraph',
 );
@@ -0,0 +1,206 @@
+#!/usr/bin/env -S python3 -i
+# pylint: disable=invalid-name
+'''
+    An indexed d-ary min-heap
+
+    Every item appears at most once and is its own handle: a position index
+    maps items to their places in the heap, so that `decreaseKey` and
+    `remove` find them in O(1) and restore the heap in O(log n) (a sift up
+    costs log_d n comparisons, a sift down d log_d n). Unlike `heapq` with
+    lazy deletion, the heap holds one entry per item, e.g. at most V
+    entries in a shortest-path search.
+'''
+
+import typing;
+
+from ..shared import _slots;
+
+class IndexedHeap:
+    '''
+        A min-heap of hashable items with priorities compared by `<`
+
+        Items and priorities are kept in two parallel lists in `arity`-ary
+        heap order, and `_index` maps each item to its position.
+    '''
+    __slots__: _slots = (
+        # number of children per node
+        '_arity',
+        # parallel lists in heap order
+        '_items', '_keys',
+        # item -> position in the lists
+        '_index',
+    );
+
+    def __init__(
+            self: 'IndexedHeap',
+            pairs: typing.Iterable[typing.Tuple[typing.Hashable, typing.Any]] = (),
+            *, arity: int = 4) -> None:
+        '''
+            Initialize the heap with `(item, priority)` pairs; `arity` is
+            the number of children per node (4 by default, which halves
+            the depth of a binary heap for cache-friendlier sifts)
+        '''
+        if arity < 2:
+            raise ValueError(f'Arity must be at least 2: {arity}');
+        self._arity: int = arity;
+        self._items: typing.List[typing.Hashable] = [];
+        self._keys: typing.List[typing.Any] = [];
+        self._index: typing.Dict[typing.Hashable, int] = {};
+        self.heapify(pairs);
+
+    def __len__(self: 'IndexedHeap') -> int:
+        return len(self._items);
+
+    def __bool__(self: 'IndexedHeap') -> bool:
+        return bool(self._items);
+
+    def __contains__(self: 'IndexedHeap', item: typing.Hashable) -> bool:
+        return item in self._index;
+
+    def __getitem__(self: 'IndexedHeap', item: typing.Hashable) -> typing.Any:
+        'The priority of `item`; KeyError if absent'
+        return self._keys[self._index[item]];
+
+    def __repr__(self: 'IndexedHeap') -> str:
+        return (
+            f'{self.__class__.__qualname__}('
+            f'{list(zip(self._items, self._keys))!r}, '
+            f'arity={self._arity!r}'
+            ')'
+        );
+
+    # region sifts
+    def _place(self: 'IndexedHeap', pos: int, item: typing.Hashable, key: typing.Any) -> None:
+        self._items[pos] = item;
+        self._keys[pos] = key;
+        self._index[item] = pos;
+
+    def _siftUp(self: 'IndexedHeap', pos: int) -> None:
+        'Move the entry at `pos` up while it is smaller than its parent'
+        (items, keys, index, arity) = (self._items, self._keys, self._index, self._arity);
+        (item, key) = (items[pos], keys[pos]);
+        while pos > 0:
+            parent: int = (pos - 1) // arity;
+            if not key < keys[parent]:
+                break;
+            (items[pos], keys[pos]) = (items[parent], keys[parent]);
+            index[items[pos]] = pos;
+            pos = parent;
+        self._place(pos, item, key);
+
+    def _siftDown(self: 'IndexedHeap', pos: int) -> None:
+        'Move the entry at `pos` down while a child is smaller'
+        (items, keys, index, arity) = (self._items, self._keys, self._index, self._arity);
+        (item, key) = (items[pos], keys[pos]);
+        size: int = len(keys);
+        while True:
+            first: int = pos * arity + 1;
+            if first >= size:
+                break;
+            child: int = first;
+            for other in range(first + 1, min(first + arity, size)):
+                if keys[other] < keys[child]:
+                    child = other;
+            if not keys[child] < key:
+                break;
+            (items[pos], keys[pos]) = (items[child], keys[child]);
+            index[items[pos]] = pos;
+            pos = child;
+        self._place(pos, item, key);
+    # endregion
+
+    def heapify(
+            self: 'IndexedHeap',
+            pairs: typing.Iterable[typing.Tuple[typing.Hashable, typing.Any]]) -> None:
+        '''
+            Add `(item, priority)` pairs in bulk, restoring the heap bottom
+            up in O(n); KeyError, leaving the heap unchanged, on an item
+            already present or repeated among the pairs
+        '''
+        pairs = list(pairs);
+        batch: typing.Set[typing.Hashable] = set();
+        for (item, _) in pairs:
+            if item in self._index:
+                raise KeyError(f'Item already in heap: {item!r}');
+            if item in batch:
+                raise KeyError(f'Item given twice: {item!r}');
+            batch.add(item);
+        for (item, key) in pairs:
+            self._index[item] = len(self._items);
+            self._items.append(item);
+            self._keys.append(key);
+        for pos in reversed(range((len(self._items) - 2) // self._arity + 1)):
+            self._siftDown(pos);
+
+    def push(self: 'IndexedHeap', item: typing.Hashable, key: typing.Any) -> None:
+        'Add `item` with priority `key`; KeyError if already present'
+        if item in self._index:
+            raise KeyError(f'Item already in heap: {item!r}');
+        self._items.append(item);
+        self._keys.append(key);
+        self._siftUp(len(self._items) - 1);
+
+    def peek(self: 'IndexedHeap') -> typing.Tuple[typing.Hashable, typing.Any]:
+        'Return the `(item, priority)` with the least priority; IndexError if empty'
+        if not self._items:
+            raise IndexError('peek from an empty heap');
+        return (self._items[0], self._keys[0]);
+
+    def pop(self: 'IndexedHeap') -> typing.Tuple[typing.Hashable, typing.Any]:
+        'Remove and return the `(item, priority)` with the least priority'
+        if not self._items:
+            raise IndexError('pop from an empty heap');
+        top: typing.Tuple[typing.Hashable, typing.Any] = (self._items[0], self._keys[0]);
+        self._detach(0);
+        return top;
+
+    def _detach(self: 'IndexedHeap', pos: int) -> None:
+        'Drop the entry at `pos`, filling the hole with the last entry'
+        (items, keys) = (self._items, self._keys);
+        del self._index[items[pos]];
+        (item, key) = (items.pop(), keys.pop());
+        if pos < len(items):
+            self._place(pos, item, key);
+            if pos > 0 and key < keys[(pos - 1) // self._arity]:
+                self._siftUp(pos);
+            else:
+                self._siftDown(pos);
+
+    def remove(self: 'IndexedHeap', item: typing.Hashable) -> typing.Any:
+        'Remove `item` and return its priority; KeyError if absent'
+        pos: int = self._index[item];
+        key: typing.Any = self._keys[pos];
+        self._detach(pos);
+        return key;
+
+    def decreaseKey(self: 'IndexedHeap', item: typing.Hashable, key: typing.Any) -> None:
+        '''
+            Lower the priority of `item` to `key`; KeyError if absent,
+            ValueError if `key` is greater than the current priority
+        '''
+        pos: int = self._index[item];
+        if self._keys[pos] < key:
+            raise ValueError(f'New priority {key!r} is greater than {self._keys[pos]!r}');
+        self._keys[pos] = key;
+        self._siftUp(pos);
+
+    def pushOrDecrease(self: 'IndexedHeap', item: typing.Hashable, key: typing.Any) -> bool:
+        '''
+            Push `item`, or lower its priority to `key` if it is present
+            with a greater one; return whether the heap changed
+        '''
+        pos: typing.Optional[int] = self._index.get(item);
+        if pos is None:
+            self._items.append(item);
+            self._keys.append(key);
+            self._siftUp(len(self._items) - 1);
+            return True;
+        if not key < self._keys[pos]:
+            return False;
+        self._keys[pos] = key;
+        self._siftUp(pos);
+        return True;
+
+__all__: _slots = (
+    'IndexedHeap',
+);
@@ -0,0 +1,859 @@
+#!/usr/bin/env -S python3 -i
+# pylint: disable=invalid-name
+'''
+    A dense matrix stored as a contiguous, row-major buffer
+'''
+
+import typing;
+
+import io;
+import array;
+import numbers;
+import operator as op;
+import itertools as its;
+
+from . import dtype as dt;
+from . import kernels;
+from . import fileIO;
+from .dtype import np;
+from ...funcs import keyDispatch as kd;
+from ...funcs import typeDispatch as td;
+
+class Matrix:
+    '''
+        A dense matrix of numbers
+
+        Elements are stored row-major in one flat typed buffer (see
+        `matrix.dtype`) instead of a list of lists; `shape` is recorded, so
+        `height` and `width` are O(1).
+
+        Indexing with ints and slices (`m[1]`, `m[1:3]`, `m[:, 2]`,
+        `m[::2, 1:]`) returns a view sharing the buffer, described by an
+        offset and strides into it; assigning to an index writes in place.
+    '''
+    __slots__: typing.Tuple[str] = (
+        # flat typed memoryview of the buffer, shared by views
+        '_data',
+        # (height, width)
+        '_shape',
+        # dtype name; see matrix.dtype
+        '_dtype',
+        # position of element (0, 0) in the buffer
+        '_offset',
+        # (row stride, column stride), in elements
+        '_strides',
+        # one-element list counting writes, shared by views of the buffer
+        '_version',
+        # cached factorizations by kind, as (version, factorization)
+        '_factors',
+        # '__dict__',
+        #'__weakref__',
+    );
+
+    def __init__(
+            self: 'Matrix', source: typing.Any = None,
+            *args, **kwargs) -> None:
+        '''
+            Initialize a Matrix depending on the type of `source` or
+            the use of keywords
+
+            Keyword:
+                Both `width` and `height` defined with int:
+                    Initialize a matrix of `width` rows of `height`
+                    elements filled with `value` (default 0); note that
+                    the keywords count rows and columns respectively,
+                    unlike the `height` and `width` properties
+
+            `source` is `io.IOBase` (file):
+                Read lines from file; Optionally supply the custom
+                deliminator to `delim`; default to comma (`,`)
+
+            `source` is `tuple`, specifically, `Tuple[int, int]`:
+                Initialize matrix container with zeros, assuming
+                `row, col` size.
+
+            Every form accepts `dtype` (e.g. 'int64', 'float64'); by
+            default it is inferred from the values.
+        '''
+        self._setStorage(dt.empty(dt.DEFAULT), (0, 0), dt.DEFAULT);
+        Matrix.__construct(self, source, *args, **kwargs);
+
+    def _setStorage(
+            self: 'Matrix', data: typing.Any,
+            shape: typing.Tuple[int, int], dtype: str) -> None:
+        'Use the flat buffer `data` of `shape` and `dtype` as storage'
+        view: memoryview = memoryview(data);
+        if view.format != dt.typecode(dtype):
+            view = view.cast('B').cast(dt.typecode(dtype));
+        if len(view) != shape[0] * shape[1]:
+            raise ValueError(
+                f'Buffer of {len(view)} elements cannot hold shape {shape}'
+            );
+        self._data: memoryview = view;
+        self._shape: typing.Tuple[int, int] = shape;
+        self._dtype: str = dtype;
+        self._offset: int = 0;
+        self._strides: typing.Tuple[int, int] = (shape[1], 1);
+        self._version: typing.List[int] = [0];
+        self._factors: typing.Optional[dict] = None;
+
+    def _view(
+            self: 'Matrix', offset: int, shape: typing.Tuple[int, int],
+            strides: typing.Tuple[int, int]) -> 'Matrix':
+        'Create a matrix sharing the buffer, with its own offset and strides'
+        view: 'Matrix' = Matrix.__new__(Matrix);
+        (view._data, view._dtype) = (self._data, self._dtype);
+        (view._offset, view._shape, view._strides) = (offset, shape, strides);
+        (view._version, view._factors) = (self._version, None);
+        return view;
+
+    def _touch(
+            self: 'Matrix',
+            cell: typing.Optional[typing.Tuple[int, int, typing.Any, typing.Any]] = None
+            ) -> None:
+        '''
+            Record a write to the buffer, invalidating cached factorizations
+            and indexes; for the write of one `cell` `(row, col, old, new)`,
+            up-to-date indexes with a `_written` hook are updated instead
+        '''
+        self._version[0] += 1;
+        if cell is None or not self._factors:
+            return;
+        for (kind, (version, index)) in self._factors.items():
+            if version == self._version[0] - 1 and hasattr(index, '_written'):
+                index._written(*cell);
+                self._factors[kind] = (self._version[0], index);
+
+    def _cached(
+            self: 'Matrix', kind: str,
+            build: typing.Callable[['Matrix'], typing.Any]) -> typing.Any:
+        '''
+            Return the factorization or index `kind` of the matrix, built by
+            `build(self)` if missing or outdated by a write
+        '''
+        if self._factors is None:
+            self._factors = {};
+        (version, cached) = self._factors.get(kind, (None, None));
+        if version != self._version[0]:
+            cached = build(self);
+            self._factors[kind] = (self._version[0], cached);
+        return cached;
+
+    @property
+    def _contiguous(self: 'Matrix') -> bool:
+        'Whether the elements are row-major and adjacent in the buffer'
+        (height, width) = self._shape;
+        (rowStride, colStride) = self._strides;
+        return (colStride == 1 or width <= 1) and (rowStride == width or height <= 1);
+
+    def _line(self: 'Matrix', start: int, step: int, count: int) -> memoryview:
+        'Return the 1D slice of `count` elements from `start` by `step` in the buffer'
+        if count <= 0:
+            return self._data[0:0];
+        stop: int = start + (count - 1) * step + (1 if step > 0 else -1);
+        return self._data[start:stop if stop >= 0 else None:step];
+
+    def _flat(self: 'Matrix') -> typing.Any:
+        'Return the elements row-major as one flat buffer; a copy for views'
+        (height, width) = self._shape;
+        if self._contiguous:
+            return self._data[self._offset:self._offset + height * width];
+        out: array.array = dt.empty(self._dtype);
+        for row in range(height):
+            out.frombytes(self._rowLine(row).tobytes());
+        return out;
+
+    def _rowLine(self: 'Matrix', row: int) -> memoryview:
+        return self._line(
+            self._offset + row * self._strides[0], self._strides[1], self.width
+        );
+
+    @classmethod
+    def _wrap(
+            cls: type, data: typing.Any,
+            shape: typing.Tuple[int, int], dtype: str) -> 'Matrix':
+        'Create a matrix on the flat buffer `data`, bypassing the constructors'
+        self: 'Matrix' = cls.__new__(cls);
+        self._setStorage(data, shape, dtype);
+        return self;
+
+    def _asarray(self: 'Matrix') -> typing.Any:
+        'Return a zero-copy 2D NumPy view of the storage (NumPy required)'
+        if not self._shape[0] * self._shape[1]:
+            return np.empty(self._shape, dtype=self._dtype);
+        size: int = self._data.itemsize;
+        return np.ndarray(
+            self._shape, dtype=self._dtype, buffer=self._data,
+            offset=self._offset * size,
+            strides=tuple(stride * size for stride in self._strides)
+        );
+
+    @classmethod
+    def _fromArray(cls: type, arr: typing.Any, dtype: str) -> 'Matrix':
+        'Create a matrix from a 2D NumPy array, converted to `dtype`'
+        arr = np.ascontiguousarray(arr, dtype=dtype);
+        return cls._wrap(arr.reshape(-1), arr.shape, dtype);
+
+    @classmethod
+    def _fromRows(
+            cls: type, rows: typing.Iterable[typing.Sequence],
+            shape: typing.Tuple[int, int], dtype: str) -> 'Matrix':
+        'Create a matrix of `shape` from an iterable of rows'
+        return cls._wrap(
+            array.array(dt.typecode(dtype), its.chain.from_iterable(rows)),
+            shape, dtype
+        );
+
+    # region factories
+    @classmethod
+    def zeros(
+            cls: type, height: int, width: int,
+            dtype: str = dt.DEFAULT) -> 'Matrix':
+        'Return a `height` x `width` matrix of zeros'
+        return cls.full(height, width, 0, dtype);
+
+    @classmethod
+    def full(
+            cls: type, height: int, width: int, value: typing.Any,
+            dtype: typing.Optional[str] = None) -> 'Matrix':
+        '''
+            Return a `height` x `width` matrix filled with `value`; the
+            dtype is inferred from `value` by default
+        '''
+        if height < 0 or width < 0:
+            raise ValueError(f'Negative size: {height}x{width}');
+        dtype = dtype or dt.infer(value);
+        return cls._wrap(
+            dt.alloc(dtype, height * width, value), (height, width), dtype
+        );
+
+    @classmethod
+    def identity(cls: type, size: int, dtype: str = dt.DEFAULT) -> 'Matrix':
+        'Return the `size` x `size` identity matrix'
+        data: array.array = dt.alloc(dtype, size * size);
+        # the diagonal is one strided slice of the flat buffer
+        data[::size + 1] = dt.alloc(dtype, size, 1);
+        return cls._wrap(data, (size, size), dtype);
+
+    @classmethod
+    def fromRows(
+            cls: type, rows: typing.Iterable[typing.Sequence],
+            dtype: typing.Optional[str] = None) -> 'Matrix':
+        '''
+            Return the matrix of the rows; the dtype is float64 if any
+            element is a float, int64 otherwise
+        '''
+        rows = list(rows);
+        widths: typing.Set[int] = set(map(len, rows));
+        if len(widths) > 1:
+            raise ValueError('Uneven matrix encountered.');
+        shape: typing.Tuple[int, int] = (len(rows), widths.pop() if widths else 0);
+        if dtype is None:
+            dtype = dt.infer(next(
+                (elem for elem in its.chain.from_iterable(rows)
+                    if isinstance(elem, float)),
+                0
+            ));
+        return cls._fromRows(rows, shape, dtype);
+
+    @classmethod
+    def fromBuffer(
+            cls: type, buffer: typing.Any, shape: typing.Tuple[int, int],
+            dtype: typing.Optional[str] = None) -> 'Matrix':
+        '''
+            Return a matrix of `shape` sharing `buffer` (an `array.array`, a
+            NumPy array, a memoryview, an mmap, ...), without copying; the
+            dtype is read from the buffer format by default
+        '''
+        if dtype is None:
+            dtype = dt.fromTypecode(memoryview(buffer).format);
+        return cls._wrap(buffer, shape, dtype);
+
+    @classmethod
+    def fromIterable(
+            cls: type, iterable: typing.Iterable, shape: typing.Tuple[int, int],
+            dtype: str = dt.DEFAULT) -> 'Matrix':
+        'Return a matrix of `shape` filled row-major from the elements of `iterable`'
+        size: int = shape[0] * shape[1];
+        data: array.array = array.array(
+            dt.typecode(dtype), its.islice(iterable, size)
+        );
+        if len(data) != size:
+            raise ValueError(f'{len(data)} elements cannot fill shape {shape}');
+        return cls._wrap(data, shape, dtype);
+    # endregion
+
+    @kd.keywordPriorityDispatch
+    # default func is methodDispatch
+    @td.methodDispatch
+    def __construct(self: 'Matrix', *_, **__) -> None:
+        pass
+    @__construct.__wrapped__.register
+    def _(
+            self, source: io.IOBase, *_,
+            delim: str = ',', dtype: typing.Optional[str] = None, **kwargs) -> None:
+        'Parse delimited numbers in bulk; see `fromCSV`'
+        self._setStorage(*fileIO.parseCSV(source, delim=delim, dtype=dtype, **kwargs));
+    @__construct.__wrapped__.register
+    def _(self, source: tuple, *_, **kwargs) -> None:
+        'Initialize with zeros, given the numbers of rows and columns'
+        if len(source) < 2:
+            raise ValueError;
+        if not all(isinstance(elem, int) for elem in source):
+            raise TypeError;
+
+        # initialize with keywords
+        self.__init__(width=source[0], height=source[1], **kwargs);
+
+    @__construct.register('width', 'height')
+    def _(
+            self, *_,
+            width: int, height: int,
+            value: int = 0, dtype: typing.Optional[str] = None, **__) -> None:
+        '''
+            Initialize an empty matrix of `width` rows of `height`
+            elements; optionally take a value to initialize with
+        '''
+        if not all(isinstance(elem, int) for elem in (width, height)):
+            raise TypeError;
+        if width < 0 or height < 0:
+            raise ValueError(f'Negative size: {width}x{height}');
+        dtype = dtype or dt.infer(value);
+        self._setStorage(
+            dt.alloc(dtype, width * height, value), (width, height), dtype
+        );
+
+    def __repr__(self: 'Matrix') -> str:
+        'Formal representation of matrix'
+        # print(f'object: {object.__repr__(self)}');
+        return (
+            '<'
+            f'{self.__class__.__module__}.'
+            f'{self.__class__.__qualname__}'
+            f' object at {hex(id(self))}'
+            f'; width={self.width}, height={self.height}>'
+        );
+
+    def __str__(self: 'Matrix') -> str:
+        'Informal representation of a Matrix object'
+        def _row(lst: typing.List[int]) -> str:
+            return f'[{",".join(str(num) for num in lst)}]';
+        return f'[{";".join(_row(row) for row in self.rows())}]';
+
+    @property
+    def prettyStr(self: 'Matrix') -> str:
+        'A descriptor returning a somewhat prettier string representation'
+        return str(self).replace(';', '\n ').replace(',', ',\t');
+
+    def pretty(self: 'Matrix') -> None:
+        'Print the prettyStr'
+        print(self.prettyStr);
+
+    def _flatIndex(self: 'Matrix', row: int, col: int) -> int:
+        'Return the position of `(row, col)` in the flat buffer'
+        (height, width) = self._shape;
+        if row < 0:
+            row += height;
+        if col < 0:
+            col += width;
+        if not (0 <= row < height and 0 <= col < width):
+            raise IndexError(f'Index out of range: {(row, col)}');
+        return self._offset + row * self._strides[0] + col * self._strides[1];
+
+    @staticmethod
+    def _axis(key: typing.Any, size: int) -> typing.Tuple[int, int, int]:
+        'Return `(start, count, step)` selected by an int or a slice on an axis'
+        if isinstance(key, slice):
+            selected: range = range(*key.indices(size));
+            return (selected.start, len(selected), selected.step);
+        key = op.index(key);
+        if not -size <= key < size:
+            raise IndexError(f'Index out of range: {key}');
+        return (key % size, 1, 1);
+
+    def _select(self: 'Matrix', rows: typing.Any, cols: typing.Any) -> 'Matrix':
+        'Return the view selected by an int or a slice on each axis'
+        (rowStart, height, rowStep) = Matrix._axis(rows, self.height);
+        (colStart, width, colStep) = Matrix._axis(cols, self.width);
+        (rowStride, colStride) = self._strides;
+        return self._view(
+            self._offset + rowStart * rowStride + colStart * colStride,
+            (height, width), (rowStride * rowStep, colStride * colStep)
+        );
+
+    @td.methodDispatch
+    def __getitem__(self: 'Matrix', index: typing.Any) -> typing.Any:
+        '''
+            Return item indicated by `index`
+
+            If `index` is `tuple[int row, int col]`:
+                Return item at `(row, col)` position
+
+            If `index` is `tuple` of ints and slices:
+                Return the view of the rows and columns selected; an int
+                selects a single row or column
+
+            If `index` is int or slice:
+                Return the view of the rows selected
+        '''
+        raise NotImplementedError;
+    @__getitem__.register
+    def _(self, index: tuple) -> typing.Any:
+        assert len(index) >= 2, f'Insufficient length (at least 2): {index}';
+        assert all(isinstance(elem, (int, slice)) for elem in index), \
+            'All elements of `index` should be of index or slice type';
+        if isinstance(index[0], int) and isinstance(index[1], int):
+            return self._data[self._flatIndex(index[0], index[1])];
+        return self._select(index[0], index[1]);
+    @__getitem__.register
+    def _(self, index: int) -> typing.Any:
+        return self._select(index, slice(None));
+    @__getitem__.register
+    def _(self, index: slice) -> typing.Any:
+        return self._select(index, slice(None));
+
+    @td.methodDispatch
+    def __setitem__(self: 'Matrix', index: typing.Any, value: typing.Any) -> None:
+        '''
+            Set value of item indicated by `index`
+
+            If `index` is `tuple[int row, int col]`:
+                Set value at `(row, col)` position
+
+            Otherwise:
+                Assign in place to the view `self[index]`; see `assign`
+        '''
+        raise NotImplementedError;
+    @__setitem__.register
+    def _(self, index: tuple, value: typing.Any) -> None:
+        assert len(index) >= 2, f'Insufficient length (at least 2): {index}';
+        assert all(isinstance(elem, (int, slice)) for elem in index), \
+            'All elements of `index` should be of index or slice type';
+        if isinstance(index[0], int) and isinstance(index[1], int):
+            pos: int = self._flatIndex(index[0], index[1]);
+            old: typing.Any = self._data[pos];
+            self._data[pos] = value;
+            self._touch(
+                (index[0] % self.height, index[1] % self.width, old, self._data[pos])
+            );
+            return;
+        self._select(index[0], index[1]).assign(value);
+    @__setitem__.register
+    def _(self, index: int, value: typing.Any) -> None:
+        self._select(index, slice(None)).assign(value);
+    @__setitem__.register
+    def _(self, index: slice, value: typing.Any) -> None:
+        self._select(index, slice(None)).assign(value);
+
+    def assign(self: 'Matrix', value: typing.Any) -> None:
+        '''
+            Overwrite every element in place, row by row
+
+            `value` is a scalar (filling every element), a matrix of the
+            same shape, a sequence of rows, or a flat sequence of
+            `height * width` elements.
+        '''
+        (height, width) = self._shape;
+        self._touch();
+        if np is not None and height * width:
+            target: typing.Any = self._asarray();
+            if isinstance(value, Matrix):
+                if value.shape != self.shape:
+                    raise ValueError(
+                        f'Shapes do not match: {self.shape} and {value.shape}'
+                    );
+                # NumPy copies overlapping operands first
+                target[...] = value._asarray();
+            elif isinstance(value, numbers.Number):
+                target[...] = value;
+            else:
+                target[...] = np.asarray(value).reshape(self._shape);
+            return;
+
+        code: str = dt.typecode(self._dtype);
+        if isinstance(value, numbers.Number):
+            rows: typing.Iterable = its.repeat(array.array(code, (value,)) * width);
+        elif isinstance(value, Matrix):
+            if value.shape != self.shape:
+                raise ValueError(
+                    f'Shapes do not match: {self.shape} and {value.shape}'
+                );
+            rows: typing.Iterable = value.rows();
+            if value._data.obj is self._data.obj:
+                # copy first, the buffers may overlap
+                rows = list(rows);
+        else:
+            value = list(value);
+            if value and not isinstance(value[0], numbers.Number):
+                value = list(its.chain.from_iterable(value));
+            if len(value) != height * width:
+                raise ValueError(
+                    f'{len(value)} elements cannot fill shape {self.shape}'
+                );
+            rows: typing.Iterable = (
+                value[row * width:(row + 1) * width] for row in range(height)
+            );
+        for (row, source) in zip(range(height), rows):
+            self._rowLine(row)[:] = array.array(code, source);
+
+    @property
+    def offset(self: 'Matrix') -> int:
+        'Return the position of element `(0, 0)` in the shared buffer'
+        return self._offset;
+
+    @property
+    def strides(self: 'Matrix') -> typing.Tuple[int, int]:
+        'Return `(row stride, column stride)` in the shared buffer, in elements'
+        return self._strides;
+
+    def copy(self: 'Matrix') -> 'Matrix':
+        'Return a contiguous copy not sharing the buffer'
+        return Matrix._wrap(
+            array.array(dt.typecode(self._dtype), self._flat()),
+            self.shape, self.dtype
+        );
+
+    def toMemoryview(self: 'Matrix') -> memoryview:
+        '''
+            Return a 2D memoryview of the elements, sharing the buffer
+
+            Views that are not contiguous are exported through NumPy;
+            without NumPy they raise BufferError, use `copy` first.
+        '''
+        if self._contiguous:
+            return self._flat().cast('B').cast(
+                dt.typecode(self._dtype), self._shape
+            );
+        if np is None:
+            raise BufferError('Matrix view is not contiguous; use copy()');
+        return memoryview(self._asarray());
+
+    def __buffer__(self: 'Matrix', flags: int) -> memoryview:
+        'Export the buffer protocol (Python 3.12+); see `toMemoryview`'
+        return self.toMemoryview();
+
+    @property
+    def height(self: 'Matrix') -> int:
+        'Return the height of the matrix'
+        return self._shape[0];
+
+    @property
+    def width(self: 'Matrix') -> int:
+        'Return the width of the matrix'
+        return self._shape[1];
+
+    @property
+    def shape(self: 'Matrix') -> typing.Tuple[int, int]:
+        'Return `(height, width)` of the matrix'
+        return self._shape;
+
+    @property
+    def dtype(self: 'Matrix') -> str:
+        'Return the name of the element type; see matrix.dtype'
+        return self._dtype;
+
+    def rows(self: 'Matrix') -> typing.Iterator[typing.List[int]]:
+        'Return an iterator of the rows as lists'
+        return (self._rowLine(row).tolist() for row in range(self.height));
+
+    def __iter__(self: 'Matrix') -> typing.Iterator[int]:
+        '''
+            Return a flat iterator for all elements of the matrix;
+            order of elements is not necessarily retained
+        '''
+        return iter(self._flat());
+
+    # region files
+    @classmethod
+    def fromCSV(
+            cls: type, source: typing.Any, *,
+            delim: str = ',', dtype: typing.Optional[str] = None,
+            workers: int = 0, processes: bool = False,
+            chunkSize: int = fileIO.CHUNK,
+            compression: typing.Optional[str] = None) -> 'Matrix':
+        '''
+            Load delimited numbers from a path or a file object
+
+            The file is read in large chunks parsed in bulk directly into
+            the storage, optionally by `workers` threads (or processes if
+            `processes`); see `fileIO.parseCSV`.
+        '''
+        return cls._wrap(*fileIO.parseCSV(
+            source, delim=delim, dtype=dtype, workers=workers,
+            processes=processes, chunkSize=chunkSize, compression=compression
+        ));
+
+    def toCSV(
+            self: 'Matrix', target: typing.Any, *,
+            delim: str = ',', compression: typing.Optional[str] = None) -> None:
+        '''
+            Stream the rows as delimited text to a path or a (text or
+            binary) file object, in chunks of rows; see `fileIO.writeCSV`
+        '''
+        fileIO.writeCSV(target, self.rows(), delim=delim, compression=compression);
+
+    def _chunks(self: 'Matrix') -> typing.Iterator[typing.Any]:
+        'Yield the elements row-major in buffers of about `fileIO.CHUNK` bytes'
+        (height, width) = self._shape;
+        rows: int = max(1, fileIO.CHUNK // max(1, width * self._data.itemsize));
+        for start in range(0, height, rows):
+            stop: int = min(start + rows, height);
+            if self._contiguous:
+                begin: int = self._offset + start * width;
+                yield self._data[begin:begin + (stop - start) * width];
+            else:
+                yield b''.join(self._rowLine(row).tobytes() for row in range(start, stop));
+
+    def save(
+            self: 'Matrix', target: typing.Any,
+            compression: typing.Optional[str] = None) -> None:
+        '''
+            Save to a path or binary file in the binary format, streamed in
+            chunks; see `load`
+        '''
+        fileIO.writeBinary(target, self._chunks(), self.shape, self.dtype, compression);
+
+    @classmethod
+    def load(
+            cls: type, source: typing.Any,
+            compression: typing.Optional[str] = None) -> 'Matrix':
+        'Load a matrix saved by `save` from a path or binary file'
+        return cls._wrap(*fileIO.readBinary(source, compression));
+
+    @classmethod
+    def mmap(cls: type, path: typing.Any, mode: str = 'r') -> 'Matrix':
+        '''
+            Open a matrix saved by `save` as a memory-mapped buffer
+
+            Opening is O(1) whatever the size: elements are paged in on
+            access, and processes mapping the same file share one copy in
+            the page cache. `mode` is 'r' (read-only), 'r+' (writes go
+            through to the file) or 'c' (copy-on-write); see
+            `fileIO.mapBinary`. Results of arithmetic are ordinary
+            in-memory matrices.
+        '''
+        return cls._wrap(*fileIO.mapBinary(path, mode));
+
+    def flush(self: 'Matrix') -> None:
+        'Write changes of a matrix opened by `mmap` in mode r+ to the file'
+        flush: typing.Optional[typing.Callable] = getattr(self._data.obj, 'flush', None);
+        if flush is not None:
+            flush();
+    # endregion
+
+    # region arithmetic
+    def _elementwise(
+            self: 'Matrix', other: typing.Any,
+            func: typing.Callable[[typing.Any, typing.Any], typing.Any],
+            reflected: bool = False) -> 'Matrix':
+        '''
+            Apply the binary `func` (an `operator` function, which also
+            applies to NumPy arrays) elementwise with another matrix of the
+            same shape
+            or with a scalar broadcast to every element; if `reflected`,
+            `other` is the left operand
+        '''
+        if isinstance(other, Matrix):
+            if other.shape != self.shape:
+                raise ValueError(
+                    f'Shapes do not match: {self.shape} and {other.shape}'
+                );
+            dtype: str = dt.promote(self.dtype, other.dtype);
+        elif isinstance(other, numbers.Real):
+            dtype: str = dt.promote(self.dtype, dt.infer(other));
+        else:
+            return NotImplemented;
+
+        if np is not None:
+            left: typing.Any = self._asarray();
+            right: typing.Any = (
+                other._asarray() if isinstance(other, Matrix) else other
+            );
+            return Matrix._fromArray(
+                func(right, left) if reflected else func(left, right),
+                dtype
+            );
+
+        # NumPy above is bound by memory bandwidth, not by one core; the
+        # pure-Python loop is, so large operations can use worker processes
+        # once enabled by `parallel.configure(auto=True)`
+        if parallel.enabled(self.height * self.width):
+            return parallel.elementwise(self, other, func, reflected);
+        left: typing.Iterable = self._flat();
+        right: typing.Iterable = (
+            other._flat() if isinstance(other, Matrix) else its.repeat(other)
+        );
+        return Matrix._wrap(
+            array.array(
+                dt.typecode(dtype),
+                map(func, right, left) if reflected
+                else map(func, left, right)
+            ),
+            self.shape, dtype
+        );
+
+    def __add__(self: 'Matrix', other: typing.Any) -> 'Matrix':
+        'Elementwise addition with a matrix or a scalar'
+        return self._elementwise(other, op.add);
+
+    def __radd__(self: 'Matrix', other: typing.Any) -> 'Matrix':
+        return self._elementwise(other, op.add, True);
+
+    def __sub__(self: 'Matrix', other: typing.Any) -> 'Matrix':
+        'Elementwise subtraction with a matrix or a scalar'
+        return self._elementwise(other, op.sub);
+
+    def __rsub__(self: 'Matrix', other: typing.Any) -> 'Matrix':
+        return self._elementwise(other, op.sub, True);
+
+    def __mul__(self: 'Matrix', other: typing.Any) -> 'Matrix':
+        'Elementwise multiplication with a matrix or a scalar'
+        return self._elementwise(other, op.mul);
+
+    def __rmul__(self: 'Matrix', other: typing.Any) -> 'Matrix':
+        return self._elementwise(other, op.mul, True);
+
+    def transpose(self: 'Matrix') -> 'Matrix':
+        'Return the transposed matrix'
+        (height, width) = self.shape;
+        if np is not None:
+            return Matrix._fromArray(self._asarray().T, self.dtype);
+        # each column is one strided slice of the flat buffer
+        (rowStride, colStride) = self._strides;
+        return Matrix._fromRows(
+            (
+                self._line(self._offset + col * colStride, rowStride, height).tolist()
+                for col in range(width)
+            ),
+            (width, height), self.dtype
+        );
+
+    def __matmul__(self: 'Matrix', other: 'Matrix') -> 'Matrix':
+        '''
+            Matrix multiplication; without NumPy, products use the blocked
+            pure-Python kernel, with Strassen's recursion for large operands
+            (see matrix.kernels), or are split over worker processes if
+            enabled by `parallel.configure(auto=True)` (see matrix.parallel)
+        '''
+        if not isinstance(other, Matrix):
+            return NotImplemented;
+        if self.width != other.height:
+            raise ValueError(
+                f'Shapes do not align: {self.shape} @ {other.shape}'
+            );
+        dtype: str = dt.promote(self.dtype, other.dtype);
+        shape: typing.Tuple[int, int] = (self.height, other.width);
+        if np is not None:
+            return Matrix._fromArray(self._asarray() @ other._asarray(), dtype);
+        if parallel.enabled(self.height * self.width * other.width):
+            return parallel.matmul(self, other);
+        return Matrix._fromRows(
+            kernels.matmul(list(self.rows()), list(other.rows()), other.width),
+            shape, dtype
+        );
+    # endregion
+
+    def lazy(self: 'Matrix') -> 'lazy.Expr':
+        '''
+            Return the matrix as a lazy expression: operators on it build
+            an expression evaluated on demand by `evaluate()`, fusing
+            elementwise chains and reordering products; see matrix.lazy
+        '''
+        return lazy.Leaf(self);
+
+    # region linear algebra
+    def lu(self: 'Matrix') -> 'linalg.LU':
+        'Return the cached LU decomposition; see matrix.linalg'
+        return linalg.lu(self);
+
+    def cholesky(self: 'Matrix') -> 'linalg.Cholesky':
+        'Return the cached Cholesky decomposition; see matrix.linalg'
+        return linalg.cholesky(self);
+
+    def qr(self: 'Matrix') -> 'linalg.QR':
+        'Return the cached QR decomposition; see matrix.linalg'
+        return linalg.qr(self);
+
+    def solve(self: 'Matrix', rhs: typing.Any, method: str = 'lu') -> typing.Any:
+        '''
+            Solve `self @ x = rhs` with a cached factorization, so that
+            further solves cost O(n^2); see `linalg.solve`
+        '''
+        return linalg.solve(self, rhs, method);
+
+    def det(self: 'Matrix') -> float:
+        'Return the determinant'
+        return linalg.det(self);
+
+    def inverse(self: 'Matrix') -> 'Matrix':
+        'Return the inverse matrix'
+        return linalg.inverse(self);
+
+    def lstsq(self: 'Matrix', rhs: typing.Any) -> typing.Any:
+        'Return the least-squares solution of `self @ x = rhs`'
+        return linalg.lstsq(self, rhs);
+    # endregion
+
+    # region range queries
+    def summedArea(self: 'Matrix') -> 'rangeQuery.SummedArea':
+        'Return the cached summed-area table; see matrix.rangeQuery'
+        return self._cached('summedArea', rangeQuery.SummedArea);
+
+    def sparseTable(self: 'Matrix', func: str = 'min') -> 'rangeQuery.SparseTable':
+        "Return the cached sparse table for `func`, 'min' or 'max'"
+        return self._cached(
+            f'sparseTable.{func}', lambda matrix: rangeQuery.SparseTable(matrix, func)
+        );
+
+    def fenwick(self: 'Matrix') -> 'rangeQuery.Fenwick':
+        '''
+            Return the cached 2D Fenwick tree, kept up to date by
+            `m[row, col] = value`; see matrix.rangeQuery
+        '''
+        return self._cached('fenwick', rangeQuery.Fenwick);
+
+    def rangeSum(
+            self: 'Matrix', top: int, left: int,
+            bottom: int, right: int) -> typing.Any:
+        '''
+            Return the sum of the rectangle `[top, bottom) x [left, right)`:
+            from the Fenwick tree if one is up to date, from the summed-area
+            table (built once, O(1) per query) otherwise
+        '''
+        if self._factors and self._factors.get('fenwick', (None,))[0] == self._version[0]:
+            return self.fenwick().sum(top, left, bottom, right);
+        return self.summedArea().sum(top, left, bottom, right);
+
+    def rangeMin(
+            self: 'Matrix', top: int, left: int,
+            bottom: int, right: int) -> typing.Any:
+        'Return the minimum of the rectangle in O(1), from the sparse table'
+        return self.sparseTable('min').query(top, left, bottom, right);
+
+    def rangeMax(
+            self: 'Matrix', top: int, left: int,
+            bottom: int, right: int) -> typing.Any:
+        'Return the maximum of the rectangle in O(1), from the sparse table'
+        return self.sparseTable('max').query(top, left, bottom, right);
+    # endregion
+
+def debug() -> None:
+    # pylint: disable=unused-variable
+    m1 = Matrix(width=3, height=3);
+    m2 = Matrix(width=3, height=3, value=1);
+
+# debug();
+
+from . import sparse;
+from .sparse import COOMatrix, CSRMatrix, CSCMatrix;
+from . import lazy;
+from . import parallel;
+from . import linalg;
+from . import rangeQuery;
+
+__all__: typing.Tuple[str, ...] = (
+    'Matrix',
+    'COOMatrix',
+    'CSRMatrix',
+    'CSCMatrix',
+);
@@ -0,0 +1,100 @@
+#!/usr/bin/env -S python3 -i
+# pylint: disable=invalid-name
+'''
+    Element types of the contiguous Matrix storage
+
+    Storage is a flat, row-major `array.array`; NumPy is used when it is
+    installed, through zero-copy views of the same buffer.
+'''
+
+import typing;
+import array;
+
+from ...shared import _slots;
+
+try:
+    import numpy as np;
+except ImportError:
+    np = None;
+
+# dtype name -> array typecode
+_codes: typing.Mapping[str, str] = {
+    'int8': 'b', 'uint8': 'B',
+    'int16': 'h', 'uint16': 'H',
+    'int32': 'i', 'uint32': 'I',
+    'int64': 'q', 'uint64': 'Q',
+    'float32': 'f', 'float64': 'd',
+};
+_names: typing.Mapping[str, str] = {
+    code: name for (name, code) in _codes.items()
+};
+
+DEFAULT: str = 'int64';
+
+def typecode(dtype: str) -> str:
+    'Return the array typecode of the dtype name; raise ValueError if unknown'
+    try:
+        return _codes[dtype];
+    except KeyError:
+        raise ValueError(
+            f'Unknown dtype {dtype!r}; expected one of {tuple(_codes)}'
+        ) from None;
+
+def fromTypecode(code: str) -> str:
+    'Return the dtype name of the array typecode'
+    code = code.lstrip('@=');
+    if code in _names:
+        return _names[code];
+    if code in ('l', 'L'):
+        # native long, whose size depends on the platform
+        sign: str = 'u' if code == 'L' else '';
+        return f'{sign}int{8 * array.array(code).itemsize}';
+    raise ValueError(f'Unsupported typecode {code!r}');
+
+def isFloat(dtype: str) -> bool:
+    'Whether the dtype stores floating point numbers'
+    return dtype.startswith('float');
+
+def infer(value: typing.Any) -> str:
+    'Return the dtype storing `value` (and values alike) by default'
+    return 'float64' if isinstance(value, float) else DEFAULT;
+
+def promote(*dtypes: str) -> str:
+    '''
+        Return the dtype of a result combining elements of `dtypes`:
+        the common dtype if all are equal, otherwise float64 if any is
+        floating point, otherwise int64
+    '''
+    if len(set(dtypes)) == 1:
+        return dtypes[0];
+    return 'float64' if any(map(isFloat, dtypes)) else DEFAULT;
+
+def convert(dtype: str) -> typing.Callable[[typing.Any], typing.Any]:
+    'Return the Python conversion of parsed text for the dtype'
+    return float if isFloat(dtype) else int;
+
+def alloc(dtype: str, size: int, value: typing.Any = 0) -> array.array:
+    'Allocate a flat buffer of `size` elements filled with `value`, in one step'
+    return array.array(typecode(dtype), (value,)) * size;
+
+def empty(dtype: str) -> array.array:
+    'Allocate an empty buffer of the dtype'
+    return array.array(typecode(dtype));
+
+def itemsize(dtype: str) -> int:
+    'The number of bytes per element'
+    return array.array(typecode(dtype)).itemsize;
+
+__all__: _slots = (
+    'np',
+    'DEFAULT',
+    'typecode',
+    'fromTypecode',
+    'isFloat',
+    'infer',
+    'promote',
+    'convert',
+    'alloc',
+    'empty',
+    'itemsize',
+);
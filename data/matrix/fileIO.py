@@ -0,0 +1,323 @@
+#!/usr/bin/env -S python3 -i
+# pylint: disable=invalid-name
+'''
+    Bulk loading of delimited text and the binary format of Matrix
+
+    The functions here work on flat buffers, `(height, width)` shapes and
+    dtype names; see `Matrix.fromCSV`, `Matrix.toCSV`, `Matrix.save` and
+    `Matrix.load`. Writers stream rows or chunks, so exporting needs
+    constant memory. Paths ending in `.gz`, `.bz2`, `.xz` or `.lzma` are
+    (de)compressed transparently; file objects can be wrapped by passing
+    `compression`.
+
+    Binary format (all integers little-endian):
+        - a 64-byte header: magic `ALGOMTX\\0`, version (u16), reserved
+          (u16), dtype name (8 bytes, NUL-padded), height (u64), width (u64);
+        - the elements, row-major, little-endian, without padding.
+'''
+
+import os;
+import io;
+import sys;
+import bz2;
+import gzip;
+import lzma;
+import mmap;
+import array;
+import struct;
+import typing;
+import contextlib;
+import collections as c;
+import itertools as its;
+import concurrent.futures as cf;
+
+from . import dtype as dt;
+from .dtype import np;
+from ...shared import _slots;
+
+_Shape = typing.Tuple[int, int];
+_Path = typing.Union[str, os.PathLike];
+
+# bytes read per chunk of delimited text
+CHUNK: int = 1 << 22;
+
+MAGIC: bytes = b'ALGOMTX\0';
+VERSION: int = 1;
+HEADER: struct.Struct = struct.Struct('<8sHH8sQQ28x');
+
+# rows of delimited text formatted per write
+CSV_ROWS: int = 4096;
+
+COMPRESSION: typing.Mapping[str, typing.Callable[..., typing.IO]] = {
+    'gzip': gzip.open,
+    'bz2': bz2.open,
+    'lzma': lzma.open,
+};
+_suffixes: typing.Mapping[str, str] = {
+    '.gz': 'gzip', '.bz2': 'bz2', '.xz': 'lzma', '.lzma': 'lzma',
+};
+
+def _isPath(obj: typing.Any) -> bool:
+    'Whether `obj` names a file instead of being a file object'
+    return isinstance(obj, (str, bytes, os.PathLike));
+
+@contextlib.contextmanager
+def _opened(
+        target: typing.Any, mode: str,
+        compression: typing.Optional[str] = None) -> typing.Iterator[typing.IO]:
+    '''
+        Open a path, or use a file object as is, in binary `mode`, through
+        `compression` (by default inferred from the suffix of a path); file
+        objects are left open
+    '''
+    if compression is None and _isPath(target):
+        compression = _suffixes.get(os.path.splitext(os.fsdecode(target))[1].lower());
+    if compression is not None:
+        if compression not in COMPRESSION:
+            raise ValueError(
+                f'Unknown compression {compression!r}; expected one of {tuple(COMPRESSION)}'
+            );
+        with COMPRESSION[compression](target, mode) as file:
+            yield file;
+    elif _isPath(target):
+        with open(target, mode) as file:
+            yield file;
+    else:
+        yield target;
+
+# region delimited text
+def _chunks(source: typing.IO, size: int) -> typing.Iterator[typing.AnyStr]:
+    'Read `source` in chunks of about `size`, each ending at a line boundary'
+    while True:
+        chunk: typing.AnyStr = source.read(size);
+        if not chunk:
+            return;
+        # complete the last line of the chunk
+        yield chunk + source.readline();
+
+def parseChunk(
+        chunk: typing.AnyStr, delim: str,
+        dtype: str) -> typing.Tuple[typing.Any, int, int]:
+    '''
+        Parse whole lines of delimited numbers (text or bytes)
+
+        Return `(flat buffer, number of rows, width)`; blank lines are
+        skipped, and rows of different widths raise ValueError. The lines
+        are joined and converted in one pass: by `numpy.fromstring` if
+        NumPy is installed, by a C-level `map` otherwise.
+    '''
+    if isinstance(chunk, bytes):
+        chunk = chunk.decode();
+    lines: typing.List[str] = [*filter(None, map(str.strip, chunk.splitlines()))];
+    if not lines:
+        return (dt.empty(dtype), 0, 0);
+    widths: typing.Set[int] = {line.count(delim) + 1 for line in lines};
+    if len(widths) > 1:
+        raise ValueError('Uneven matrix encountered.');
+    width: int = widths.pop();
+    text: str = delim.join(lines);
+
+    if np is not None:
+        data: typing.Any = np.fromstring(text, dtype=dtype, sep=delim);
+        if len(data) != len(lines) * width:
+            # NumPy stops at the first unparsable field
+            raise ValueError(f'Unparsable field after element {len(data)}');
+    else:
+        data: typing.Any = array.array(
+            dt.typecode(dtype), map(dt.convert(dtype), text.split(delim))
+        );
+    return (data, len(lines), width);
+
+def parseCSV(
+        source: typing.Union[_Path, typing.IO], *,
+        delim: str = ',', dtype: typing.Optional[str] = None,
+        workers: int = 0, processes: bool = False, chunkSize: int = CHUNK,
+        compression: typing.Optional[str] = None) -> typing.Tuple[array.array, _Shape, str]:
+    '''
+        Parse delimited numbers from a path or a (text or binary) file
+
+        The file is read in chunks of about `chunkSize` bytes ending at line
+        boundaries; each chunk is parsed in bulk by `parseChunk` straight
+        into a typed buffer. With `workers`, chunks are parsed concurrently
+        by that many threads, or processes if `processes`, with at most
+        twice as many chunks in flight.
+
+        Return `(flat buffer, (height, width), dtype)`.
+    '''
+    dtype = dtype or dt.DEFAULT;
+    if _isPath(source) or compression is not None:
+        with _opened(source, 'rb', compression) as file:
+            return parseCSV(
+                file, delim=delim, dtype=dtype, workers=workers,
+                processes=processes, chunkSize=chunkSize
+            );
+
+    out: array.array = dt.empty(dtype);
+    (height, width) = (0, 0);
+    def collect(parsed: typing.Tuple[typing.Any, int, int]) -> None:
+        nonlocal height, width;
+        (data, rows, cols) = parsed;
+        if not rows:
+            return;
+        if height and cols != width:
+            raise ValueError('Uneven matrix encountered.');
+        (height, width) = (height + rows, cols);
+        out.frombytes(memoryview(data).cast('B'));
+
+    chunks: typing.Iterator[typing.AnyStr] = _chunks(source, chunkSize);
+    if workers <= 0:
+        for chunk in chunks:
+            collect(parseChunk(chunk, delim, dtype));
+        return (out, (height, width), dtype);
+
+    pool: type = cf.ProcessPoolExecutor if processes else cf.ThreadPoolExecutor;
+    with pool(max_workers=workers) as executor:
+        pending: typing.Deque[cf.Future] = c.deque();
+        for chunk in chunks:
+            pending.append(executor.submit(parseChunk, chunk, delim, dtype));
+            if len(pending) >= 2 * workers:
+                collect(pending.popleft().result());
+        while pending:
+            collect(pending.popleft().result());
+    return (out, (height, width), dtype);
+
+def writeCSV(
+        target: typing.Union[_Path, typing.IO], rows: typing.Iterable[typing.Sequence],
+        *, delim: str = ',', compression: typing.Optional[str] = None,
+        chunkRows: int = CSV_ROWS) -> None:
+    '''
+        Write rows of numbers as delimited text to a path or a (text or
+        binary) file object, formatting `chunkRows` rows per write, so
+        that memory stays constant whatever the number of rows
+    '''
+    rows = iter(rows);
+    with _opened(target, 'wb', compression) as file:
+        text: bool = isinstance(file, io.TextIOBase);
+        while True:
+            chunk: str = ''.join(
+                delim.join(map(str, row)) + '\n'
+                for row in its.islice(rows, chunkRows)
+            );
+            if not chunk:
+                return;
+            file.write(chunk if text else chunk.encode());
+# endregion
+
+# region binary
+def _littleEndian(data: array.array) -> array.array:
+    'Return the buffer in little-endian order (a copy on big-endian hosts)'
+    if sys.byteorder == 'little':
+        return data;
+    data = array.array(data.typecode, data);
+    data.byteswap();
+    return data;
+
+def packHeader(shape: _Shape, dtype: str) -> bytes:
+    'Return the binary header for a matrix of `shape` and `dtype`'
+    return HEADER.pack(MAGIC, VERSION, 0, dtype.encode(), *shape);
+
+def readHeader(source: typing.IO) -> typing.Tuple[_Shape, str]:
+    'Read and validate the binary header; return `((height, width), dtype)`'
+    raw: bytes = source.read(HEADER.size);
+    if len(raw) != HEADER.size:
+        raise ValueError('Truncated matrix header');
+    (magic, version, _, name, height, width) = HEADER.unpack(raw);
+    if magic != MAGIC:
+        raise ValueError('Not a binary matrix file');
+    if version != VERSION:
+        raise ValueError(f'Unsupported matrix format version {version}');
+    dtype: str = name.rstrip(b'\0').decode();
+    dt.typecode(dtype);
+    return ((height, width), dtype);
+
+def writeBinary(
+        target: typing.Union[_Path, typing.IO], data: typing.Any,
+        shape: _Shape, dtype: str,
+        compression: typing.Optional[str] = None) -> None:
+    '''
+        Write the elements of `shape` and `dtype` in the binary format;
+        `data` is a flat buffer, or an iterable of buffers (e.g. chunks of
+        rows) streamed one write each
+    '''
+    try:
+        chunks: typing.Iterable = (memoryview(data),);
+    except TypeError:
+        chunks: typing.Iterable = data;
+    with _opened(target, 'wb', compression) as file:
+        file.write(packHeader(shape, dtype));
+        for chunk in chunks:
+            if sys.byteorder != 'little':
+                chunk = _littleEndian(array.array(dt.typecode(dtype), chunk));
+            file.write(memoryview(chunk).cast('B'));
+
+def readBinary(
+        source: typing.Union[_Path, typing.IO],
+        compression: typing.Optional[str] = None) -> typing.Tuple[array.array, _Shape, str]:
+    'Read a matrix in the binary format; return `(flat buffer, shape, dtype)`'
+    if _isPath(source) or compression is not None:
+        with _opened(source, 'rb', compression) as file:
+            return readBinary(file);
+    (shape, dtype) = readHeader(source);
+    data: array.array = dt.alloc(dtype, shape[0] * shape[1]);
+    view: memoryview = memoryview(data).cast('B');
+    # read straight into the buffer
+    done: int = 0;
+    while done < len(view):
+        count: int = source.readinto(view[done:]);
+        if not count:
+            raise ValueError('Truncated matrix data');
+        done += count;
+    return (_littleEndian(data), shape, dtype);
+
+# mmap access by the mode of `mapBinary`
+_access: typing.Mapping[str, int] = {
+    'r': mmap.ACCESS_READ,
+    'r+': mmap.ACCESS_WRITE,
+    'c': mmap.ACCESS_COPY,
+};
+
+def mapBinary(
+        path: _Path, mode: str = 'r') -> typing.Tuple[memoryview, _Shape, str]:
+    '''
+        Memory-map a matrix file in the binary format
+
+        Only the header is read; the elements are paged in by the OS on
+        access, and mappings of the same file share the page cache.
+        Modes:
+            - 'r': read-only view;
+            - 'r+': writes go through to the file;
+            - 'c': copy-on-write, the file is never modified.
+        Return `(flat typed view, shape, dtype)`; the view keeps the
+        mapping alive.
+    '''
+    if mode not in _access:
+        raise ValueError(f'Unknown mode {mode!r}; expected one of {tuple(_access)}');
+    if sys.byteorder != 'little':
+        raise NotImplementedError('Mapping needs a little-endian host; use readBinary');
+    with open(path, 'r+b' if mode == 'r+' else 'rb') as file:
+        (shape, dtype) = readHeader(file);
+        size: int = HEADER.size + shape[0] * shape[1] * dt.itemsize(dtype);
+        if os.fstat(file.fileno()).st_size < size:
+            raise ValueError('Truncated matrix data');
+        # the mapping stays valid after the file is closed
+        mapped: mmap.mmap = mmap.mmap(
+            file.fileno(), size, access=_access[mode]
+        );
+    view: memoryview = memoryview(mapped)[HEADER.size:].cast(dt.typecode(dtype));
+    return (view, shape, dtype);
+# endregion
+
+__all__: _slots = (
+    'CHUNK',
+    'CSV_ROWS',
+    'COMPRESSION',
+    'HEADER',
+    'parseChunk',
+    'parseCSV',
+    'writeCSV',
+    'packHeader',
+    'readHeader',
+    'writeBinary',
+    'readBinary',
+    'mapBinary',
+);
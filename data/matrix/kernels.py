@@ -0,0 +1,113 @@
+#!/usr/bin/env -S python3 -i
+# pylint: disable=invalid-name
+'''
+    Pure-Python matrix kernels, used when NumPy is not installed
+
+    Matrices are passed as lists of row lists; every inner loop is a
+    C-level `map` over whole rows.
+'''
+
+import typing;
+import operator as op;
+
+from ...shared import _slots;
+
+_Rows = typing.List[typing.List[typing.Any]];
+
+# number of columns of the right operand kept hot while sweeping all rows
+BLOCK: int = 64;
+# operands with every dimension above this size use Strassen's recursion
+STRASSEN_THRESHOLD: int = 128;
+
+def transpose(rows: _Rows) -> _Rows:
+    'Return the transposed rows'
+    return [list(col) for col in zip(*rows)];
+
+def matmulBlocked(left: _Rows, right: _Rows, width: int) -> _Rows:
+    '''
+        Multiply `left` (n x k) by `right` (k x `width`)
+
+        The columns of `right` are taken in blocks of `BLOCK`; each block
+        is reused against every row of `left` before moving on, and each
+        element is one C-level dot product `sum(map(mul, row, col))`.
+    '''
+    cols: typing.List[typing.Tuple] = list(zip(*right)) or [()] * width;
+    out: _Rows = [[0] * width for _ in left];
+    for start in range(0, width, BLOCK):
+        block: typing.List[typing.Tuple] = cols[start:start + BLOCK];
+        for (row, outRow) in zip(left, out):
+            outRow[start:start + len(block)] = [
+                sum(map(op.mul, row, col)) for col in block
+            ];
+    return out;
+
+def _add(left: _Rows, right: _Rows) -> _Rows:
+    return [list(map(op.add, x, y)) for (x, y) in zip(left, right)];
+
+def _sub(left: _Rows, right: _Rows) -> _Rows:
+    return [list(map(op.sub, x, y)) for (x, y) in zip(left, right)];
+
+def _quadrants(
+        rows: _Rows, height: int,
+        width: int) -> typing.Tuple[_Rows, _Rows, _Rows, _Rows]:
+    'Split `rows` into four `height` x `width` blocks, padding with zeros'
+    def block(top: int, left: int) -> _Rows:
+        out: _Rows = [];
+        for ind in range(top, top + height):
+            row: typing.List = rows[ind][left:left + width] if ind < len(rows) else [];
+            out.append(row + [0] * (width - len(row)));
+        return out;
+    return (block(0, 0), block(0, width), block(height, 0), block(height, width));
+
+def strassen(
+        left: _Rows, right: _Rows, width: int,
+        threshold: int = STRASSEN_THRESHOLD) -> _Rows:
+    '''
+        Multiply `left` (n x k) by `right` (k x `width`) with Strassen's
+        seven-product recursion, padding odd sizes with zeros; blocks with
+        a dimension not above `threshold` use `matmulBlocked`
+    '''
+    (height, inner) = (len(left), len(right));
+    if min(height, inner, width) <= threshold:
+        return matmulBlocked(left, right, width);
+    (h, k, w) = ((height + 1) // 2, (inner + 1) // 2, (width + 1) // 2);
+    (a11, a12, a21, a22) = _quadrants(left, h, k);
+    (b11, b12, b21, b22) = _quadrants(right, k, w);
+
+    def mul(x: _Rows, y: _Rows) -> _Rows:
+        return strassen(x, y, w, threshold);
+    m1: _Rows = mul(_add(a11, a22), _add(b11, b22));
+    m2: _Rows = mul(_add(a21, a22), b11);
+    m3: _Rows = mul(a11, _sub(b12, b22));
+    m4: _Rows = mul(a22, _sub(b21, b11));
+    m5: _Rows = mul(_add(a11, a12), b22);
+    m6: _Rows = mul(_sub(a21, a11), _add(b11, b12));
+    m7: _Rows = mul(_sub(a12, a22), _add(b21, b22));
+
+    c11: _Rows = _add(_sub(_add(m1, m4), m5), m7);
+    c12: _Rows = _add(m3, m5);
+    c21: _Rows = _add(m2, m4);
+    c22: _Rows = _add(_add(_sub(m1, m2), m3), m6);
+    # assemble and crop the padding
+    return [
+        (x + y)[:width]
+        for (x, y) in (*zip(c11, c12), *zip(c21, c22))
+    ][:height];
+
+def matmul(
+        left: _Rows, right: _Rows, width: int,
+        threshold: int = STRASSEN_THRESHOLD) -> _Rows:
+    '''
+        Multiply `left` (n x k) by `right` (k x `width`), using Strassen's
+        recursion when every dimension is above `threshold`
+    '''
+    return strassen(left, right, width, threshold);
+
+__all__: _slots = (
+    'BLOCK',
+    'STRASSEN_THRESHOLD',
+    'transpose',
+    'matmulBlocked',
+    'strassen',
+    'matmul',
+);
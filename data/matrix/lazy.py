@@ -0,0 +1,416 @@
+#!/usr/bin/env -S python3 -i
+'''
+    Lazy Matrix expressions
+
+    `Matrix.lazy()` wraps a matrix in an expression on which `+`, `-`, `*`,
+    `@` and `transpose()` build a DAG instead of computing temporaries;
+    `evaluate()` computes it on demand:
+        - chains of elementwise operations are fused into one pass over the
+          operands (nested C-level `map`s, or NumPy ufuncs writing into one
+          preallocated output);
+        - chains of products are reordered by the matrix-chain dynamic
+          program, minimizing the number of scalar multiplications;
+        - transposes are zero-copy views;
+        - subexpressions used more than once are computed once.
+'''
+# pylint: disable=invalid-name
+# pylint: disable=protected-access
+
+import typing;
+import numbers;
+import operator as op;
+import itertools as its;
+
+from . import Matrix;
+from . import dtype as dt;
+from .dtype import np;
+from ...shared import _slots;
+
+_Operand = typing.Union['Expr', numbers.Real];
+
+class Expr:
+    '''
+        A node of a lazy Matrix expression, with the shape and dtype of its
+        result known when it is built
+    '''
+    __slots__: _slots = (
+        '_shape',
+        '_dtype',
+    );
+
+    def __init__(
+            self: 'Expr', shape: typing.Tuple[int, int], dtype: str) -> None:
+        self._shape: typing.Tuple[int, int] = shape;
+        self._dtype: str = dtype;
+
+    @property
+    def height(self: 'Expr') -> int:
+        'Return the height of the result'
+        return self._shape[0];
+
+    @property
+    def width(self: 'Expr') -> int:
+        'Return the width of the result'
+        return self._shape[1];
+
+    @property
+    def shape(self: 'Expr') -> typing.Tuple[int, int]:
+        'Return `(height, width)` of the result'
+        return self._shape;
+
+    @property
+    def dtype(self: 'Expr') -> str:
+        'Return the dtype of the result'
+        return self._dtype;
+
+    @property
+    def operands(self: 'Expr') -> typing.Tuple['Expr', ...]:
+        'Return the subexpressions'
+        return ();
+
+    def __repr__(self: 'Expr') -> str:
+        return (
+            f'<{self.__class__.__qualname__}'
+            f'; width={self.width}, height={self.height}, dtype={self.dtype}>'
+        );
+
+    def evaluate(self: 'Expr', out: typing.Optional[Matrix] = None) -> Matrix:
+        '''
+            Compute the expression; if `out` (a matrix or view of the
+            result shape) is supplied, the result is written into it
+        '''
+        if out is not None and out.shape != self.shape:
+            raise ValueError(f'Shapes do not match: {self.shape} and {out.shape}');
+        return _Evaluation(self).run(out);
+
+    # region building
+    def _elementwise(
+            self: 'Expr', other: typing.Any,
+            func: typing.Callable[[typing.Any, typing.Any], typing.Any],
+            reflected: bool = False) -> 'Expr':
+        other = lift(other);
+        if other is NotImplemented:
+            return NotImplemented;
+        return Elementwise(func, *((other, self) if reflected else (self, other)));
+
+    def __add__(self: 'Expr', other: typing.Any) -> 'Expr':
+        return self._elementwise(other, op.add);
+
+    def __radd__(self: 'Expr', other: typing.Any) -> 'Expr':
+        return self._elementwise(other, op.add, True);
+
+    def __sub__(self: 'Expr', other: typing.Any) -> 'Expr':
+        return self._elementwise(other, op.sub);
+
+    def __rsub__(self: 'Expr', other: typing.Any) -> 'Expr':
+        return self._elementwise(other, op.sub, True);
+
+    def __mul__(self: 'Expr', other: typing.Any) -> 'Expr':
+        return self._elementwise(other, op.mul);
+
+    def __rmul__(self: 'Expr', other: typing.Any) -> 'Expr':
+        return self._elementwise(other, op.mul, True);
+
+    def __matmul__(self: 'Expr', other: typing.Any) -> 'Expr':
+        other = lift(other);
+        if not isinstance(other, Expr):
+            return NotImplemented;
+        return MatMul(self, other);
+
+    def __rmatmul__(self: 'Expr', other: typing.Any) -> 'Expr':
+        other = lift(other);
+        if not isinstance(other, Expr):
+            return NotImplemented;
+        return MatMul(other, self);
+
+    def transpose(self: 'Expr') -> 'Expr':
+        'Return the lazy transpose'
+        return Transpose(self);
+    # endregion
+
+class Leaf(Expr):
+    'An evaluated matrix'
+    __slots__: _slots = (
+        'matrix',
+    );
+
+    def __init__(self: 'Leaf', matrix: Matrix) -> None:
+        super().__init__(matrix.shape, matrix.dtype);
+        self.matrix: Matrix = matrix;
+
+class Elementwise(Expr):
+    'A binary `operator` function applied elementwise; operands may be scalars'
+    __slots__: _slots = (
+        'func',
+        'left',
+        'right',
+    );
+
+    def __init__(
+            self: 'Elementwise',
+            func: typing.Callable[[typing.Any, typing.Any], typing.Any],
+            left: _Operand, right: _Operand) -> None:
+        exprs: typing.List[Expr] = [
+            elem for elem in (left, right) if isinstance(elem, Expr)
+        ];
+        shapes: typing.Set[typing.Tuple[int, int]] = {elem.shape for elem in exprs};
+        if len(shapes) > 1:
+            raise ValueError(f'Shapes do not match: {left.shape} and {right.shape}');
+        super().__init__(exprs[0].shape, dt.promote(*(
+            elem.dtype if isinstance(elem, Expr) else dt.infer(elem)
+            for elem in (left, right)
+        )));
+        self.func: typing.Callable = func;
+        (self.left, self.right) = (left, right);
+
+    @property
+    def operands(self: 'Elementwise') -> typing.Tuple[Expr, ...]:
+        return tuple(elem for elem in (self.left, self.right) if isinstance(elem, Expr));
+
+class MatMul(Expr):
+    'A matrix product'
+    __slots__: _slots = (
+        'left',
+        'right',
+    );
+
+    def __init__(self: 'MatMul', left: Expr, right: Expr) -> None:
+        if left.width != right.height:
+            raise ValueError(f'Shapes do not align: {left.shape} @ {right.shape}');
+        super().__init__(
+            (left.height, right.width), dt.promote(left.dtype, right.dtype)
+        );
+        (self.left, self.right) = (left, right);
+
+    @property
+    def operands(self: 'MatMul') -> typing.Tuple[Expr, ...]:
+        return (self.left, self.right);
+
+class Transpose(Expr):
+    'A transpose, evaluated as a view'
+    __slots__: _slots = (
+        'operand',
+    );
+
+    def __init__(self: 'Transpose', operand: Expr) -> None:
+        super().__init__(operand.shape[::-1], operand.dtype);
+        self.operand: Expr = operand;
+
+    @property
+    def operands(self: 'Transpose') -> typing.Tuple[Expr, ...]:
+        return (self.operand,);
+
+def lift(value: typing.Any) -> typing.Any:
+    'Return `value` as an operand of expressions, or NotImplemented'
+    if isinstance(value, (Expr, numbers.Real)):
+        return value;
+    if isinstance(value, Matrix):
+        return Leaf(value);
+    return NotImplemented;
+
+def chainOrder(dims: typing.Sequence[int]) -> typing.Tuple[int, typing.Any]:
+    '''
+        Return `(cost, order)` of the cheapest parenthesization of the
+        product of matrices whose shapes are `(dims[i], dims[i + 1])`,
+        where `order` is an operand index or a pair of orders
+    '''
+    count: int = len(dims) - 1;
+    cost: typing.List[typing.List[int]] = [[0] * count for _ in range(count)];
+    split: typing.List[typing.List[int]] = [[0] * count for _ in range(count)];
+    for length in range(2, count + 1):
+        for first in range(count - length + 1):
+            last: int = first + length - 1;
+            (cost[first][last], split[first][last]) = min(
+                (
+                    cost[first][mid] + cost[mid + 1][last]
+                    + dims[first] * dims[mid + 1] * dims[last + 1],
+                    mid
+                )
+                for mid in range(first, last)
+            );
+
+    def order(first: int, last: int) -> typing.Any:
+        if first == last:
+            return first;
+        mid: int = split[first][last];
+        return (order(first, mid), order(mid + 1, last));
+    return (cost[0][count - 1], order(0, count - 1));
+
+# NumPy ufunc of each operator function
+_ufuncs: typing.Dict[typing.Callable, str] = {
+    op.add: 'add',
+    op.sub: 'subtract',
+    op.mul: 'multiply',
+};
+
+class _Evaluation:
+    'The state of one evaluation: reference counts and computed nodes'
+    __slots__: _slots = (
+        '_root',
+        '_refs',
+        '_done',
+    );
+
+    def __init__(self: '_Evaluation', root: Expr) -> None:
+        self._root: Expr = root;
+        # number of parents of every node, by id
+        self._refs: typing.Dict[int, int] = {};
+        self._done: typing.Dict[int, Matrix] = {};
+        stack: typing.List[Expr] = [root];
+        while stack:
+            node: Expr = stack.pop();
+            for child in node.operands:
+                self._refs[id(child)] = self._refs.get(id(child), 0) + 1;
+                if self._refs[id(child)] == 1:
+                    stack.append(child);
+
+    def _inline(self: '_Evaluation', node: typing.Any, kind: type) -> bool:
+        'Whether `node` of `kind` is fused into its parent instead of computed'
+        return isinstance(node, kind) and self._refs.get(id(node), 0) <= 1;
+
+    def _leaves(self: '_Evaluation') -> typing.Iterator[Matrix]:
+        stack: typing.List[Expr] = [self._root];
+        seen: typing.Set[int] = set();
+        while stack:
+            node: Expr = stack.pop();
+            if id(node) in seen:
+                continue;
+            seen.add(id(node));
+            if isinstance(node, Leaf):
+                yield node.matrix;
+            stack.extend(node.operands);
+
+    def run(self: '_Evaluation', out: typing.Optional[Matrix]) -> Matrix:
+        if out is not None and any(
+                leaf._data.obj is out._data.obj for leaf in self._leaves()):
+            # the output would be overwritten while still read
+            out.assign(self.compute(self._root));
+            return out;
+        return self.compute(self._root, out);
+
+    def compute(
+            self: '_Evaluation', node: Expr,
+            out: typing.Optional[Matrix] = None) -> Matrix:
+        'Return the matrix of `node`, written into `out` if supplied'
+        if id(node) in self._done:
+            result: Matrix = self._done[id(node)];
+        elif isinstance(node, Elementwise):
+            return self._fused(node, out);
+        elif isinstance(node, MatMul):
+            result: Matrix = self._chain(node, out);
+            if result is out:
+                return out;
+        elif isinstance(node, Transpose):
+            source: Matrix = self.compute(node.operand);
+            (rowStride, colStride) = source.strides;
+            result: Matrix = source._view(
+                source.offset, node.shape, (colStride, rowStride)
+            );
+        else:
+            result: Matrix = node.matrix;
+        self._done[id(node)] = result;
+        if out is not None:
+            out.assign(result);
+            return out;
+        return result;
+
+    # region products
+    def _chain(
+            self: '_Evaluation', node: MatMul,
+            out: typing.Optional[Matrix]) -> Matrix:
+        'Multiply the operands of a product chain in the cheapest order'
+        operands: typing.List[Expr] = [];
+        def flatten(item: Expr) -> None:
+            if item is node or self._inline(item, MatMul):
+                flatten(item.left);
+                flatten(item.right);
+            else:
+                operands.append(item);
+        flatten(node);
+        matrices: typing.List[Matrix] = [*map(self.compute, operands)];
+        (_, order) = chainOrder(
+            [matrices[0].height, *(elem.width for elem in matrices)]
+        );
+
+        def multiply(item: typing.Any, target: typing.Optional[Matrix] = None) -> Matrix:
+            if isinstance(item, int):
+                return matrices[item];
+            (left, right) = (multiply(item[0]), multiply(item[1]));
+            if (
+                    target is not None and np is not None
+                    and target.dtype == dt.promote(left.dtype, right.dtype)):
+                np.matmul(left._asarray(), right._asarray(), out=target._asarray());
+                target._touch();
+                return target;
+            return left @ right;
+        result: Matrix = multiply(order, out);
+        self._done[id(node)] = result;
+        return result;
+    # endregion
+
+    # region elementwise
+    def _fused(
+            self: '_Evaluation', node: Elementwise,
+            out: typing.Optional[Matrix]) -> Matrix:
+        'Compute an elementwise tree in one pass over its operands'
+        if np is not None:
+            target: Matrix = out if out is not None and out.dtype == node.dtype \
+                else Matrix.zeros(*node.shape, node.dtype);
+            self._fill(node, target._asarray());
+            target._touch();
+        else:
+            target: Matrix = Matrix.fromIterable(
+                map(node.func, self._stream(node.left), self._stream(node.right)),
+                node.shape, node.dtype
+            );
+        self._done[id(node)] = target;
+        if out is not None and target is not out:
+            out.assign(target);
+            return out;
+        return target;
+
+    def _value(self: '_Evaluation', item: _Operand) -> typing.Any:
+        'Return a scalar, or the NumPy view of a computed operand'
+        if isinstance(item, Expr):
+            return self.compute(item)._asarray();
+        return item;
+
+    def _fill(self: '_Evaluation', node: Elementwise, target: typing.Any) -> None:
+        '''
+            Write `node` into the array `target` with ufuncs: the left
+            subtree is computed in `target` itself, so only right subtrees
+            need a temporary
+        '''
+        if self._inline(node.left, Elementwise):
+            self._fill(node.left, target);
+            left: typing.Any = target;
+        else:
+            left: typing.Any = self._value(node.left);
+        if self._inline(node.right, Elementwise):
+            right: typing.Any = np.empty(node.shape, dtype=node.right.dtype);
+            self._fill(node.right, right);
+        else:
+            right: typing.Any = self._value(node.right);
+        getattr(np, _ufuncs[node.func])(left, right, out=target, casting='unsafe');
+
+    def _stream(self: '_Evaluation', item: _Operand) -> typing.Iterator:
+        '''
+            Return the row-major elements of `item` as nested C-level `map`
+            iterators over the operand buffers; nothing is materialized
+        '''
+        if self._inline(item, Elementwise):
+            return map(item.func, self._stream(item.left), self._stream(item.right));
+        if isinstance(item, Expr):
+            return iter(self.compute(item)._flat());
+        return its.repeat(item);
+    # endregion
+
+__all__: _slots = (
+    'Expr',
+    'Leaf',
+    'Elementwise',
+    'MatMul',
+    'Transpose',
+    'lift',
+    'chainOrder',
+);
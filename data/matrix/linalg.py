@@ -0,0 +1,398 @@
+#!/usr/bin/env -S python3 -i
+'''
+    Dense linear algebra on Matrix with cached factorizations
+
+    `lu`, `cholesky` and `qr` return factorization objects that are cached
+    on the matrix until it is written through `m[...] = ...` or `assign`
+    (by itself or by any view of the same buffer); `solve`, `det`,
+    `inverse` and `lstsq` reuse them, so repeated solves against one
+    system cost O(n^2) each after the first O(n^3) factorization. Writes
+    to a mapped file by other processes are not detected.
+
+    With NumPy, factorizations and substitutions are vectorized over whole
+    rows; without it, every row update is one C-level `map`, and LU works
+    by panels of `kernels.BLOCK` columns. Results are float64 matrices.
+'''
+# pylint: disable=invalid-name
+# pylint: disable=protected-access
+
+import math;
+import typing;
+import numbers;
+import operator as op;
+import itertools as its;
+
+from . import Matrix;
+from . import kernels;
+from .dtype import np;
+from ...shared import _slots;
+
+_Rows = typing.List[typing.List[float]];
+
+def _square(matrix: Matrix) -> int:
+    if matrix.height != matrix.width:
+        raise ValueError(f'Square matrix expected: {matrix.shape}');
+    return matrix.height;
+
+# region operands
+def _floatRows(matrix: Matrix) -> _Rows:
+    return [list(map(float, row)) for row in matrix.rows()];
+
+def _floatArray(matrix: Matrix) -> typing.Any:
+    return matrix._asarray().astype('float64');
+
+def _rhs(
+        rhs: typing.Any, height: int,
+        asArray: bool) -> typing.Tuple[typing.Any, bool]:
+    '''
+        Return the right-hand side as float rows (or an array) and whether
+        it was a flat vector; a matrix, a sequence of rows or a vector
+    '''
+    if isinstance(rhs, Matrix):
+        (values, vector) = (_floatArray(rhs) if asArray else _floatRows(rhs), False);
+    else:
+        rows: typing.List = list(rhs);
+        vector: bool = not rows or isinstance(rows[0], numbers.Number);
+        rows = [[float(elem)] for elem in rows] if vector else \
+            [list(map(float, row)) for row in rows];
+        values: typing.Any = np.array(rows, dtype='float64').reshape(len(rows), -1) \
+            if asArray else rows;
+    if len(values) != height:
+        raise ValueError(f'Right-hand side needs {height} rows: {len(values)}');
+    return (values, vector);
+
+def _result(values: typing.Any, vector: bool) -> typing.Any:
+    'Return the solution as a matrix, or as a list if the input was a vector'
+    if vector:
+        return [row[0] for row in values.tolist()] if np is not None else \
+            [row[0] for row in values];
+    if np is not None:
+        return Matrix._fromArray(values, 'float64');
+    return Matrix._fromRows(
+        values, (len(values), len(values[0]) if values else 0), 'float64'
+    );
+# endregion
+
+# region triangular solves
+def _forward(lower: typing.Any, rhs: typing.Any, unit: bool) -> typing.Any:
+    'Solve `lower @ x = rhs` for a lower triangular `lower`'
+    if np is not None:
+        out: typing.Any = rhs.copy();
+        for ind in range(len(out)):
+            out[ind] -= lower[ind, :ind] @ out[:ind];
+            if not unit:
+                out[ind] /= lower[ind, ind];
+        return out;
+    out: _Rows = [];
+    for (ind, row) in enumerate(lower):
+        acc: typing.Iterable = rhs[ind];
+        for (coef, prev) in zip(row[:ind], out):
+            if coef:
+                acc = map(op.sub, acc, map(op.mul, prev, its.repeat(coef)));
+        out.append(list(acc if unit else map(op.truediv, acc, its.repeat(row[ind]))));
+    return out;
+
+def _backward(upper: typing.Any, rhs: typing.Any) -> typing.Any:
+    'Solve `upper @ x = rhs` for an upper triangular `upper`'
+    size: int = len(rhs);
+    if np is not None:
+        out: typing.Any = rhs.copy();
+        for ind in reversed(range(size)):
+            out[ind] -= upper[ind, ind + 1:] @ out[ind + 1:];
+            out[ind] /= upper[ind, ind];
+        return out;
+    out: _Rows = [[]] * size;
+    for ind in reversed(range(size)):
+        row: typing.List[float] = upper[ind];
+        acc: typing.Iterable = rhs[ind];
+        for pos in range(ind + 1, size):
+            if row[pos]:
+                acc = map(op.sub, acc, map(op.mul, out[pos], its.repeat(row[pos])));
+        out[ind] = list(map(op.truediv, acc, its.repeat(row[ind])));
+    return out;
+# endregion
+
+class LU:
+    '''
+        The LU decomposition with partial pivoting `P @ A = L @ U`
+
+        `L` (unit lower triangular) and `U` are packed in one array; `perm`
+        lists the rows of `A` in pivot order.
+    '''
+    __slots__: _slots = (
+        '_packed',
+        'perm',
+        'sign',
+        'singular',
+    );
+
+    def __init__(self: 'LU', matrix: Matrix) -> None:
+        'Factorize the square `matrix` in O(n^3)'
+        size: int = _square(matrix);
+        self.perm: typing.List[int] = list(range(size));
+        self.sign: int = 1;
+        self.singular: bool = False;
+        if np is not None:
+            self._packed: typing.Any = self._factorArray(_floatArray(matrix));
+        else:
+            self._packed: typing.Any = self._factorRows(_floatRows(matrix));
+
+    def _pivot(self: 'LU', packed: typing.Any, col: int) -> bool:
+        '''
+            Swap the row with the largest magnitude in column `col` into
+            place; return False (marking the matrix singular) if all are 0
+        '''
+        pivot: int = max(range(col, len(packed)), key=lambda row: abs(packed[row][col]));
+        if not packed[pivot][col]:
+            self.singular = True;
+            return False;
+        if pivot != col:
+            if np is not None:
+                packed[[col, pivot]] = packed[[pivot, col]];
+            else:
+                (packed[col], packed[pivot]) = (packed[pivot], packed[col]);
+            (self.perm[col], self.perm[pivot]) = (self.perm[pivot], self.perm[col]);
+            self.sign = -self.sign;
+        return True;
+
+    def _factorArray(self: 'LU', packed: typing.Any) -> typing.Any:
+        'Factorize in place with one rank-1 update of the array per column'
+        for col in range(len(packed)):
+            if self._pivot(packed, col):
+                packed[col + 1:, col] /= packed[col, col];
+                packed[col + 1:, col + 1:] -= np.outer(
+                    packed[col + 1:, col], packed[col, col + 1:]
+                );
+        return packed;
+
+    def _factorRows(self: 'LU', packed: _Rows) -> _Rows:
+        '''
+            Factorize in place by panels of `kernels.BLOCK` columns
+
+            Each panel is factorized on its own columns only; the rows of
+            `U` to its right are then solved against the panel's unit
+            lower triangle, and the trailing rows are updated once per
+            panel with those rows kept hot, instead of being swept once
+            per column.
+        '''
+        size: int = len(packed);
+        for start in range(0, size, kernels.BLOCK):
+            stop: int = min(start + kernels.BLOCK, size);
+            for col in range(start, stop):
+                if not self._pivot(packed, col):
+                    continue;
+                head: typing.List[float] = packed[col];
+                tail: typing.List[float] = head[col + 1:stop];
+                for row in packed[col + 1:]:
+                    scale: float = row[col] / head[col];
+                    row[col] = scale;
+                    if scale:
+                        row[col + 1:stop] = map(
+                            op.sub, row[col + 1:stop], map(op.mul, tail, its.repeat(scale))
+                        );
+            if stop == size:
+                break;
+            panel: _Rows = [];
+            for ind in range(start, stop):
+                row: typing.List[float] = packed[ind];
+                acc: typing.Iterable = row[stop:];
+                for (pos, upper) in enumerate(panel, start):
+                    if row[pos]:
+                        acc = map(op.sub, acc, map(op.mul, upper, its.repeat(row[pos])));
+                panel.append(list(acc));
+                row[stop:] = panel[-1];
+            for row in packed[stop:]:
+                acc: typing.Iterable = row[stop:];
+                for (pos, upper) in enumerate(panel, start):
+                    if row[pos]:
+                        acc = map(op.sub, acc, map(op.mul, upper, its.repeat(row[pos])));
+                row[stop:] = acc;
+        return packed;
+
+    def solve(self: 'LU', rhs: typing.Any) -> typing.Any:
+        '''
+            Solve `A @ x = rhs` in O(n^2) per column of `rhs` (a matrix, a
+            sequence of rows, or a vector, giving a list)
+        '''
+        if self.singular:
+            raise ValueError('Singular matrix');
+        (values, vector) = _rhs(rhs, len(self.perm), np is not None);
+        values = values[self.perm] if np is not None else [values[row] for row in self.perm];
+        return _result(
+            _backward(self._packed, _forward(self._packed, values, True)), vector
+        );
+
+    def det(self: 'LU') -> float:
+        'Return the determinant'
+        if self.singular:
+            return 0.0;
+        return self.sign * math.prod(
+            self._packed[ind][ind] for ind in range(len(self.perm))
+        );
+
+class Cholesky:
+    'The Cholesky decomposition `A = L @ L.T` of a symmetric positive definite matrix'
+    __slots__: _slots = (
+        '_lower',
+        '_upper',
+    );
+
+    def __init__(self: 'Cholesky', matrix: Matrix) -> None:
+        'Factorize the square `matrix` in O(n^3); raise ValueError if not positive definite'
+        size: int = _square(matrix);
+        if np is not None:
+            try:
+                self._lower: typing.Any = np.linalg.cholesky(_floatArray(matrix));
+            except np.linalg.LinAlgError:
+                raise ValueError('Matrix is not positive definite') from None;
+            self._upper: typing.Any = self._lower.T.copy();
+            return;
+        source: _Rows = _floatRows(matrix);
+        lower: _Rows = [[0.0] * size for _ in range(size)];
+        for col in range(size):
+            head: typing.List[float] = lower[col][:col];
+            diag: float = source[col][col] - sum(map(op.mul, head, head));
+            if diag <= 0:
+                raise ValueError('Matrix is not positive definite');
+            lower[col][col] = math.sqrt(diag);
+            for row in range(col + 1, size):
+                lower[row][col] = (
+                    source[row][col] - sum(map(op.mul, lower[row][:col], head))
+                ) / lower[col][col];
+        self._lower: _Rows = lower;
+        self._upper: _Rows = [list(col) for col in zip(*lower)];
+
+    def solve(self: 'Cholesky', rhs: typing.Any) -> typing.Any:
+        'Solve `A @ x = rhs` in O(n^2) per column of `rhs`; see `LU.solve`'
+        (values, vector) = _rhs(rhs, len(self._lower), np is not None);
+        return _result(
+            _backward(self._upper, _forward(self._lower, values, False)), vector
+        );
+
+    def det(self: 'Cholesky') -> float:
+        'Return the determinant'
+        return math.prod(
+            self._lower[ind][ind] for ind in range(len(self._lower))
+        ) ** 2;
+
+class QR:
+    '''
+        The reduced QR decomposition `A = Q @ R` of a `m` x `n` matrix with
+        `m >= n`, where `Q` has orthonormal columns and `R` is upper
+        triangular (by modified Gram-Schmidt without NumPy)
+    '''
+    __slots__: _slots = (
+        '_qt',
+        '_r',
+        'rank',
+    );
+
+    def __init__(self: 'QR', matrix: Matrix) -> None:
+        'Factorize `matrix` in O(m n^2)'
+        (height, width) = matrix.shape;
+        if height < width:
+            raise ValueError(f'QR needs at least as many rows as columns: {matrix.shape}');
+        if np is not None:
+            (q, r) = np.linalg.qr(_floatArray(matrix));
+            (self._qt, self._r) = (q.T.copy(), r);
+            self.rank: int = int(np.count_nonzero(
+                np.abs(np.diag(r)) > 1e-12 * max(1.0, float(np.abs(r).max(initial=0)))
+            ));
+            return;
+        cols: _Rows = [list(map(float, col)) for col in zip(*matrix.rows())];
+        basis: _Rows = [];
+        upper: _Rows = [[0.0] * width for _ in range(width)];
+        self.rank: int = 0;
+        for (ind, vec) in enumerate(cols):
+            for (pos, unit) in enumerate(basis):
+                proj: float = sum(map(op.mul, unit, vec));
+                upper[pos][ind] = proj;
+                vec = list(map(op.sub, vec, map(op.mul, unit, its.repeat(proj))));
+            norm: float = math.sqrt(sum(map(op.mul, vec, vec)));
+            upper[ind][ind] = norm;
+            if norm > 1e-12:
+                self.rank += 1;
+            basis.append([elem / norm for elem in vec] if norm else vec);
+        (self._qt, self._r) = (basis, upper);
+
+    @property
+    def Q(self: 'QR') -> Matrix:
+        'Return the factor Q'
+        if np is not None:
+            return Matrix._fromArray(self._qt.T, 'float64');
+        return Matrix._fromRows(
+            zip(*self._qt), (len(self._qt[0]) if self._qt else 0, len(self._qt)), 'float64'
+        );
+
+    @property
+    def R(self: 'QR') -> Matrix:
+        'Return the factor R'
+        return _result(self._r, False);
+
+    def solve(self: 'QR', rhs: typing.Any) -> typing.Any:
+        '''
+            Return the least-squares solution of `A @ x = rhs`, minimizing
+            the norm of `A @ x - rhs`; see `LU.solve`
+        '''
+        if self.rank < len(self._r):
+            raise ValueError('Matrix is rank deficient');
+        height: int = len(self._qt[0]) if len(self._qt) else 0;
+        (values, vector) = _rhs(rhs, height, np is not None);
+        if np is not None:
+            projected: typing.Any = self._qt @ values;
+        else:
+            columns: _Rows = [list(col) for col in zip(*values)];
+            projected: _Rows = [
+                [sum(map(op.mul, unit, col)) for col in columns]
+                for unit in self._qt
+            ];
+        return _result(_backward(self._r, projected), vector);
+
+def lu(matrix: Matrix) -> LU:
+    'Return the (cached) LU decomposition of the square `matrix`'
+    return matrix._cached('lu', LU);
+
+def cholesky(matrix: Matrix) -> Cholesky:
+    'Return the (cached) Cholesky decomposition of the square `matrix`'
+    return matrix._cached('cholesky', Cholesky);
+
+def qr(matrix: Matrix) -> QR:
+    'Return the (cached) QR decomposition of `matrix`'
+    return matrix._cached('qr', QR);
+
+def solve(matrix: Matrix, rhs: typing.Any, method: str = 'lu') -> typing.Any:
+    '''
+        Solve `matrix @ x = rhs` with the cached factorization `method`
+        ('lu', 'cholesky' or 'qr'); see `LU.solve`
+    '''
+    factorizations: typing.Dict[str, typing.Callable[[Matrix], typing.Any]] = {
+        'lu': lu, 'cholesky': cholesky, 'qr': qr,
+    };
+    if method not in factorizations:
+        raise ValueError(f'Unknown method {method!r}; expected one of {tuple(factorizations)}');
+    return factorizations[method](matrix).solve(rhs);
+
+def det(matrix: Matrix) -> float:
+    'Return the determinant of the square `matrix`'
+    return lu(matrix).det();
+
+def inverse(matrix: Matrix) -> Matrix:
+    'Return the inverse of the square `matrix`; raise ValueError if singular'
+    return lu(matrix).solve(Matrix.identity(_square(matrix), 'float64'));
+
+def lstsq(matrix: Matrix, rhs: typing.Any) -> typing.Any:
+    'Return the least-squares solution of `matrix @ x = rhs`; see `QR.solve`'
+    return qr(matrix).solve(rhs);
+
+__all__: _slots = (
+    'LU',
+    'Cholesky',
+    'QR',
+    'lu',
+    'cholesky',
+    'qr',
+    'solve',
+    'det',
+    'inverse',
+    'lstsq',
+);
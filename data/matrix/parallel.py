@@ -0,0 +1,405 @@
+#!/usr/bin/env -S python3 -i
+'''
+    Process-parallel Matrix kernels over shared memory
+
+    Results are allocated in shared mappings (files on the `/dev/shm`
+    tmpfs where available) that a persistent process pool maps by path
+    and writes in place; the result matrix is stored on the mapping
+    itself, so nothing is copied back and only paths and bounds are
+    pickled. Operands stored in shared mappings (results of these kernels,
+    or matrices passed through `share`) are mapped by the workers as
+    they are; others are copied into a shared mapping once per call.
+    Work below `threshold` elements, or with fewer than two workers, runs
+    serially.
+
+    `configure(workers=..., threshold=..., auto=...)` sets the defaults
+    (the threshold counts scalar multiplications for products). Matrix
+    operators only use these kernels after `configure(auto=True)`; then
+    large products and elementwise operations run in the pool when NumPy
+    is not installed. With NumPy, Matrix keeps using it, as its products
+    already run on a multithreaded BLAS and its elementwise loops are
+    bound by memory bandwidth, which more processes do not add. Platforms
+    starting processes by spawning (macOS, Windows, and Linux from Python
+    3.14) need the usual `if __name__ == '__main__':` guard in the script
+    that starts the pool.
+'''
+# pylint: disable=invalid-name
+# pylint: disable=protected-access
+
+import os;
+import mmap;
+import array;
+import atexit;
+import typing;
+import weakref;
+import tempfile;
+import functools as fts;
+import itertools as its;
+import concurrent.futures as cf;
+
+from . import Matrix;
+from . import kernels;
+from . import fileIO;
+from . import dtype as dt;
+from .dtype import np;
+from ...shared import _slots;
+
+# directory of the shared mappings: a tmpfs, so that they stay in memory
+SHARED_DIR: typing.Optional[str] = '/dev/shm' if os.path.isdir('/dev/shm') else None;
+
+class _Config:
+    'The settings of the parallel kernels'
+    __slots__: _slots = (
+        'workers',
+        'threshold',
+        'auto',
+    );
+
+    def __init__(self: '_Config') -> None:
+        self.workers: int = os.cpu_count() or 1;
+        # operations on fewer elements run serially
+        self.threshold: int = 1 << 20;
+        # whether Matrix operators use the parallel kernels; opt-in, as
+        # this starts worker processes behind plain operators
+        self.auto: bool = False;
+
+_config: _Config = _Config();
+_executor: typing.Optional[cf.ProcessPoolExecutor] = None;
+
+def configure(
+        workers: typing.Optional[int] = None,
+        threshold: typing.Optional[int] = None,
+        auto: typing.Optional[bool] = None) -> None:
+    '''
+        Set the number of worker processes, the size threshold in elements
+        below which work runs serially, and whether Matrix operators use
+        the parallel kernels automatically; the pool is restarted if the
+        number of workers changes
+    '''
+    if workers is not None and workers != _config.workers:
+        if workers < 1:
+            raise ValueError(f'Number of workers must be positive: {workers}');
+        shutdown();
+        _config.workers = workers;
+    if threshold is not None:
+        _config.threshold = threshold;
+    if auto is not None:
+        _config.auto = auto;
+
+def shutdown() -> None:
+    'Stop the worker processes; they are started again when needed'
+    global _executor; # pylint: disable=global-statement
+    if _executor is not None:
+        _executor.shutdown();
+        _executor = None;
+
+atexit.register(shutdown);
+
+def _pool() -> cf.ProcessPoolExecutor:
+    global _executor; # pylint: disable=global-statement
+    if _executor is None:
+        _executor = cf.ProcessPoolExecutor(max_workers=_config.workers);
+    return _executor;
+
+def _workers(size: int, workers: typing.Optional[int]) -> int:
+    'Return the number of workers for `size` elements; below 2 means serial'
+    workers = _config.workers if workers is None else workers;
+    return workers if size >= _config.threshold else 1;
+
+def enabled(size: int) -> bool:
+    'Whether Matrix operators on `size` elements use the parallel kernels'
+    return _config.auto and _workers(size, None) > 1;
+
+def _blocks(height: int, workers: int) -> typing.List[typing.Tuple[int, int]]:
+    'Split `height` rows into about two blocks per worker'
+    step: int = max(1, -(-height // (2 * workers)));
+    return [(start, min(start + step, height)) for start in range(0, height, step)];
+
+# region shared memory
+# what workers need to map a buffer: (path, byte offset, elements, dtype)
+_Spec = typing.Tuple[str, int, int, str];
+
+# the file of every shared mapping, removed when the mapping is collected
+_paths: typing.MutableMapping[mmap.mmap, str] = weakref.WeakKeyDictionary();
+
+def _remove(path: str, pid: int) -> None:
+    'Remove the file of a collected mapping, in the process that created it'
+    if os.getpid() == pid:
+        try:
+            os.unlink(path);
+        except FileNotFoundError:
+            pass;
+
+def _empty(shape: typing.Tuple[int, int], dtype: str) -> Matrix:
+    'Return an uninitialized matrix stored in a new shared mapping'
+    size: int = shape[0] * shape[1] * dt.itemsize(dtype);
+    (fd, path) = tempfile.mkstemp(prefix='algo-matrix-', dir=SHARED_DIR);
+    try:
+        os.ftruncate(fd, max(1, size));
+        # the mapping stays valid after the file is closed
+        mapped: mmap.mmap = mmap.mmap(fd, max(1, size));
+    except BaseException:
+        os.unlink(path);
+        raise;
+    finally:
+        os.close(fd);
+    _paths[mapped] = path;
+    weakref.finalize(mapped, _remove, path, os.getpid());
+    return Matrix._wrap(
+        memoryview(mapped)[:size].cast(dt.typecode(dtype)), shape, dtype
+    );
+
+def _spec(matrix: Matrix) -> typing.Optional[_Spec]:
+    'Return the spec of the elements of a shared contiguous matrix, or None'
+    path: typing.Optional[str] = _paths.get(matrix._data.obj) \
+        if isinstance(matrix._data.obj, mmap.mmap) else None;
+    if path is None or not matrix._contiguous:
+        return None;
+    return (
+        path, matrix._offset * matrix._data.itemsize,
+        matrix.height * matrix.width, matrix.dtype
+    );
+
+def share(matrix: Matrix) -> Matrix:
+    '''
+        Return `matrix` if its elements are contiguous in a shared mapping,
+        otherwise a copy in a new one; a shared operand is passed to the
+        workers without copying, however many kernels it goes through
+    '''
+    if _spec(matrix) is not None:
+        return matrix;
+    out: Matrix = _empty(matrix.shape, matrix.dtype);
+    if matrix.height * matrix.width:
+        out._data[:] = matrix._flat();
+    return out;
+
+def _attached(
+        task: typing.Callable[..., typing.Any], *specs: _Spec) -> typing.Any:
+    '''
+        Run `task` in a worker on typed views of the shared buffers; the
+        views should not outlive `task`
+    '''
+    maps: typing.List[mmap.mmap] = [];
+    views: typing.List[memoryview] = [];
+    try:
+        for (path, offset, size, dtype) in specs:
+            with open(path, 'r+b') as file:
+                maps.append(mmap.mmap(file.fileno(), 0));
+            views.append(
+                memoryview(maps[-1])[offset:offset + size * dt.itemsize(dtype)]
+                .cast(dt.typecode(dtype))
+            );
+        return task(*views);
+    finally:
+        for view in views:
+            view.release();
+        for mapped in maps:
+            try:
+                mapped.close();
+            except BufferError:
+                # views still referenced by a traceback
+                pass;
+# endregion
+
+# region worker tasks
+def _matmulTask(
+        left: _Spec, right: _Spec, out: _Spec,
+        inner: int, width: int, start: int, stop: int) -> None:
+    'Compute rows `start:stop` of the product into the shared output'
+    def task(lhs: memoryview, rhs: memoryview, res: memoryview) -> None:
+        if np is not None:
+            res = np.frombuffer(res, dtype=out[3]).reshape(-1, width);
+            res[start:stop] = (
+                np.frombuffer(lhs, dtype=left[3]).reshape(-1, inner)[start:stop]
+                @ np.frombuffer(rhs, dtype=right[3]).reshape(inner, width)
+            );
+            return;
+        rows: typing.List[typing.List] = [
+            lhs[row * inner:(row + 1) * inner].tolist() for row in range(start, stop)
+        ];
+        cols: typing.List[typing.List] = [
+            rhs[row * width:(row + 1) * width].tolist() for row in range(inner)
+        ];
+        res[start * width:stop * width] = array.array(
+            res.format,
+            its.chain.from_iterable(kernels.matmul(rows, cols, width))
+        );
+    _attached(task, left, right, out);
+
+def _elementwiseTask(
+        func: typing.Callable, left: _Spec, right: typing.Any,
+        out: _Spec, start: int, stop: int, reflected: bool) -> None:
+    '''
+        Apply `func` to elements `start:stop` into the shared output;
+        `right` is a spec or a scalar
+    '''
+    def task(lhs: memoryview, res: memoryview, rhs: typing.Any = None) -> None:
+        first: typing.Iterable = lhs[start:stop];
+        second: typing.Iterable = (
+            its.repeat(right) if rhs is None else rhs[start:stop]
+        );
+        if reflected:
+            (first, second) = (second, first);
+        res[start:stop] = array.array(res.format, map(func, first, second));
+    if isinstance(right, tuple):
+        _attached(task, left, out, right);
+    else:
+        _attached(task, left, out);
+
+def _mapTask(
+        func: typing.Callable, source: _Spec, out: _Spec,
+        start: int, stop: int) -> None:
+    'Apply the unary `func` to elements `start:stop` into the shared output'
+    def task(src: memoryview, res: memoryview) -> None:
+        res[start:stop] = array.array(res.format, map(func, src[start:stop]));
+    _attached(task, source, out);
+
+def _reduceTask(
+        func: typing.Callable, source: _Spec,
+        start: int, stop: int) -> typing.Any:
+    'Reduce elements `start:stop` with `func`'
+    def task(src: memoryview) -> typing.Any:
+        return fts.reduce(func, src[start:stop]);
+    return _attached(task, source);
+# endregion
+
+def _run(
+        tasks: typing.Iterable[typing.Tuple[typing.Callable, tuple]]) -> typing.List:
+    'Run the tasks on the pool and return their results in order'
+    pool: cf.ProcessPoolExecutor = _pool();
+    return [
+        future.result()
+        for future in [pool.submit(func, *args) for (func, args) in tasks]
+    ];
+
+def matmul(
+        left: Matrix, right: Matrix,
+        workers: typing.Optional[int] = None) -> Matrix:
+    'Multiply two matrices, by blocks of rows of `left` in parallel'
+    if left.width != right.height:
+        raise ValueError(f'Shapes do not align: {left.shape} @ {right.shape}');
+    (height, inner, width) = (left.height, left.width, right.width);
+    dtype: str = dt.promote(left.dtype, right.dtype);
+    count: int = _workers(height * inner * width, workers);
+    if count < 2:
+        if np is not None:
+            return Matrix._fromArray(left._asarray() @ right._asarray(), dtype);
+        return Matrix._fromRows(
+            kernels.matmul(list(left.rows()), list(right.rows()), width),
+            (height, width), dtype
+        );
+    (left, right) = (share(left), share(right));
+    out: Matrix = _empty((height, width), dtype);
+    _run(
+        (_matmulTask, (_spec(left), _spec(right), _spec(out), inner, width, start, stop))
+        for (start, stop) in _blocks(height, count)
+    );
+    return out;
+
+def elementwise(
+        left: Matrix, right: typing.Any,
+        func: typing.Callable[[typing.Any, typing.Any], typing.Any],
+        reflected: bool = False,
+        workers: typing.Optional[int] = None) -> Matrix:
+    '''
+        Apply the binary `func` (picklable, e.g. an `operator` function)
+        elementwise with a matrix of the same shape or a scalar, by blocks
+        in parallel; if `reflected`, `right` is the left operand
+    '''
+    isMatrix: bool = isinstance(right, Matrix);
+    if isMatrix and right.shape != left.shape:
+        raise ValueError(f'Shapes do not match: {left.shape} and {right.shape}');
+    size: int = left.height * left.width;
+    dtype: str = dt.promote(left.dtype, right.dtype if isMatrix else dt.infer(right));
+    count: int = _workers(size, workers);
+    if count < 2:
+        values: typing.Iterable = right._flat() if isMatrix else its.repeat(right);
+        return Matrix.fromIterable(
+            map(func, values, left._flat()) if reflected
+            else map(func, left._flat(), values),
+            left.shape, dtype
+        );
+    left = share(left);
+    if isMatrix:
+        right = share(right);
+    out: Matrix = _empty(left.shape, dtype);
+    other: typing.Any = _spec(right) if isMatrix else right;
+    _run(
+        (_elementwiseTask, (
+            func, _spec(left), other, _spec(out),
+            start * left.width, stop * left.width, reflected
+        ))
+        for (start, stop) in _blocks(left.height, count)
+    );
+    return out;
+
+def apply(
+        func: typing.Callable[[typing.Any], typing.Any], matrix: Matrix,
+        dtype: typing.Optional[str] = None,
+        workers: typing.Optional[int] = None) -> Matrix:
+    '''
+        Apply the unary `func` (picklable) to every element, by blocks in
+        parallel; the result has `dtype`, by default the one of `matrix`
+    '''
+    dtype = dtype or matrix.dtype;
+    size: int = matrix.height * matrix.width;
+    count: int = _workers(size, workers);
+    if count < 2:
+        return Matrix.fromIterable(map(func, matrix._flat()), matrix.shape, dtype);
+    matrix = share(matrix);
+    out: Matrix = _empty(matrix.shape, dtype);
+    _run(
+        (_mapTask, (
+            func, _spec(matrix), _spec(out),
+            start * matrix.width, stop * matrix.width
+        ))
+        for (start, stop) in _blocks(matrix.height, count)
+    );
+    return out;
+
+def reduce(
+        func: typing.Callable[[typing.Any, typing.Any], typing.Any],
+        matrix: Matrix, workers: typing.Optional[int] = None) -> typing.Any:
+    '''
+        Reduce every element with the associative binary `func`
+        (picklable), by blocks in parallel; the partial results of the
+        blocks are reduced in order
+    '''
+    size: int = matrix.height * matrix.width;
+    if not size:
+        raise ValueError('Reduction of an empty matrix');
+    count: int = _workers(size, workers);
+    if count < 2:
+        return fts.reduce(func, matrix._flat());
+    matrix = share(matrix);
+    return fts.reduce(func, _run(
+        (_reduceTask, (
+            func, _spec(matrix), start * matrix.width, stop * matrix.width
+        ))
+        for (start, stop) in _blocks(matrix.height, count)
+    ));
+
+def fromCSV(
+        source: typing.Any, *,
+        delim: str = ',', dtype: typing.Optional[str] = None,
+        workers: typing.Optional[int] = None,
+        chunkSize: int = fileIO.CHUNK) -> Matrix:
+    'Load delimited numbers with the configured number of worker processes'
+    workers = _config.workers if workers is None else workers;
+    return Matrix._wrap(*fileIO.parseCSV(
+        source, delim=delim, dtype=dtype, chunkSize=chunkSize,
+        workers=workers if workers > 1 else 0, processes=True
+    ));
+
+__all__: _slots = (
+    'SHARED_DIR',
+    'configure',
+    'shutdown',
+    'enabled',
+    'share',
+    'matmul',
+    'elementwise',
+    'apply',
+    'reduce',
+    'fromCSV',
+);
@@ -0,0 +1,212 @@
+#!/usr/bin/env -S python3 -i
+'''
+    Precomputed indexes answering rectangle queries on a Matrix
+
+    - `SummedArea`: 2D prefix sums, O(1) rectangle sums;
+    - `SparseTable`: 2D sparse table, O(1) rectangle min or max, in
+      O(h w log h log w) memory;
+    - `Fenwick`: 2D binary indexed tree, O(log h log w) rectangle sums,
+      kept up to date by single-element writes `m[row, col] = value`.
+    Rectangles are half-open, `[top, bottom) x [left, right)`, like slices.
+    The indexes are cached on the matrix (see `Matrix.summedArea`,
+    `Matrix.sparseTable` and `Matrix.fenwick`) and rebuilt after writes,
+    except that `Fenwick` is updated in O(log h log w) per element write.
+'''
+# pylint: disable=invalid-name
+# pylint: disable=protected-access
+
+import typing;
+import operator as op;
+import itertools as its;
+
+from . import Matrix;
+from .dtype import np;
+from ...shared import _slots;
+
+_Rect = typing.Tuple[int, int, int, int];
+
+def _checkRect(shape: typing.Tuple[int, int], rect: _Rect) -> _Rect:
+    (top, left, bottom, right) = rect;
+    (height, width) = shape;
+    if not (0 <= top <= bottom <= height and 0 <= left <= right <= width):
+        raise IndexError(f'Rectangle out of range for shape {shape}: {rect}');
+    return rect;
+
+def _scalar(value: typing.Any) -> typing.Any:
+    'Return NumPy scalars as Python numbers'
+    return value.item() if hasattr(value, 'item') else value;
+
+class SummedArea:
+    '''
+        The summed-area table of a matrix: `table[r][c]` is the sum of the
+        rectangle `[0, r) x [0, c)`
+    '''
+    __slots__: _slots = (
+        '_shape',
+        '_table',
+    );
+
+    def __init__(self: 'SummedArea', matrix: Matrix) -> None:
+        'Build the table in O(h w)'
+        self._shape: typing.Tuple[int, int] = matrix.shape;
+        (height, width) = matrix.shape;
+        if np is not None:
+            table: typing.Any = np.zeros(
+                (height + 1, width + 1),
+                dtype='float64' if matrix.dtype.startswith('float') else 'int64'
+            );
+            table[1:, 1:] = matrix._asarray().cumsum(0).cumsum(1);
+        else:
+            table: typing.List[typing.List] = [[0] * (width + 1)];
+            for row in matrix.rows():
+                table.append(list(map(
+                    op.add, table[-1], its.accumulate(row, initial=0)
+                )));
+        self._table: typing.Any = table;
+
+    def sum(self: 'SummedArea', top: int, left: int, bottom: int, right: int) -> typing.Any:
+        'Return the sum of the rectangle in O(1)'
+        _checkRect(self._shape, (top, left, bottom, right));
+        table: typing.Any = self._table;
+        return _scalar(
+            table[bottom][right] - table[top][right]
+            - table[bottom][left] + table[top][left]
+        );
+
+class SparseTable:
+    '''
+        The 2D sparse table of a matrix for an idempotent `func`, `min` or
+        `max`: level `(k, l)` holds the `func` of every `2^k x 2^l` block,
+        so that any rectangle is covered by four overlapping blocks
+    '''
+    __slots__: _slots = (
+        '_shape',
+        '_func',
+        '_levels',
+    );
+
+    def __init__(self: 'SparseTable', matrix: Matrix, func: str = 'min') -> None:
+        'Build the table in O(h w log h log w)'
+        if func not in ('min', 'max'):
+            raise ValueError(f"Unknown func {func!r}; expected 'min' or 'max'");
+        self._shape: typing.Tuple[int, int] = matrix.shape;
+        self._func: typing.Callable = (
+            getattr(np, f'{func}imum') if np is not None else {'min': min, 'max': max}[func]
+        );
+        (height, width) = matrix.shape;
+        base: typing.Any = matrix._asarray().copy() if np is not None else list(matrix.rows());
+        # _levels[k][l]: blocks of 2^k rows and 2^l columns
+        self._levels: typing.List[typing.List[typing.Any]] = [];
+        rowSpan: int = 1;
+        while rowSpan <= max(height, 1):
+            level: typing.Any = base if not self._levels else \
+                self._pairRows(self._levels[-1][0], rowSpan // 2);
+            row: typing.List[typing.Any] = [level];
+            colSpan: int = 2;
+            while colSpan <= width:
+                row.append(self._pairCols(row[-1], colSpan // 2));
+                colSpan *= 2;
+            self._levels.append(row);
+            rowSpan *= 2;
+
+    def _pairRows(self: 'SparseTable', rows: typing.Any, shift: int) -> typing.Any:
+        if np is not None:
+            return self._func(rows[:-shift], rows[shift:]);
+        return [
+            list(map(self._func, first, second))
+            for (first, second) in zip(rows[:-shift], rows[shift:])
+        ];
+
+    def _pairCols(self: 'SparseTable', rows: typing.Any, shift: int) -> typing.Any:
+        if np is not None:
+            return self._func(rows[:, :-shift], rows[:, shift:]);
+        return [list(map(self._func, row[:-shift], row[shift:])) for row in rows];
+
+    def query(self: 'SparseTable', top: int, left: int, bottom: int, right: int) -> typing.Any:
+        'Return the min or max of the non-empty rectangle in O(1)'
+        _checkRect(self._shape, (top, left, bottom, right));
+        if top == bottom or left == right:
+            raise ValueError('Empty rectangle');
+        rowLevel: int = (bottom - top).bit_length() - 1;
+        colLevel: int = (right - left).bit_length() - 1;
+        table: typing.Any = self._levels[rowLevel][colLevel];
+        (lower, last) = (bottom - (1 << rowLevel), right - (1 << colLevel));
+        func: typing.Callable = self._func;
+        return _scalar(func(
+            func(table[top][left], table[top][last]),
+            func(table[lower][left], table[lower][last])
+        ));
+
+class Fenwick:
+    '''
+        The 2D binary indexed tree of a matrix, for rectangle sums on a
+        mutable matrix; `m[row, col] = value` on the matrix it was built
+        for updates it in O(log h log w)
+    '''
+    __slots__: _slots = (
+        '_shape',
+        '_tree',
+    );
+
+    def __init__(self: 'Fenwick', matrix: Matrix) -> None:
+        'Build the tree in O(h w)'
+        self._shape: typing.Tuple[int, int] = matrix.shape;
+        (height, width) = matrix.shape;
+        tree: typing.List[typing.List] = [[0] * (width + 1)];
+        tree.extend([0, *row] for row in matrix.rows());
+        # push partial sums to parents, along rows then along columns
+        for row in tree[1:]:
+            for col in range(1, width + 1):
+                parent: int = col + (col & -col);
+                if parent <= width:
+                    row[parent] += row[col];
+        for ind in range(1, height + 1):
+            parent: int = ind + (ind & -ind);
+            if parent <= height:
+                tree[parent][:] = map(op.add, tree[parent], tree[ind]);
+        self._tree: typing.List[typing.List] = tree;
+
+    def add(self: 'Fenwick', row: int, col: int, delta: typing.Any) -> None:
+        'Add `delta` to the element `(row, col)` in O(log h log w)'
+        (height, width) = self._shape;
+        ind: int = row + 1;
+        while ind <= height:
+            line: typing.List = self._tree[ind];
+            pos: int = col + 1;
+            while pos <= width:
+                line[pos] += delta;
+                pos += pos & -pos;
+            ind += ind & -ind;
+
+    def _written(
+            self: 'Fenwick', row: int, col: int,
+            old: typing.Any, new: typing.Any) -> None:
+        'Follow the write of one element of the matrix'
+        self.add(row, col, new - old);
+
+    def prefix(self: 'Fenwick', bottom: int, right: int) -> typing.Any:
+        'Return the sum of the rectangle `[0, bottom) x [0, right)`'
+        total: typing.Any = 0;
+        ind: int = bottom;
+        while ind > 0:
+            line: typing.List = self._tree[ind];
+            pos: int = right;
+            while pos > 0:
+                total += line[pos];
+                pos -= pos & -pos;
+            ind -= ind & -ind;
+        return total;
+
+    def sum(self: 'Fenwick', top: int, left: int, bottom: int, right: int) -> typing.Any:
+        'Return the sum of the rectangle in O(log h log w)'
+        _checkRect(self._shape, (top, left, bottom, right));
+        return (
+            self.prefix(bottom, right) - self.prefix(top, right)
+            - self.prefix(bottom, left) + self.prefix(top, left)
+        );
+
+__all__: _slots = (
+    'SummedArea',
+    'SparseTable',
+    'Fenwick',
+);
@@ -0,0 +1,495 @@
+#!/usr/bin/env -S python3 -i
+'''
+    Sparse matrices whose memory scales with the number of non-zeros
+
+    - `COOMatrix`: coordinate triples, for fast incremental assembly;
+    - `CSRMatrix`: compressed rows, for row access and products;
+    - `CSCMatrix`: compressed columns, for column access.
+    Indices are kept in `array('q')` columns and values in a typed buffer
+    of the dtype (see `matrix.dtype`). Like `Matrix`, they support
+    `m[row, col]`, flat iteration over every element, and `rows()`.
+'''
+# pylint: disable=invalid-name
+# pylint: disable=protected-access
+
+import typing;
+import array;
+import bisect;
+import numbers;
+import operator as op;
+import itertools as its;
+
+from . import Matrix;
+from . import dtype as dt;
+from .dtype import np;
+from ...shared import _slots;
+
+_Shape = typing.Tuple[int, int];
+
+def _indexArray(values: typing.Iterable[int] = ()) -> array.array:
+    return array.array('q', values);
+
+def _checkShape(shape: _Shape) -> _Shape:
+    (height, width) = shape;
+    if not all(isinstance(elem, int) for elem in shape):
+        raise TypeError(f'Shape should be a pair of int: {shape}');
+    if height < 0 or width < 0:
+        raise ValueError(f'Negative size: {height}x{width}');
+    return (height, width);
+
+def _normalize(index: typing.Any, shape: _Shape) -> _Shape:
+    'Check `index` is `(row, col)` within `shape`; resolve negative indices'
+    assert isinstance(index, tuple) and len(index) >= 2, \
+        f'Insufficient length (at least 2): {index}';
+    (row, col) = index[:2];
+    (height, width) = shape;
+    if row < 0:
+        row += height;
+    if col < 0:
+        col += width;
+    if not (0 <= row < height and 0 <= col < width):
+        raise IndexError(f'Index out of range: {index}');
+    return (row, col);
+
+class _Sparse:
+    'The shape, dtype and read protocol shared by the sparse matrices'
+    __slots__: _slots = (
+        '_shape',
+        '_dtype',
+    );
+
+    @property
+    def height(self: '_Sparse') -> int:
+        'Return the height of the matrix'
+        return self._shape[0];
+
+    @property
+    def width(self: '_Sparse') -> int:
+        'Return the width of the matrix'
+        return self._shape[1];
+
+    @property
+    def shape(self: '_Sparse') -> _Shape:
+        'Return `(height, width)` of the matrix'
+        return self._shape;
+
+    @property
+    def dtype(self: '_Sparse') -> str:
+        'Return the name of the element type; see matrix.dtype'
+        return self._dtype;
+
+    @property
+    def nnz(self: '_Sparse') -> int:
+        'Return the number of stored elements'
+        raise NotImplementedError;
+
+    def toCSR(self: '_Sparse') -> 'CSRMatrix':
+        'Return the matrix in compressed row form'
+        raise NotImplementedError;
+
+    def rows(self: '_Sparse') -> typing.Iterator[typing.List]:
+        'Return an iterator of the dense rows as lists'
+        return self.toCSR().rows();
+
+    def __iter__(self: '_Sparse') -> typing.Iterator:
+        'Return a flat iterator for all elements, zeros included, row-major'
+        return its.chain.from_iterable(self.rows());
+
+    def toDense(self: '_Sparse') -> Matrix:
+        'Return the dense `Matrix`'
+        return self.toCSR().toDense();
+
+    def __str__(self: '_Sparse') -> str:
+        'Informal representation, as of a dense Matrix'
+        def _row(lst: typing.List) -> str:
+            return f'[{",".join(str(num) for num in lst)}]';
+        return f'[{";".join(_row(row) for row in self.rows())}]';
+
+    def __repr__(self: '_Sparse') -> str:
+        'Formal representation of matrix'
+        return (
+            '<'
+            f'{self.__class__.__module__}.'
+            f'{self.__class__.__qualname__}'
+            f' object at {hex(id(self))}'
+            f'; width={self.width}, height={self.height}, nnz={self.nnz}>'
+        );
+
+class COOMatrix(_Sparse):
+    '''
+        A sparse matrix assembled from `(row, col, value)` triples
+
+        Appending is O(1); duplicate coordinates are summed, which makes
+        assembling e.g. stiffness or adjacency matrices one contribution at
+        a time straightforward. Convert with `toCSR`/`toCSC` before doing
+        random access or arithmetic: `m[row, col]` scans every triple.
+    '''
+    __slots__: _slots = (
+        '_rows',
+        '_cols',
+        '_vals',
+    );
+
+    def __init__(
+            self: 'COOMatrix', shape: _Shape,
+            triples: typing.Iterable[typing.Tuple[int, int, typing.Any]] = (),
+            *, dtype: str = dt.DEFAULT) -> None:
+        'Initialize an empty `shape` matrix, then add the `triples`'
+        self._shape: _Shape = _checkShape(shape);
+        self._dtype: str = dtype;
+        self._rows: array.array = _indexArray();
+        self._cols: array.array = _indexArray();
+        self._vals: array.array = dt.empty(dtype);
+        self.extend(triples);
+
+    @property
+    def nnz(self: 'COOMatrix') -> int:
+        'Return the number of stored triples, duplicates included'
+        return len(self._vals);
+
+    def add(self: 'COOMatrix', row: int, col: int, value: typing.Any) -> None:
+        'Add `value` at `(row, col)`'
+        (row, col) = _normalize((row, col), self._shape);
+        self._rows.append(row);
+        self._cols.append(col);
+        self._vals.append(value);
+
+    def extend(
+            self: 'COOMatrix',
+            triples: typing.Iterable[typing.Tuple[int, int, typing.Any]]) -> None:
+        'Add every `(row, col, value)` of `triples`'
+        for (row, col, value) in triples:
+            self.add(row, col, value);
+
+    def __getitem__(self: 'COOMatrix', index: typing.Tuple[int, int]) -> typing.Any:
+        'Return the sum of the values at `(row, col)`; O(nnz)'
+        (row, col) = _normalize(index, self._shape);
+        return sum(its.compress(
+            self._vals,
+            map(op.and_,
+                map(op.eq, self._rows, its.repeat(row)),
+                map(op.eq, self._cols, its.repeat(col)))
+        ), dt.convert(self._dtype)());
+
+    def toCSR(self: 'COOMatrix') -> 'CSRMatrix':
+        'Return the compressed row form, with duplicates summed'
+        return CSRMatrix._compress(
+            self._rows, self._cols, self._vals, self._shape, self._dtype
+        );
+
+    def toCSC(self: 'COOMatrix') -> 'CSCMatrix':
+        'Return the compressed column form, with duplicates summed'
+        return CSCMatrix._compress(
+            self._cols, self._rows, self._vals, self._shape[::-1], self._dtype
+        );
+
+class _Compressed(_Sparse):
+    '''
+        A matrix compressed along its major axis (rows for CSR, columns for
+        CSC): the entries of major line `i` are at `indptr[i]:indptr[i+1]`
+        of `indices` (their minor coordinates, ascending) and `vals`
+    '''
+    __slots__: _slots = (
+        '_indptr',
+        '_indices',
+        '_vals',
+    );
+    # the axis compressed: 0 for rows, 1 for columns
+    _major: int = 0;
+
+    def __init__(
+            self: '_Compressed', shape: _Shape,
+            indptr: typing.Iterable[int], indices: typing.Iterable[int],
+            vals: typing.Iterable, *, dtype: str = dt.DEFAULT) -> None:
+        '''
+            Initialize from the compressed arrays; `indices` should be
+            ascending within every major line and free of duplicates
+        '''
+        self._shape: _Shape = _checkShape(shape);
+        self._dtype: str = dtype;
+        self._indptr: array.array = _indexArray(indptr);
+        self._indices: array.array = _indexArray(indices);
+        self._vals: array.array = array.array(dt.typecode(dtype), vals);
+        if len(self._indptr) != self._majorSize + 1:
+            raise ValueError(
+                f'indptr needs {self._majorSize + 1} entries: {len(self._indptr)}'
+            );
+        if not len(self._indices) == len(self._vals) == self._indptr[-1]:
+            raise ValueError('indices and vals should have indptr[-1] entries');
+
+    @classmethod
+    def _wrap(
+            cls: type, indptr: array.array, indices: array.array,
+            vals: array.array, shape: _Shape, dtype: str) -> '_Compressed':
+        'Create a matrix on the arrays, without copying or checking them'
+        self: '_Compressed' = cls.__new__(cls);
+        (self._indptr, self._indices, self._vals) = (indptr, indices, vals);
+        (self._shape, self._dtype) = (shape, dtype);
+        return self;
+
+    @classmethod
+    def _compress(
+            cls: type, major: typing.Sequence[int], minor: typing.Sequence[int],
+            vals: typing.Sequence, majorShape: _Shape, dtype: str) -> '_Compressed':
+        '''
+            Compress triples given as columns; `majorShape` is
+            `(major size, minor size)`. Entries are bucketed by major
+            coordinate with a counting sort, sorted by minor coordinate in
+            each line, and duplicates are summed.
+        '''
+        (size, _) = majorShape;
+        counts: typing.List[int] = [0] * (size + 1);
+        for ind in major:
+            counts[ind + 1] += 1;
+        starts: typing.List[int] = list(its.accumulate(counts));
+        order: typing.List[int] = [0] * len(vals);
+        fill: typing.List[int] = starts[:-1];
+        for (pos, ind) in enumerate(major):
+            order[fill[ind]] = pos;
+            fill[ind] += 1;
+
+        indptr: array.array = _indexArray((0,));
+        indices: array.array = _indexArray();
+        out: array.array = dt.empty(dtype);
+        for line in range(size):
+            entries: typing.Dict[int, typing.Any] = {};
+            for pos in order[starts[line]:starts[line + 1]]:
+                key: int = minor[pos];
+                entries[key] = entries.get(key, 0) + vals[pos];
+            for key in sorted(entries):
+                indices.append(key);
+                out.append(entries[key]);
+            indptr.append(len(indices));
+        shape: _Shape = majorShape if cls._major == 0 else majorShape[::-1];
+        return cls._wrap(indptr, indices, out, shape, dtype);
+
+    @property
+    def _majorSize(self: '_Compressed') -> int:
+        return self._shape[self._major];
+
+    @property
+    def nnz(self: '_Compressed') -> int:
+        'Return the number of stored elements'
+        return len(self._vals);
+
+    def _line(self: '_Compressed', ind: int) -> typing.List:
+        'Return the dense major line `ind` as a list'
+        out: typing.List = [dt.convert(self._dtype)()] * self._shape[1 - self._major];
+        for pos in range(self._indptr[ind], self._indptr[ind + 1]):
+            out[self._indices[pos]] = self._vals[pos];
+        return out;
+
+    def __getitem__(self: '_Compressed', index: typing.Tuple[int, int]) -> typing.Any:
+        'Return the element at `(row, col)`; O(log nnz of its line)'
+        coord: _Shape = _normalize(index, self._shape);
+        (major, minor) = coord if self._major == 0 else coord[::-1];
+        (start, stop) = (self._indptr[major], self._indptr[major + 1]);
+        pos: int = bisect.bisect_left(self._indices, minor, start, stop);
+        if pos < stop and self._indices[pos] == minor:
+            return self._vals[pos];
+        return dt.convert(self._dtype)();
+
+    def _recompress(self: '_Compressed', cls: type) -> '_Compressed':
+        '''
+            Return the same matrix compressed along the other axis as `cls`,
+            by one counting sort over the entries (indices stay sorted)
+        '''
+        minorSize: int = self._shape[1 - self._major];
+        counts: typing.List[int] = [0] * (minorSize + 1);
+        for ind in self._indices:
+            counts[ind + 1] += 1;
+        indptr: array.array = _indexArray(its.accumulate(counts));
+        fill: typing.List[int] = list(indptr[:-1]);
+        indices: array.array = _indexArray((0,)) * self.nnz;
+        vals: array.array = dt.alloc(self._dtype, self.nnz);
+        for line in range(self._majorSize):
+            for pos in range(self._indptr[line], self._indptr[line + 1]):
+                dest: int = fill[self._indices[pos]];
+                indices[dest] = line;
+                vals[dest] = self._vals[pos];
+                fill[self._indices[pos]] += 1;
+        return cls._wrap(indptr, indices, vals, self._shape, self._dtype);
+
+    def transpose(self: '_Compressed') -> '_Compressed':
+        '''
+            Return the transposed matrix, sharing the arrays: the transpose
+            of a CSR matrix is a CSC one, and vice versa
+        '''
+        cls: type = CSCMatrix if self._major == 0 else CSRMatrix;
+        return cls._wrap(
+            self._indptr, self._indices, self._vals,
+            self._shape[::-1], self._dtype
+        );
+
+    @classmethod
+    def fromDense(cls: type, matrix: Matrix) -> '_Compressed':
+        'Return the sparse form of a dense `Matrix`, dropping zeros'
+        source: Matrix = matrix if cls._major == 0 else matrix.transpose();
+        indptr: array.array = _indexArray((0,));
+        indices: array.array = _indexArray();
+        vals: array.array = dt.empty(matrix.dtype);
+        for row in source.rows():
+            indices.extend(its.compress(range(len(row)), row));
+            vals.extend(filter(None, row));
+            indptr.append(len(indices));
+        return cls._wrap(indptr, indices, vals, matrix.shape, matrix.dtype);
+
+    def __matmul__(self: '_Compressed', other: typing.Any) -> typing.Any:
+        '''
+            Multiply by a dense `Matrix` (giving a dense one) or by a sparse
+            matrix (giving a CSR one); CSC operands are converted to CSR
+        '''
+        return self.toCSR() @ other;
+
+    def __rmatmul__(self: '_Compressed', other: typing.Any) -> typing.Any:
+        'Multiply a dense `Matrix` by the sparse matrix, giving a dense one'
+        if not isinstance(other, Matrix):
+            return NotImplemented;
+        # A @ B == (B.T @ A.T).T, and B.T of a CSC matrix is a CSR one
+        return (self.toCSC().transpose() @ other.transpose()).transpose();
+
+    def __mul__(self: '_Compressed', other: typing.Any) -> '_Compressed':
+        'Multiplication by a scalar'
+        if not isinstance(other, numbers.Real):
+            return NotImplemented;
+        dtype: str = dt.promote(self._dtype, dt.infer(other));
+        return type(self)._wrap(
+            self._indptr, self._indices,
+            array.array(dt.typecode(dtype), map(op.mul, self._vals, its.repeat(other))),
+            self._shape, dtype
+        );
+
+    __rmul__ = __mul__;
+
+class CSRMatrix(_Compressed):
+    '''
+        A sparse matrix in compressed sparse row form
+
+        Row access is O(nnz of the row), element access a binary search in
+        the row; it is the form used by products.
+    '''
+    __slots__: _slots = ();
+    _major: int = 0;
+
+    def toCSR(self: 'CSRMatrix') -> 'CSRMatrix':
+        return self;
+
+    def toCSC(self: 'CSRMatrix') -> 'CSCMatrix':
+        'Return the compressed column form'
+        return self._recompress(CSCMatrix);
+
+    def row(self: 'CSRMatrix', ind: int) -> typing.List:
+        'Return the dense row `ind` as a list'
+        return self._line(range(self.height)[ind]);
+
+    def rows(self: 'CSRMatrix') -> typing.Iterator[typing.List]:
+        'Return an iterator of the dense rows as lists'
+        return map(self._line, range(self.height));
+
+    def toDense(self: 'CSRMatrix') -> Matrix:
+        'Return the dense `Matrix`'
+        (height, width) = self._shape;
+        data: array.array = dt.alloc(self._dtype, height * width);
+        for row in range(height):
+            base: int = row * width;
+            for pos in range(self._indptr[row], self._indptr[row + 1]):
+                data[base + self._indices[pos]] = self._vals[pos];
+        return Matrix._wrap(data, self._shape, self._dtype);
+
+    def _matmulDense(self: 'CSRMatrix', other: Matrix) -> Matrix:
+        'Each output row is the combination of the rows of `other` selected'
+        dtype: str = dt.promote(self._dtype, other.dtype);
+        (height, width) = (self.height, other.width);
+        if np is not None:
+            dense: typing.Any = other._asarray();
+            indptr: typing.Any = np.frombuffer(self._indptr, dtype='int64');
+            indices: typing.Any = np.frombuffer(self._indices, dtype='int64');
+            vals: typing.Any = np.frombuffer(self._vals, dtype=self._dtype);
+            out: typing.Any = np.zeros((height, width), dtype=dtype);
+            for row in range(height):
+                (start, stop) = (indptr[row], indptr[row + 1]);
+                if start != stop:
+                    out[row] = vals[start:stop] @ dense[indices[start:stop]];
+            return Matrix._fromArray(out, dtype);
+
+        denseRows: typing.List[typing.List] = list(other.rows());
+        data: array.array = dt.empty(dtype);
+        zero: typing.List = [dt.convert(dtype)()] * width;
+        for row in range(height):
+            acc: typing.List = zero;
+            for pos in range(self._indptr[row], self._indptr[row + 1]):
+                acc = list(map(
+                    op.add, acc,
+                    map(op.mul, denseRows[self._indices[pos]],
+                        its.repeat(self._vals[pos]))
+                ));
+            data.extend(acc);
+        return Matrix._wrap(data, (height, width), dtype);
+
+    def _matmulSparse(self: 'CSRMatrix', other: 'CSRMatrix') -> 'CSRMatrix':
+        "Gustavson's row-by-row product, accumulating each row in a dict"
+        dtype: str = dt.promote(self._dtype, other._dtype);
+        indptr: array.array = _indexArray((0,));
+        indices: array.array = _indexArray();
+        vals: array.array = dt.empty(dtype);
+        for row in range(self.height):
+            acc: typing.Dict[int, typing.Any] = {};
+            for pos in range(self._indptr[row], self._indptr[row + 1]):
+                (mid, scale) = (self._indices[pos], self._vals[pos]);
+                for otherPos in range(other._indptr[mid], other._indptr[mid + 1]):
+                    col: int = other._indices[otherPos];
+                    acc[col] = acc.get(col, 0) + scale * other._vals[otherPos];
+            for col in sorted(acc):
+                if acc[col]:
+                    indices.append(col);
+                    vals.append(acc[col]);
+            indptr.append(len(indices));
+        return CSRMatrix._wrap(
+            indptr, indices, vals, (self.height, other.width), dtype
+        );
+
+    def __matmul__(self: 'CSRMatrix', other: typing.Any) -> typing.Any:
+        '''
+            Multiply by a dense `Matrix` (giving a dense one) or by a sparse
+            matrix (giving a CSR one)
+        '''
+        if not isinstance(other, (Matrix, _Sparse)):
+            return NotImplemented;
+        if self.width != other.height:
+            raise ValueError(
+                f'Shapes do not align: {self.shape} @ {other.shape}'
+            );
+        if isinstance(other, Matrix):
+            return self._matmulDense(other);
+        return self._matmulSparse(other.toCSR());
+
+class CSCMatrix(_Compressed):
+    '''
+        A sparse matrix in compressed sparse column form
+
+        Column access is O(nnz of the column); products go through the
+        compressed row form.
+    '''
+    __slots__: _slots = ();
+    _major: int = 1;
+
+    def toCSR(self: 'CSCMatrix') -> 'CSRMatrix':
+        'Return the compressed row form'
+        return self._recompress(CSRMatrix);
+
+    def toCSC(self: 'CSCMatrix') -> 'CSCMatrix':
+        return self;
+
+    def col(self: 'CSCMatrix', ind: int) -> typing.List:
+        'Return the dense column `ind` as a list'
+        return self._line(range(self.width)[ind]);
+
+    def cols(self: 'CSCMatrix') -> typing.Iterator[typing.List]:
+        'Return an iterator of the dense columns as lists'
+        return map(self._line, range(self.width));
+
+__all__: _slots = (
+    'COOMatrix',
+    'CSRMatrix',
+    'CSCMatrix',
+);
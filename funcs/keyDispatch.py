@@ -12,7 +12,7 @@ import functools as fts;
 from ..sort import insert;
 
 # current package
-from .shared import Decorator, Function;
+from .shared import Decorator, Function, maybeAwait;
 from ..shared import _slots;
 
 _keyType = _slots;
@@ -203,15 +203,15 @@ class keywordPriorityDispatch:
         self.clearCache();
         return _decorator;
 
-    @fts.lru_cache()
-    def _dispatch(self: 'keywordPriorityDispatch', *keys: str) -> Function:
-        'Dispatch the correct function using the keys and registry'
-        # if the function raises NotImplementedError or returns NotImplemented
-        # use default function with same arguments
+    def _withFallback(
+            self: 'keywordPriorityDispatch', func: Function) -> Function:
+        '''
+            Wrap a registered function: if it raises NotImplementedError or
+            returns NotImplemented, use default function with same arguments
+        '''
         # todo: maybe use the next matching function?
-        def wrapper(
-                func: Function,
-                *args: typing.Any, **kwargs: typing.Any) -> typing.Any:
+        @fts.wraps(func)
+        def wrapper(*args: typing.Any, **kwargs: typing.Any) -> typing.Any:
             try:
                 ret: typing.Any = func(*args, **kwargs);
                 if ret is NotImplemented:
@@ -219,18 +219,22 @@ class keywordPriorityDispatch:
                 return ret;
             except NotImplementedError:
                 return self.__wrapped__(*args, **kwargs);
+        return wrapper;
 
-        def regWrap(reg: _entryType) -> Function:
-            return fts.wraps(reg.func)(fts.partial(wrapper, reg.func));
+    def _default(self: 'keywordPriorityDispatch') -> Function:
+        'The function used when no registered entry matches'
+        return self.__wrapped__;
 
+    @fts.lru_cache()
+    def _dispatch(self: 'keywordPriorityDispatch', *keys: str) -> Function:
+        'Dispatch the correct function using the keys and registry'
         for reg in self._registry:
             # if satisfies condition
             assert isinstance(reg, _entryType);
             if reg.match(keys):
-                # return reg.func;
-                return regWrap(reg);
+                return self._withFallback(reg.func);
         # otherwise default function
-        return self.__wrapped__;
+        return self._default();
 
     def __call__(self: 'keywordPriorityDispatch', *args, **kwargs) -> typing.Any:
         # print((self, args, kwargs));
@@ -239,3 +243,38 @@ class keywordPriorityDispatch:
     def clearCache(self) -> None:
         'Clear the dispatch cache when new entries registered'
         self._dispatch.cache_clear(); # pylint: disable=no-member
+
+class asyncKeywordPriorityDispatch(keywordPriorityDispatch):
+    '''
+        An asyncio-aware `keywordPriorityDispatch`
+
+        Calling the dispatcher always returns an awaitable; the registered
+        functions and the default function can be either coroutine functions
+        or plain functions, and the NotImplemented fallback is decided after
+        the registered function has been awaited. Dispatch resolution is
+        cached as in `keywordPriorityDispatch`.
+    '''
+    # no __slots__: the class docstring shadows the `__doc__` slot,
+    # so the wrapped docstring needs the instance dict
+
+    def _withFallback(
+            self: 'asyncKeywordPriorityDispatch', func: Function) -> Function:
+        'See `keywordPriorityDispatch._withFallback`; awaits every step'
+        @fts.wraps(func)
+        async def wrapper(*args: typing.Any, **kwargs: typing.Any) -> typing.Any:
+            try:
+                ret: typing.Any = await maybeAwait(func(*args, **kwargs));
+                if ret is NotImplemented:
+                    raise NotImplementedError;
+                return ret;
+            except NotImplementedError:
+                return await maybeAwait(self.__wrapped__(*args, **kwargs));
+        return wrapper;
+
+    def _default(self: 'asyncKeywordPriorityDispatch') -> Function:
+        'The default function, always returning an awaitable'
+        func: Function = self.__wrapped__;
+        @fts.wraps(func)
+        async def wrapper(*args: typing.Any, **kwargs: typing.Any) -> typing.Any:
+            return await maybeAwait(func(*args, **kwargs));
+        return wrapper;
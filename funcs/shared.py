@@ -2,6 +2,7 @@
 # pylint: disable=invalid-name
 
 import typing;
+import inspect;
 
 from ..shared import _slots;
 # import functools as fts;
@@ -13,7 +14,18 @@ class Function(typing.Callable[..., T]):
     pass;
 Decorator: object = typing.Callable[[Function], Function];
 
+async def maybeAwait(value: typing.Any) -> typing.Any:
+    '''
+        Await `value` if it is awaitable; otherwise return it verbatim
+
+        This lets sync and async implementations share one dispatcher.
+    '''
+    if inspect.isawaitable(value):
+        return await value;
+    return value;
+
 __all__: _slots = (
     'Function',
     'Decorator',
+    'maybeAwait',
 );
@@ -3,45 +3,222 @@
 '''
     Dispatch the function using the type of certain arguments
 '''
+import abc;
 import typing;
+import collections as c;
 import functools as fts;
 
-from .shared import Decorator, Function;
+from .shared import Decorator, Function, maybeAwait;
+from ..shared import _slots;
+from ..data.annoType import Subscript, typeSignature, signatureDetermined;
 
-def positionalDispatch(position: int) -> Decorator:
+# the number of cached resolutions per dispatcher (least recently used
+# first out), and the number of objects visited to compute a signature
+CACHE_SIZE: int = 256;
+SIGNATURE_BUDGET: int = 32;
+
+class annoSingleDispatch:
+    '''
+        A `functools.singledispatch` that additionally accepts annoType
+        annotations (`Union[...]`, `Tuple[...]`, ...) for registration
+
+        Rules:
+            - Plain classes are handed over to `functools.singledispatch`;
+            - Subscript classes are checked with `isinstance` in order of
+              registration, before any plain class registration;
+            - Resolutions by `resolve` are cached per `typeSignature` of the
+              dispatched object, so that the `isinstance` checks run only
+              once for each new runtime shape; `dispatch` keeps the
+              class-based interface of functools;
+            - The cache keeps the `CACHE_SIZE` most recently used shapes,
+              and objects whose signature visits more than
+              `SIGNATURE_BUDGET` nested elements are dispatched directly,
+              so a lookup never costs more than the `isinstance` checks;
+            - Resolutions are not cached once a registered class checks
+              more than the signature (e.g. `List[int]`); see
+              `annoType.signatureDetermined`;
+            - As in functools, the cache is cleared whenever a class is
+              registered with an ABC (`abc.get_cache_token` changes).
+    '''
+    __slots__: _slots = (
+        '_single', '_anno', '_cache',
+        # abc.get_cache_token() when the cache was last valid
+        '_cacheToken',
+        # whether resolutions can be cached by signature
+        '_cacheable',
+        '__wrapped__',
+    );
+
+    def __init__(self: 'annoSingleDispatch', func: Function) -> None:
+        'Use `func` as the default implementation'
+        self._single: Function = fts.singledispatch(func);
+        self._anno: typing.Dict[Subscript, Function] = {};
+        self._cache: typing.MutableMapping[typing.Hashable, Function] = c.OrderedDict();
+        self._cacheToken: object = abc.get_cache_token();
+        self._cacheable: bool = True;
+        self.__wrapped__: Function = func;
+
+    @property
+    def registry(self: 'annoSingleDispatch') -> typing.Mapping[type, Function]:
+        'A live mapping of all registered classes to implementations'
+        return c.ChainMap(self._anno, self._single.registry);
+
+    def register(
+            self: 'annoSingleDispatch',
+            cls: typing.Union[type, Function],
+            func: typing.Optional[Function] = None) -> Function:
+        '''
+            Register `func` for `cls`; see `functools.singledispatch`
+
+            As in functools, `cls` can be omitted when the first annotated
+            argument of the function is annotated by the class.
+        '''
+        if func is None and not isinstance(cls, type):
+            # used as a plain decorator: read the first annotation;
+            # anything but a Subscript class is left to functools
+            annotated: typing.Any = next(
+                iter(getattr(cls, '__annotations__', {}).values()), None
+            );
+            if not isinstance(annotated, Subscript):
+                self._cache.clear();
+                return self._single.register(cls);
+            (cls, func) = (annotated, cls);
+        if func is None:
+            # used as a decorator factory
+            return fts.partial(self.register, cls);
+
+        self._cache.clear();
+        if not isinstance(cls, Subscript):
+            return self._single.register(cls, func);
+        self._anno[cls] = func;
+        self._cacheable = self._cacheable and signatureDetermined(cls);
+        return func;
+
+    def dispatch(self: 'annoSingleDispatch', cls: type) -> Function:
+        'Return the implementation for the class `cls`; see functools'
+        return next(
+            (func for (anno, func) in self._anno.items() if issubclass(cls, anno)),
+            None
+        ) or self._single.dispatch(cls);
+
+    def resolve(self: 'annoSingleDispatch', obj: typing.Any) -> Function:
+        'Return the implementation for the object `obj` (not its class)'
+        if not self._anno:
+            # singledispatch already caches by class
+            return self._single.dispatch(obj.__class__);
+
+        if not self._cacheable:
+            return self.__find(obj);
+        key: typing.Optional[typing.Hashable] = typeSignature(obj, SIGNATURE_BUDGET);
+        if key is None:
+            return self.__find(obj);
+        token: object = abc.get_cache_token();
+        if token != self._cacheToken:
+            self._cache.clear();
+            self._cacheToken = token;
+        try:
+            impl: Function = self._cache[key];
+            self._cache.move_to_end(key);
+            return impl;
+        except KeyError:
+            pass;
+        impl: Function = self.__find(obj);
+        self._cache[key] = impl;
+        if len(self._cache) > CACHE_SIZE:
+            self._cache.popitem(last=False);
+        return impl;
+
+    def __find(self: 'annoSingleDispatch', obj: typing.Any) -> Function:
+        'Find the implementation for `obj` without caching'
+        return next(
+            (func for (anno, func) in self._anno.items() if isinstance(obj, anno)),
+            None
+        ) or self._single.dispatch(obj.__class__);
+
+    def __call__(self: 'annoSingleDispatch', *args, **kwargs) -> typing.Any:
+        'Dispatch by the first positional argument'
+        if not args:
+            raise TypeError(
+                f'{self.__wrapped__.__name__} requires at least 1 '
+                'positional argument'
+            );
+        return self.resolve(args[0])(*args, **kwargs);
+
+def _exposeDispatcher(wrapper: Function, dispatcher: annoSingleDispatch) -> Function:
+    'Expose the registration interface of `dispatcher` on `wrapper`'
+    wrapper.register = dispatcher.register;
+    wrapper.dispatch = dispatcher.dispatch;
+    wrapper.resolve = dispatcher.resolve;
+    wrapper.registry = dispatcher.registry;
+    wrapper.__wrapped__ = dispatcher;
+    return wrapper;
+
+def _dispatchWrapper(
+        func: Function, argOf: typing.Callable[..., typing.Any],
+        asynchronous: bool) -> Function:
+    '''
+        Return the wrapper dispatching by `argOf(args, kwargs)`
+
+        The asynchronous wrapper always returns an awaitable; implementations
+        can be either coroutine functions or plain functions, and, as in
+        `keywordPriorityDispatch`, one that raises NotImplementedError or
+        returns NotImplemented after being awaited falls back to `func`.
+    '''
+    dispatcher: annoSingleDispatch = annoSingleDispatch(func);
+    if not asynchronous:
+        @fts.wraps(func)
+        def wrapper(*args: any, **kwargs: any) -> any:
+            return dispatcher.resolve(argOf(args, kwargs))(*args, **kwargs);
+        return _exposeDispatcher(wrapper, dispatcher);
+
+    @fts.wraps(func)
+    async def asyncWrapper(*args: any, **kwargs: any) -> any:
+        impl: Function = dispatcher.resolve(argOf(args, kwargs));
+        try:
+            ret: typing.Any = await maybeAwait(impl(*args, **kwargs));
+            if ret is NotImplemented and impl is not func:
+                raise NotImplementedError;
+            return ret;
+        except NotImplementedError:
+            if impl is func:
+                raise;
+            return await maybeAwait(func(*args, **kwargs));
+    return _exposeDispatcher(asyncWrapper, dispatcher);
+
+def positionalDispatch(position: int, *, asynchronous: bool = False) -> Decorator:
     'See functools singledispatch; dispatch using argument at `position` index'
     def _decorator(func: Function) -> Function:
-        dispatcher: Function = fts.singledispatch(func);
-        @fts.wraps(dispatcher)
-        def wrapper(*args: any, **kwargs: any) -> any:
+        def argOf(args: tuple, _: dict) -> typing.Any:
             if len(args) <= position:
                 raise TypeError(
                     f'{func.__name__} requires at least {position + 1} '
                     'positional arguments'
                 );
-            return dispatcher.dispatch(args[position].__class__)(*args, **kwargs);
-        return wrapper;
+            return args[position];
+        return _dispatchWrapper(func, argOf, asynchronous);
     return _decorator;
 
-def keywordDispatch(keyName: str) -> Decorator:
+def keywordDispatch(keyName: str, *, asynchronous: bool = False) -> Decorator:
     'Dispatch function using the type of a keyword arg instead of a positional arg'
     def _decorator(func: Function) -> Function:
-        dispatcher: Function = fts.singledispatch(func);
-        @fts.wraps(dispatcher)
-        def wrapper(*args: any, **kwargs: any) -> any:
+        def argOf(_: tuple, kwargs: dict) -> typing.Any:
             if keyName not in kwargs:
                 raise KeyError(
                     f'{func.__name__} does not have specified key "{keyName}"'
                 );
-            return dispatcher.dispatch(kwargs[keyName].__class__)(*args, **kwargs);
-        return wrapper;
+            return kwargs[keyName];
+        return _dispatchWrapper(func, argOf, asynchronous);
     return _decorator;
 
 def dispatch(
         *,
         position: typing.Optional[int] = None,
-        keyName: typing.Optional[str] = None) -> Decorator:
-    'Returns a decorator depending on chosen type'
+        keyName: typing.Optional[str] = None,
+        asynchronous: bool = False) -> Decorator:
+    '''
+        Returns a decorator depending on chosen type;
+        if `asynchronous`, the decorated function returns awaitables
+    '''
     # when both or neither are set
     if not (position is None) ^ (keyName is None):
         raise ValueError(
@@ -49,8 +226,8 @@ def dispatch(
             'be set. '
         );
     if position is None:
-        return keywordDispatch(keyName);
-    return positionalDispatch(position);
+        return keywordDispatch(keyName, asynchronous=asynchronous);
+    return positionalDispatch(position, asynchronous=asynchronous);
 
 ## Some aliases for functions (decorators) above
 def methodDispatch(func: Function) -> Function:
@@ -64,3 +241,15 @@ def staticMethodDispatch(func: callable) -> callable:
 def classMethodDispatch(func: callable) -> callable:
     'Same as methodDispatch'
     return dispatch(position=1)(func);
+
+def asyncMethodDispatch(func: Function) -> Function:
+    'Asynchronous methodDispatch; see `dispatch`'
+    return dispatch(position=1, asynchronous=True)(func);
+
+def asyncStaticMethodDispatch(func: callable) -> callable:
+    'Asynchronous staticMethodDispatch; see `dispatch`'
+    return dispatch(position=0, asynchronous=True)(func);
+
+def asyncClassMethodDispatch(func: callable) -> callable:
+    'Asynchronous classMethodDispatch; see `dispatch`'
+    return dispatch(position=1, asynchronous=True)(func);
@@ -0,0 +1,4 @@
+#!/usr/bin/env -S python3 #-i
+'''
+    Tests of the package; run `python -m pytest tests` from the package root
+'''
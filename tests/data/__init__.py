@@ -0,0 +1,2 @@
+#!/usr/bin/env -S python3 #-i
+'Tests of `data`'
@@ -0,0 +1,122 @@
+#!/usr/bin/env -S python3 -i
+'Tests of `data.annoType.bulk`'
+# pylint: disable=invalid-name
+
+import array;
+import random;
+import typing;
+
+import pytest;
+
+from ....data.annoType import Union, Tuple, validate, validateColumns;
+
+_schema: type = Tuple[int, Union[int, float], str];
+
+def _rows(count: int, seed: int) -> typing.List[typing.Any]:
+    'Mostly valid rows for `_schema`, with a few bad ones of every kind'
+    rng: random.Random = random.Random(seed);
+    rows: typing.List[typing.Any] = [
+        (ind, rng.choice((1, 2.5)), 'x') for ind in range(count)
+    ];
+    for _ in range(count // 50):
+        rows[rng.randrange(count)] = rng.choice((
+            ('a', 1, 'x'), (1, 'b', 'x'), (1, 2), (1, 2, 3, 4), [1, 2, 'x'],
+            None, (1, 2.5, b'x'),
+        ));
+    return rows;
+
+def _reference(schema: type, rows: typing.Sequence) -> typing.List[int]:
+    return [ind for (ind, row) in enumerate(rows) if not isinstance(row, schema)];
+
+@pytest.mark.parametrize('batch', (1, 7, 4096))
+def testValidateMatchesReference(batch: int) -> None:
+    for seed in range(5):
+        rows: typing.List[typing.Any] = _rows(500, seed);
+        expected: typing.List[int] = _reference(_schema, rows);
+        report = validate(_schema, rows, full=True, batch=batch);
+        assert list(report.failures) == expected;
+        assert report.count == len(rows);
+        first = validate(_schema, iter(rows), batch=batch);
+        assert first.first == (expected[0] if expected else None);
+        assert list(first.failures) == expected[:1];
+        assert bool(first) == (not expected);
+
+def testValidateByType() -> None:
+    rows: typing.List[typing.Any] = [1, 2.0, 'a', None, 3, b'', 4.5];
+    report = validate(Union[int, float], rows, full=True);
+    assert list(report.failures) == [2, 3, 5];
+    assert validate(int, [1, 2, 3]).ok;
+    assert validate(int, []).count == 0;
+
+def testValidateStopsAtFirstFailingBatch() -> None:
+    def rows() -> typing.Iterator[typing.Any]:
+        yield from (1, 2, 'bad', 4);
+        raise AssertionError('read past the first failing batch');
+    report = validate(int, rows(), batch=4);
+    assert report.first == 2 and report.count == 4;
+
+def testValidateBadBatch() -> None:
+    with pytest.raises(ValueError):
+        validate(int, [1], batch=0);
+
+class _Untouchable(typing.Sequence):
+    'A column that must not be read'
+    def __init__(self: '_Untouchable', size: int) -> None:
+        self._size: int = size;
+    def __len__(self: '_Untouchable') -> int:
+        return self._size;
+    def __getitem__(self: '_Untouchable', _: typing.Any) -> typing.NoReturn:
+        raise AssertionError('column read after the first failure');
+
+def testColumnsMatchReference() -> None:
+    for seed in range(5):
+        rng: random.Random = random.Random(seed);
+        ints: typing.List[typing.Any] = [rng.choice((1, 1, 1, 'a')) for _ in range(300)];
+        nums: typing.List[typing.Any] = [rng.choice((1, 2.5, 2.5, None)) for _ in range(300)];
+        strs: typing.List[typing.Any] = [rng.choice(('x', 'x', 'x', b'x')) for _ in range(300)];
+        rows: typing.List[tuple] = list(zip(ints, nums, strs));
+        expected: typing.List[int] = _reference(_schema, rows);
+        assert list(validateColumns(_schema, [ints, nums, strs], full=True).failures) == expected;
+        assert validateColumns(_schema, [ints, nums, strs]).first == expected[0];
+
+def testTypedColumns() -> None:
+    schema: type = Tuple[int, float];
+    ints: array.array = array.array('q', range(1000));
+    floats: array.array = array.array('d', range(1000));
+    assert validateColumns(schema, [ints, memoryview(floats)]).ok;
+    report = validateColumns(schema, [floats, ints], full=True);
+    # a failing typed column fails every row without listing them
+    assert isinstance(report.failures, range);
+    assert len(report.failures) == 1000;
+    assert list(validateColumns(schema, [floats, ints]).failures) == [0];
+
+def testColumnsStopAtFirstFailure() -> None:
+    schema: type = Tuple[int, int, int];
+    # the first column fails at row 0: nothing else is read
+    assert validateColumns(schema, [['a', 1], _Untouchable(2), _Untouchable(2)]).first == 0;
+    floats: array.array = array.array('d', (1.0, 2.0));
+    assert validateColumns(schema, [floats, _Untouchable(2), _Untouchable(2)]).first == 0;
+    # later columns are only read before the first failure found so far
+    assert validateColumns(schema, [[1, 2, 'a'], [1, 'b', 1], [1, 1, 1]]).first == 1;
+    assert validateColumns(schema, [[1, 2, 3], [1, 2, 3], [1, 2, 3]]).first is None;
+
+def testColumnsNumpy() -> None:
+    np: typing.Any = pytest.importorskip('numpy');
+    schema: type = Tuple[int, float, bool];
+    columns: typing.List[typing.Any] = [
+        np.arange(10), np.linspace(0, 1, 10), np.zeros(10, dtype=bool),
+    ];
+    assert validateColumns(schema, columns).ok;
+    assert validateColumns(schema, columns[1:2] + columns[1:]).first == 0;
+    assert validateColumns(
+        Tuple[int], [np.array([1, 'a'], dtype=object)], full=True
+    ).failures == [1];
+
+def testColumnErrors() -> None:
+    with pytest.raises(TypeError):
+        validateColumns(Union[int], [[1]]);
+    with pytest.raises(ValueError):
+        validateColumns(Tuple[int, int], [[1]]);
+    with pytest.raises(ValueError):
+        validateColumns(Tuple[int, int], [[1], [1, 2]]);
+    assert validateColumns(Tuple[int], [[]]).count == 0;
@@ -0,0 +1,124 @@
+#!/usr/bin/env -S python3 -i
+'Tests of the element-checking containers of `data.annoType`'
+# pylint: disable=invalid-name
+
+import random;
+import typing;
+
+import pytest;
+
+from ....data.annoType import (
+    Union, Tuple, Iterable, Iterator, Generator, List, Mapping,
+);
+
+def _badAt(size: int, pos: typing.Optional[int]) -> typing.List[typing.Any]:
+    'A list of `size` ints, with a str at `pos`'
+    data: typing.List[typing.Any] = list(range(size));
+    if pos is not None:
+        data[pos] = 'x';
+    return data;
+
+def testHeadMatchesReference() -> None:
+    for count in (0, 1, 5, 64):
+        for pos in (None, 0, 4, 5, 63, 99):
+            data: typing.List[typing.Any] = _badAt(100, pos);
+            expected: bool = pos is None or pos >= count;
+            assert isinstance(data, List[int].head(count)) == expected;
+            assert isinstance(data, Iterable[int].head(count)) == expected;
+            assert isinstance(data, List[int].full()) == (pos is None);
+    # the default checks the first 64 elements
+    assert isinstance(_badAt(100, 70), List[int]);
+    assert not isinstance(_badAt(100, 10), List[int]);
+    assert isinstance([(1, 2.5)], List[Tuple[int, Union[int, float]]]);
+    assert not isinstance((1, 2), List[int]);
+    assert not isinstance({'a'}, List);
+
+def testRandomSample(monkeypatch: pytest.MonkeyPatch) -> None:
+    picked: typing.List[int] = [];
+    def sample(population: typing.Sequence[int], count: int) -> typing.List[int]:
+        picked[:] = random.Random(0).sample(population, count);
+        return picked;
+    monkeypatch.setattr(random, 'sample', sample);
+    data: typing.List[typing.Any] = _badAt(1000, None);
+    assert isinstance(data, List[int].sample(10));
+    for pos in picked:
+        data[pos] = 'x';
+    assert not isinstance(data, List[int].sample(10));
+    # elements that are not picked are not checked
+    data = _badAt(1000, sorted(set(range(1000)) - set(picked))[0]);
+    assert isinstance(data, List[int].sample(10));
+    # a small sequence is checked whole
+    assert not isinstance(_badAt(5, 4), List[int].sample(10));
+
+def testMapping() -> None:
+    good: typing.Dict[str, int] = {str(ind): ind for ind in range(100)};
+    assert isinstance(good, Mapping[str, int].full());
+    assert isinstance(good, Mapping[str]);
+    bad: typing.Dict[typing.Any, typing.Any] = dict(good, x='y');
+    assert isinstance(bad, Mapping[str]);
+    assert isinstance(bad, Mapping[str, int].head(100));
+    assert not isinstance(bad, Mapping[str, int].head(101));
+    assert not isinstance([('a', 1)], Mapping[str, int]);
+    with pytest.raises(ValueError):
+        Mapping[str, int].sample(3);
+    with pytest.raises(ValueError):
+        Mapping.withSample(3, True);
+
+def testVariants() -> None:
+    assert List[int].head(3) is List[int].head(3);
+    assert List[int].head(3) is not List[int].head(4);
+    assert List[int] in List[int].full().__mro__;
+    # the variant of a bare class is still bare, of the same bare class
+    variant: type = List.head(3);
+    assert variant.__bare__ is List and variant.isBare;
+    assert List[int].head(3).__bare__ is List;
+    assert isinstance(['x'], variant);
+    with pytest.raises(ValueError):
+        List[int].head(-1);
+
+def testBadArguments() -> None:
+    with pytest.raises(TypeError):
+        List[int, str];
+    with pytest.raises(TypeError):
+        Mapping[str, int, float];
+    with pytest.raises(NotImplementedError):
+        List[int]();
+
+def testIteratorsAreNotConsumed() -> None:
+    data: typing.Iterator[typing.Any] = iter(['x', 1]);
+    assert isinstance(data, Iterable[int]);
+    assert isinstance(data, Iterator[int]);
+    assert next(data) == 'x';
+    assert not isinstance([1], Iterator[int]);
+
+def testWrap() -> None:
+    assert list(Iterable[int].wrap(iter(range(3)))) == [0, 1, 2];
+    wrapped: typing.Iterator[int] = Iterable[int].wrap([1, 2, 'x', 4]);
+    assert [next(wrapped), next(wrapped)] == [1, 2];
+    with pytest.raises(TypeError):
+        next(wrapped);
+
+def testGeneratorWrap() -> None:
+    def gen() -> typing.Generator[int, str, float]:
+        sent: str = yield 1;
+        yield len(sent);
+        return 1.5;
+    checked: typing.Generator = Generator[int, str, float].wrap(gen());
+    assert isinstance(checked, Generator);
+    assert next(checked) == 1;
+    assert checked.send('abc') == 3;
+    with pytest.raises(StopIteration) as stop:
+        next(checked);
+    assert stop.value.value == 1.5;
+    checked = Generator[int, str, float].wrap(gen());
+    next(checked);
+    with pytest.raises(TypeError):
+        checked.send(2);
+    checked = Generator[int, str, int].wrap(gen());
+    next(checked);
+    checked.send('');
+    with pytest.raises(TypeError):
+        next(checked);
+    checked = Generator[str].wrap(gen());
+    with pytest.raises(TypeError):
+        next(checked);
@@ -0,0 +1,96 @@
+#!/usr/bin/env -S python3 -i
+'Tests of `data.annoType.enforce`'
+# pylint: disable=invalid-name
+
+import gc;
+import asyncio;
+import typing;
+
+import pytest;
+
+from ....data.annoType import Union, Tuple, checked;
+from ....data.annoType import enforce;
+
+def _make(**kwargs: typing.Any) -> typing.Callable:
+    @checked(**kwargs)
+    def func(num: Union[int, float], pair: Tuple[int, str] = (0, ''), *rest: int,
+             flag: bool = False, **extra: str) -> int:
+        return num if isinstance(num, float) else 0;
+    return func;
+
+@pytest.mark.parametrize(('args', 'kwargs', 'bad'), (
+    ((1,), {}, None),
+    ((1.5,), {}, 'return'),
+    (('a',), {}, 'num'),
+    ((), {'num': 'a'}, 'num'),
+    ((1, (1, 'a')), {}, None),
+    ((1, (1, 2)), {}, 'pair'),
+    ((1, (1, 'a'), 2, 3), {}, None),
+    ((1, (1, 'a'), 2, 'x'), {}, '*rest'),
+    ((1,), {'flag': 1}, 'flag'),
+    ((1,), {'key': 'x'}, None),
+    ((1,), {'key': 2}, "**extra['key']"),
+))
+def testViolations(args: tuple, kwargs: dict, bad: typing.Optional[str]) -> None:
+    seen: typing.List[str] = [];
+    func: typing.Callable = _make(
+        raises=False, onViolation=lambda _, name, *__: seen.append(name)
+    );
+    func(*args, **kwargs);
+    assert seen == ([bad] if bad else []);
+    assert func.stats.violations == len(seen);
+    if bad:
+        with pytest.raises(TypeError):
+            _make()(*args, **kwargs);
+
+def testSampled() -> None:
+    func: typing.Callable = _make(mode='sampled', every=10, raises=False);
+    for _ in range(95):
+        func('a');
+    assert func.stats.toDict() == dict(calls=95, checked=9, violations=9);
+
+def testSameNamesAreCountedApart() -> None:
+    enforce.resetMetrics();
+    (first, second) = (_make(mode='sampled', every=2), _make(mode='sampled', every=2));
+    first(1);
+    second(1);
+    # each wrapper samples by its own counter
+    with pytest.raises(TypeError):
+        first('a');
+    with pytest.raises(TypeError):
+        second('a');
+    assert first.stats is not second.stats;
+    assert first.stats.toDict() == dict(calls=2, checked=1, violations=1);
+    assert second.stats.toDict() == first.stats.toDict();
+    name: str = enforce.objFullName(first);
+    counts: typing.Dict[str, typing.Dict[str, int]] = enforce.metrics();
+    assert f'{name}#2' in counts;
+    assert list(counts.values()).count(first.stats.toDict()) == 2;
+    enforce.resetMetrics();
+    assert first.stats.calls == 0;
+    gc.collect();
+    size: int = len(enforce.metrics());
+    del first, second;
+    gc.collect();
+    assert len(enforce.metrics()) == size - 2;
+
+def testAsync() -> None:
+    @checked
+    async def func(num: int) -> int:
+        return num;
+    assert asyncio.run(func(1)) == 1;
+    with pytest.raises(TypeError):
+        asyncio.run(func('a'));
+    assert func.stats.toDict() == dict(calls=2, checked=2, violations=1);
+
+def testModes(monkeypatch: pytest.MonkeyPatch) -> None:
+    def func(num: int) -> int:
+        return num;
+    assert checked(func, mode='off') is func;
+    assert checked(lambda num: num) is not None;
+    with pytest.raises(ValueError):
+        checked(func, mode='never');
+    with pytest.raises(ValueError):
+        checked(func, mode='sampled', every=0);
+    monkeypatch.setenv(enforce.ENV_MODE, 'off');
+    assert checked(func) is func;
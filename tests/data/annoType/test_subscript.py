@@ -0,0 +1,164 @@
+#!/usr/bin/env -S python3 -i
+'Tests of the `Subscript` classes `Union` and `Tuple`'
+# pylint: disable=invalid-name
+# pylint: disable=protected-access
+
+import gc;
+import abc;
+import typing;
+import itertools as its;
+
+import pytest;
+
+from ....data.annoType import Subscript, Union, Tuple;
+
+def _reference(obj: typing.Any, anno: typing.Any) -> bool:
+    'A direct recursive implementation of `isinstance(obj, anno)`'
+    if not isinstance(anno, Subscript):
+        return isinstance(obj, type(anno) if anno is None else anno);
+    if anno.__bare__ is Union:
+        return any(_reference(obj, arg) for arg in anno);
+    data: typing.Any = obj._tuple if isinstance(type(obj), Subscript) else obj;
+    if not isinstance(data, tuple):
+        return False;
+    if anno.isBare:
+        return True;
+    return len(data) == len(anno) and all(map(_reference, data, anno));
+
+_schemas: typing.Tuple = (
+    Union[int, float],
+    Union[int, None],
+    Tuple,
+    Tuple[int],
+    Tuple[int, str],
+    Tuple[int, Union[int, float]],
+    Tuple[Tuple[int, int], Union[str, Tuple[float]]],
+);
+_samples: typing.Tuple = (
+    0, 1.5, 'a', None, True, (), (1,), (1, 'a'), (1, 2), (1, 2.5), ('a', 1),
+    ((1, 2), 'x'), ((1, 2), (1.5,)), ((1, 2), (1,)), ((1,), 'x'), [1, 'a'],
+    Tuple((1, 'a')), Tuple[int, Union[int, float]]((1, 2.5)),
+);
+
+# region user-028: compiled checkers
+def testCheckersMatchReference() -> None:
+    for (schema, obj) in its.product(_schemas, _samples):
+        assert isinstance(obj, schema) == _reference(obj, schema), (schema, obj);
+
+def testCheckerIsCompiledOnce() -> None:
+    schema: Subscript = Tuple[int, Union[int, float]];
+    check: typing.Callable = schema._check;
+    assert isinstance((1, 2), schema);
+    assert schema._check is check;
+
+def testCheckDoesNotCreateClasses() -> None:
+    schema: Subscript = Tuple[int, Tuple[str, Union[int, float]]];
+    interned: typing.Mapping = Subscript._Subscript__interned;
+    before: int = len(interned);
+    for _ in range(100):
+        assert isinstance((1, ('a', 2.5)), schema);
+        assert not isinstance((1, ('a', 'b')), schema);
+    assert len(interned) == before;
+
+def testTupleConstruction() -> None:
+    pair: Tuple = Tuple((1, 'a'));
+    assert type(pair) is Tuple[int, str];
+    assert list(pair) == [1, 'a'] and pair[1] == 'a';
+    assert isinstance(pair + Tuple((2.0,)), Tuple[int, str, float]);
+# endregion
+
+# region user-029: interning
+def testParameterizationsAreInterned() -> None:
+    assert Union[int, float] is Union[float, int];
+    assert Union[int, Union[float, None]] is Union[int, float, None];
+    assert Union[int, int] is Union[int];
+    assert Tuple[int, str] is Tuple[[int, str]];
+    assert Tuple[int, str] is not Tuple[str, int];
+    assert hash(Union[int, float]) == hash(Union[float, int]);
+    assert len({Tuple[int], Tuple[int], Tuple[(int,)]}) == 1;
+
+def testUnusedParameterizationsAreCollected() -> None:
+    interned: typing.Mapping = Subscript._Subscript__interned;
+    class Marker:
+        'A class only used by this test'
+    key: typing.Tuple = (Tuple, (Marker, Marker));
+    _ = Tuple[Marker, Marker];
+    assert key in interned;
+    del _;
+    gc.collect();
+    assert key not in interned;
+
+def testBadArguments() -> None:
+    with pytest.raises(TypeError):
+        Union[1];
+    with pytest.raises(TypeError):
+        Tuple[int, 'a'];
+# endregion
+
+# region user-033: memoized subclass checks
+def _referenceSubclass(subcls: type, cls: type) -> bool:
+    'A direct recursive implementation of `issubclass(subcls, cls)`'
+    if not isinstance(cls, Subscript):
+        return issubclass(subcls, cls);
+    if cls.__bare__ is Union:
+        if isinstance(subcls, Subscript):
+            return subcls.__bare__ is cls;
+        return issubclass(subcls, tuple(cls));
+    if not isinstance(subcls, Subscript):
+        return issubclass(subcls, tuple) and cls.isBare;
+    if subcls.__bare__ is not cls.__bare__:
+        return False;
+    if subcls is cls or cls.isBare:
+        return True;
+    if subcls.isBare or len(subcls) != len(cls):
+        return False;
+    return all(map(_referenceSubclass, subcls, cls));
+
+_classes: typing.Tuple = (
+    int, bool, float, str, tuple, object,
+    Union, Union[int, float], Union[int], Union[str, None],
+    Tuple, Tuple[int], Tuple[bool], Tuple[object], Tuple[int, str],
+    Tuple[bool, str], Tuple[Tuple[bool], str], Tuple[Tuple[int], str],
+    Tuple[Tuple[object], object], Tuple[Union[int, float], str],
+);
+
+def testSubclassMatchesReference() -> None:
+    memo: typing.MutableMapping = Subscript._Subscript__subclassMemo;
+    for _ in range(2):
+        # the second round answers from the memo
+        for (subcls, cls) in its.product(_classes, _classes):
+            if isinstance(cls, Subscript):
+                assert issubclass(subcls, cls) == _referenceSubclass(subcls, cls), (subcls, cls);
+        assert memo;
+
+def testSubclassMemoInvalidation() -> None:
+    memo: typing.MutableMapping = Subscript._Subscript__subclassMemo;
+    assert issubclass(Tuple[bool, str], Tuple[int, str]);
+    assert Tuple[bool, str] in memo[Tuple[int, str]];
+    # a new parameterization forgets every result
+    class Marker:
+        'A class only used by this test'
+    schema: Subscript = Tuple[Marker];
+    assert not memo;
+    assert issubclass(Tuple[Marker], Tuple[object]);
+    assert not issubclass(Tuple[Marker], Tuple[int]);
+    assert schema in memo[Tuple[object]] and schema in memo[Tuple[int]];
+    # collected classes drop out of the memo
+    del schema;
+    gc.collect();
+    assert not any(
+        getattr(subcls, '_args', None) == (Marker,)
+        for table in memo.values() for subcls in table
+    );
+
+def testSubclassMemoFollowsABCRegistration() -> None:
+    class Base(abc.ABC):
+        'An ABC registering a class after the first check'
+    class Late:
+        'A class only used by this test'
+    schema: Subscript = Union[Base, int];
+    assert not issubclass(Late, schema) and not isinstance(Late(), schema);
+    Base.register(Late);
+    assert issubclass(Late, schema) and isinstance(Late(), schema);
+    assert issubclass(Tuple[Late], Tuple[Base]);
+# endregion
@@ -0,0 +1,27 @@
+#!/usr/bin/env -S python3 -i
+'Fixtures of the `data.matrix` tests'
+# pylint: disable=invalid-name
+
+import typing;
+
+import pytest;
+
+from ....data import matrix;
+from ....data.matrix import (
+    dtype, fileIO, lazy, linalg, parallel, rangeQuery, sparse,
+);
+
+# the modules choosing between NumPy and the pure-Python fallback
+_modules: typing.Tuple = (
+    matrix, dtype, fileIO, lazy, linalg, parallel, rangeQuery, sparse,
+);
+
+@pytest.fixture(params=('numpy', 'python'))
+def backend(request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch) -> str:
+    'Run a test with NumPy, if installed, and with the pure-Python fallback'
+    if request.param == 'numpy':
+        pytest.importorskip('numpy');
+    else:
+        for module in _modules:
+            monkeypatch.setattr(module, 'np', None);
+    return request.param;
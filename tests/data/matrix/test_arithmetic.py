@@ -0,0 +1,93 @@
+#!/usr/bin/env -S python3 -i
+'Tests of the arithmetic of `Matrix` and of `matrix.kernels`'
+# pylint: disable=invalid-name
+
+import random;
+import typing;
+import operator as op;
+
+import pytest;
+
+from ....data.matrix import Matrix;
+from ....data.matrix import kernels;
+
+_Rows = typing.List[typing.List[typing.Any]];
+
+def _random(height: int, width: int, seed: int, floats: bool = False) -> _Rows:
+    rng: random.Random = random.Random(seed);
+    if floats:
+        return [[rng.uniform(-5, 5) for _ in range(width)] for _ in range(height)];
+    return [[rng.randint(-9, 9) for _ in range(width)] for _ in range(height)];
+
+def _matmul(left: _Rows, right: _Rows) -> _Rows:
+    'The textbook triple loop'
+    return [
+        [sum(left[i][k] * right[k][j] for k in range(len(right))) for j in range(len(right[0]))]
+        for i in range(len(left))
+    ];
+
+def _close(actual: _Rows, expected: _Rows) -> bool:
+    return all(map(lambda x, y: x == pytest.approx(y), actual, expected));
+
+@pytest.mark.parametrize('func', (op.add, op.sub, op.mul))
+def testElementwise(backend: str, func: typing.Callable) -> None:
+    (left, right) = (_random(5, 7, 0), _random(5, 7, 1));
+    (a, b) = (Matrix.fromRows(left), Matrix.fromRows(right));
+    expected: _Rows = [list(map(func, x, y)) for (x, y) in zip(left, right)];
+    assert list(func(a, b).rows()) == expected;
+    assert list(func(a, 3).rows()) == [[func(v, 3) for v in row] for row in left];
+    assert list(func(3, a).rows()) == [[func(3, v) for v in row] for row in left];
+    assert func(a, b).dtype == 'int64';
+    result: Matrix = func(a, 0.5);
+    assert result.dtype == 'float64';
+    assert _close(list(result.rows()), [[func(v, 0.5) for v in row] for row in left]);
+    # views are valid operands
+    assert list(func(a[::2, 1:], b[::2, :-1]).rows()) == [
+        list(map(func, x[1:], y[:-1])) for (x, y) in zip(left[::2], right[::2])
+    ];
+
+def testElementwiseErrors(backend: str) -> None:
+    a: Matrix = Matrix.zeros(2, 3);
+    with pytest.raises(ValueError):
+        a + Matrix.zeros(3, 2);
+    with pytest.raises(TypeError):
+        a + 'x';
+
+def testTranspose(backend: str) -> None:
+    rows: _Rows = _random(4, 6, 2);
+    assert list(Matrix.fromRows(rows).transpose().rows()) == [list(col) for col in zip(*rows)];
+    assert list(Matrix.fromRows(rows)[1:, ::2].transpose().rows()) == [
+        list(col) for col in zip(*(row[::2] for row in rows[1:]))
+    ];
+    assert Matrix.zeros(0, 3).transpose().shape == (3, 0);
+
+@pytest.mark.parametrize(('height', 'inner', 'width'), ((1, 1, 1), (3, 4, 5), (7, 2, 6), (16, 16, 16)))
+def testMatmul(backend: str, height: int, inner: int, width: int) -> None:
+    (left, right) = (_random(height, inner, 3), _random(inner, width, 4));
+    product: Matrix = Matrix.fromRows(left) @ Matrix.fromRows(right);
+    assert product.shape == (height, width) and product.dtype == 'int64';
+    assert list(product.rows()) == _matmul(left, right);
+    floats: _Rows = _random(inner, width, 5, True);
+    assert _close(
+        list((Matrix.fromRows(left) @ Matrix.fromRows(floats)).rows()),
+        _matmul(left, floats)
+    );
+
+def testMatmulErrors(backend: str) -> None:
+    with pytest.raises(ValueError):
+        Matrix.zeros(2, 3) @ Matrix.zeros(2, 3);
+    with pytest.raises(TypeError):
+        Matrix.zeros(2, 2) @ [[1, 0], [0, 1]];
+
+@pytest.mark.parametrize(('height', 'inner', 'width'), ((5, 7, 3), (9, 9, 9), (12, 5, 11), (1, 8, 8)))
+def testKernels(monkeypatch: pytest.MonkeyPatch, height: int, inner: int, width: int) -> None:
+    (left, right) = (_random(height, inner, 6), _random(inner, width, 7));
+    expected: _Rows = _matmul(left, right);
+    monkeypatch.setattr(kernels, 'BLOCK', 2);
+    assert kernels.matmulBlocked(left, right, width) == expected;
+    # recursing down to 1 x 1 blocks, through odd sizes padded with zeros
+    for threshold in (1, 2, 3):
+        assert kernels.strassen(left, right, width, threshold) == expected;
+    assert kernels.matmul(left, right, width, 1) == expected;
+    assert kernels.transpose(left) == [list(col) for col in zip(*left)];
+    assert kernels.matmulBlocked([[1, 2]], [[], []], 0) == [[]];
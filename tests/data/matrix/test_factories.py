@@ -0,0 +1,65 @@
+#!/usr/bin/env -S python3 -i
+'Tests of the factory classmethods of `Matrix`'
+# pylint: disable=invalid-name
+
+import array;
+import typing;
+
+import pytest;
+
+from ....data.matrix import Matrix;
+
+def testZerosAndFull() -> None:
+    for (height, width) in ((0, 0), (0, 3), (2, 3), (4, 1)):
+        assert list(Matrix.zeros(height, width).rows()) == [[0] * width] * height;
+        full: Matrix = Matrix.full(height, width, 2.5);
+        assert full.shape == (height, width) and full.dtype == 'float64';
+        assert list(full.rows()) == [[2.5] * width] * height;
+        # the same matrix as the keyword constructor
+        assert list(full.rows()) == list(Matrix(width=height, height=width, value=2.5).rows());
+    assert Matrix.zeros(2, 2, 'int8').dtype == 'int8';
+    assert Matrix.full(1, 1, 3, 'float32')[0, 0] == 3.0;
+    with pytest.raises(ValueError):
+        Matrix.zeros(-1, 2);
+
+def testIdentity() -> None:
+    for size in (0, 1, 4):
+        assert list(Matrix.identity(size).rows()) == [
+            [int(row == col) for col in range(size)] for row in range(size)
+        ];
+    assert Matrix.identity(3, 'float64')[2, 2] == 1.0;
+
+def testFromRows() -> None:
+    rows: typing.List[typing.List[int]] = [[1, 2], [3, 4], [5, 6]];
+    matrix: Matrix = Matrix.fromRows(iter(rows));
+    assert matrix.shape == (3, 2) and list(matrix.rows()) == rows;
+    assert Matrix.fromRows([]).shape == (0, 0);
+    assert Matrix.fromRows([[1, 2.0]]).dtype == 'float64';
+    with pytest.raises(ValueError):
+        Matrix.fromRows([[1], [2, 3]]);
+
+def testFromBufferSharesIt() -> None:
+    data: array.array = array.array('d', range(6));
+    matrix: Matrix = Matrix.fromBuffer(data, (2, 3));
+    assert matrix.dtype == 'float64' and list(matrix.rows()) == [[0, 1, 2], [3, 4, 5]];
+    matrix[1, 1] = -1;
+    assert data[4] == -1;
+    # reinterpreted as another dtype of the same size
+    assert Matrix.fromBuffer(bytearray(16), (2, 1), 'int64').shape == (2, 1);
+    with pytest.raises(ValueError):
+        Matrix.fromBuffer(data, (4, 2));
+
+def testFromBufferNumpy() -> None:
+    np: typing.Any = pytest.importorskip('numpy');
+    arr: typing.Any = np.arange(12, dtype='int32');
+    matrix: Matrix = Matrix.fromBuffer(arr, (3, 4));
+    assert matrix.dtype == 'int32';
+    matrix[0, 0] = 9;
+    assert arr[0] == 9;
+
+def testFromIterable() -> None:
+    matrix: Matrix = Matrix.fromIterable(iter(range(100)), (3, 4));
+    assert list(matrix.rows()) == [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9, 10, 11]];
+    assert Matrix.fromIterable((x / 2 for x in range(4)), (2, 2), 'float64')[1, 1] == 1.5;
+    with pytest.raises(ValueError):
+        Matrix.fromIterable(range(5), (2, 3));
@@ -0,0 +1,185 @@
+#!/usr/bin/env -S python3 -i
+'Tests of the delimited text and binary files of `Matrix`'
+# pylint: disable=invalid-name
+
+import io;
+import gzip;
+import random;
+import typing;
+
+import pytest;
+
+from ....data.matrix import Matrix;
+from ....data.matrix import fileIO;
+
+_Rows = typing.List[typing.List[typing.Any]];
+
+def _random(height: int, width: int, seed: int, floats: bool = False) -> _Rows:
+    rng: random.Random = random.Random(seed);
+    if floats:
+        return [[rng.uniform(-1e3, 1e3) for _ in range(width)] for _ in range(height)];
+    return [[rng.randint(-10**6, 10**6) for _ in range(width)] for _ in range(height)];
+
+def _text(rows: _Rows, delim: str = ',') -> str:
+    return ''.join(delim.join(map(str, row)) + '\n' for row in rows);
+
+def _reference(text: str, delim: str, convert: type) -> _Rows:
+    'The line by line parser of the original Matrix'
+    return [list(map(convert, line.split(delim))) for line in text.splitlines() if line.strip()];
+
+# region user-036: bulk loading and the binary format
+@pytest.mark.parametrize('chunkSize', (1, 7, 1 << 20))
+def testParseMatchesReference(backend: str, chunkSize: int) -> None:
+    rows: _Rows = _random(50, 6, 0);
+    text: str = _text(rows, ';');
+    expected: _Rows = _reference(text, ';', int);
+    for source in (io.StringIO(text), io.BytesIO(text.encode())):
+        matrix: Matrix = Matrix.fromCSV(source, delim=';', chunkSize=chunkSize);
+        assert list(matrix.rows()) == expected;
+    floats: str = _text(_random(20, 3, 1, True));
+    matrix = Matrix.fromCSV(io.StringIO(floats), dtype='float64', chunkSize=chunkSize);
+    assert list(matrix.rows()) == _reference(floats, ',', float);
+
+@pytest.mark.parametrize('processes', (False, True))
+def testParseWorkers(processes: bool) -> None:
+    rows: _Rows = _random(200, 4, 2);
+    matrix: Matrix = Matrix.fromCSV(
+        io.StringIO(_text(rows)), workers=2, processes=processes, chunkSize=64
+    );
+    assert list(matrix.rows()) == rows;
+
+def testParseBlankLinesAndEmpty(backend: str) -> None:
+    matrix: Matrix = Matrix.fromCSV(io.StringIO('\n1,2\n\n3,4\n\n'));
+    assert list(matrix.rows()) == [[1, 2], [3, 4]];
+    assert Matrix.fromCSV(io.StringIO('')).shape == (0, 0);
+
+def testParseErrors(backend: str) -> None:
+    with pytest.raises(ValueError):
+        Matrix.fromCSV(io.StringIO('1,2\n3\n'));
+    with pytest.raises(ValueError):
+        # uneven across chunks
+        Matrix.fromCSV(io.StringIO('1,2\n3,4,5\n'), chunkSize=1);
+    with pytest.raises(ValueError):
+        Matrix.fromCSV(io.StringIO('1,x\n'));
+    with pytest.raises(ValueError):
+        Matrix.fromCSV(io.StringIO('1,2\n'), compression='zip');
+
+def testCSVPaths(tmp_path: typing.Any) -> None:
+    rows: _Rows = _random(30, 5, 3);
+    for name in ('plain.csv', 'packed.csv.gz', 'packed.csv.xz'):
+        Matrix.fromRows(rows).toCSV(tmp_path / name);
+        assert list(Matrix.fromCSV(tmp_path / name).rows()) == rows;
+    assert gzip.decompress((tmp_path / 'packed.csv.gz').read_bytes()).decode() == _text(rows);
+
+@pytest.mark.parametrize('dtype', ('int8', 'uint16', 'int64', 'float32', 'float64'))
+def testBinaryRoundTrip(tmp_path: typing.Any, dtype: str) -> None:
+    matrix: Matrix = Matrix.fromRows([[1, 2, 3], [4, 5, 6]], dtype=dtype);
+    matrix.save(tmp_path / 'm.bin');
+    loaded: Matrix = Matrix.load(tmp_path / 'm.bin');
+    assert loaded.dtype == dtype and loaded.shape == (2, 3);
+    assert list(loaded.rows()) == list(matrix.rows());
+    size: int = (tmp_path / 'm.bin').stat().st_size;
+    assert size == fileIO.HEADER.size + 6 * matrix._data.itemsize;
+
+def testBinaryStreams(monkeypatch: pytest.MonkeyPatch) -> None:
+    # small chunks: the rows are written in several pieces
+    monkeypatch.setattr(fileIO, 'CHUNK', 16);
+    rows: _Rows = _random(9, 5, 4);
+    for matrix in (Matrix.fromRows(rows), Matrix.fromRows(rows)[1::2, ::2]):
+        for compression in (None, 'gzip', 'bz2'):
+            buffer: io.BytesIO = io.BytesIO();
+            matrix.save(buffer, compression);
+            buffer.seek(0);
+            assert list(Matrix.load(buffer, compression).rows()) == list(matrix.rows());
+
+def testBinaryErrors() -> None:
+    good: io.BytesIO = io.BytesIO();
+    Matrix.fromRows([[1, 2]]).save(good);
+    data: bytes = good.getvalue();
+    for (bad, message) in (
+            (data[:10], 'header'),
+            (data[:-1], 'data'),
+            (b'X' + data[1:], 'Not a binary'),
+            (data[:8] + b'\2' + data[9:], 'version'),
+            (fileIO.packHeader((1, 2), 'int7') + data[fileIO.HEADER.size:], 'dtype')):
+        with pytest.raises(ValueError, match=message):
+            Matrix.load(io.BytesIO(bad));
+# endregion
+
+# region user-045: streaming export
+class _Recorder(io.BytesIO):
+    'A binary sink recording the size of every write'
+    def __init__(self: '_Recorder') -> None:
+        super().__init__();
+        self.sizes: typing.List[int] = [];
+
+    def write(self: '_Recorder', data: typing.Any) -> int:
+        self.sizes.append(memoryview(data).nbytes);
+        return super().write(data);
+
+@pytest.mark.parametrize('chunkRows', (1, 4, fileIO.CSV_ROWS))
+def testWriteCSVChunks(chunkRows: int) -> None:
+    rows: _Rows = _random(10, 3, 5);
+    sink: _Recorder = _Recorder();
+    fileIO.writeCSV(sink, rows, delim=';', chunkRows=chunkRows);
+    assert sink.getvalue().decode() == _text(rows, ';');
+    assert len(sink.sizes) == -(-10 // chunkRows);
+    # rows are consumed lazily: at most one chunk ahead of the writes
+    consumed: typing.List[int] = [];
+    def produce() -> typing.Iterator[typing.List[int]]:
+        for (ind, row) in enumerate(rows):
+            consumed.append(ind);
+            yield row;
+    sink = _Recorder();
+    sink.write = lambda data: sink.sizes.append(len(consumed));
+    fileIO.writeCSV(sink, produce(), chunkRows=chunkRows);
+    assert sink.sizes == [min(10, count) for count in range(chunkRows, 10 + chunkRows, chunkRows)];
+
+def testToCSVSinks(backend: str) -> None:
+    rows: _Rows = _random(7, 4, 6, True);
+    matrix: Matrix = Matrix.fromRows(rows, dtype='float64');
+    (text, binary) = (io.StringIO(), io.BytesIO());
+    matrix.toCSV(text);
+    matrix.toCSV(binary);
+    assert text.getvalue() == binary.getvalue().decode() == _text(rows);
+    assert _reference(text.getvalue(), ',', float) == rows;
+    view: Matrix = matrix[::2, 1:];
+    text = io.StringIO();
+    view.toCSV(text, delim='\t');
+    assert _reference(text.getvalue(), '\t', float) == [row[1:] for row in rows[::2]];
+    text = io.StringIO();
+    Matrix.fromRows([]).toCSV(text);
+    assert text.getvalue() == '';
+
+def testCompressedFileObjects() -> None:
+    rows: _Rows = _random(20, 3, 7);
+    for compression in tuple(fileIO.COMPRESSION):
+        buffer: io.BytesIO = io.BytesIO();
+        Matrix.fromRows(rows).toCSV(buffer, compression=compression);
+        assert buffer.getvalue() != _text(rows).encode();
+        buffer.seek(0);
+        assert list(Matrix.fromCSV(buffer, compression=compression).rows()) == rows;
+    buffer = io.BytesIO();
+    Matrix.fromRows(rows).toCSV(buffer, compression='gzip');
+    assert gzip.decompress(buffer.getvalue()).decode() == _text(rows);
+
+def testSaveChunks(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(fileIO, 'CHUNK', 64);
+    rows: _Rows = _random(40, 3, 8);
+    matrix: Matrix = Matrix.fromRows(rows, dtype='int64');
+    for (source, expected) in ((matrix, rows), (matrix[::3, ::2], [row[::2] for row in rows[::3]])):
+        sink: _Recorder = _Recorder();
+        source.save(sink);
+        assert sink.sizes[0] == fileIO.HEADER.size;
+        assert max(sink.sizes[1:]) <= 64 and len(sink.sizes) > 2;
+        sink.seek(0);
+        assert list(Matrix.load(sink).rows()) == expected;
+
+def testExportErrors(tmp_path: typing.Any) -> None:
+    matrix: Matrix = Matrix.fromRows([[1, 2]]);
+    with pytest.raises(ValueError, match='compression'):
+        matrix.toCSV(io.BytesIO(), compression='zip');
+    with pytest.raises(ValueError, match='compression'):
+        matrix.save(tmp_path / 'm.bin', 'zip');
+    assert not (tmp_path / 'm.bin').exists();
+# endregion
@@ -0,0 +1,113 @@
+#!/usr/bin/env -S python3 -i
+'Tests of lazy `Matrix` expressions'
+# pylint: disable=invalid-name
+
+import random;
+import typing;
+import functools as fts;
+
+import pytest;
+
+from ....data.matrix import Matrix;
+from ....data.matrix import lazy;
+
+def _random(height: int, width: int, seed: int) -> Matrix:
+    rng: random.Random = random.Random(seed);
+    return Matrix.fromRows(
+        [[rng.randint(-4, 4) for _ in range(width)] for _ in range(height)]
+    );
+
+@fts.lru_cache(maxsize=None)
+def _bruteOrder(dims: typing.Tuple[int, ...]) -> int:
+    'The least cost of a product chain, trying every split'
+    if len(dims) <= 2:
+        return 0;
+    return min(
+        _bruteOrder(dims[:mid + 1]) + _bruteOrder(dims[mid:])
+        + dims[0] * dims[mid] * dims[-1]
+        for mid in range(1, len(dims) - 1)
+    );
+
+def _cost(order: typing.Any, dims: typing.Sequence[int]) -> typing.Tuple[int, int, int]:
+    'Return `(first, last, cost)` of multiplying in `order`'
+    if isinstance(order, int):
+        return (order, order, 0);
+    (first, mid, left) = _cost(order[0], dims);
+    (_, last, right) = _cost(order[1], dims);
+    assert mid + 1 == _cost(order[1], dims)[0];
+    return (first, last, left + right + dims[first] * dims[mid + 1] * dims[last + 1]);
+
+def testChainOrder() -> None:
+    rng: random.Random = random.Random(0);
+    for count in range(1, 8):
+        for _ in range(10):
+            dims: typing.Tuple[int, ...] = tuple(rng.randint(1, 30) for _ in range(count + 1));
+            (cost, order) = lazy.chainOrder(dims);
+            assert cost == _bruteOrder(dims);
+            assert _cost(order, dims) == (0, count - 1, cost);
+    assert lazy.chainOrder((10, 100, 5, 50)) == (7500, ((0, 1), 2));
+
+def testMatchesEager(backend: str) -> None:
+    (a, b, c) = (_random(4, 6, 1), _random(6, 3, 2), _random(4, 3, 3));
+    (d, e) = (_random(3, 8, 4), _random(8, 2, 5));
+    cases: typing.List[typing.Callable[[typing.Any, typing.Any, typing.Any, typing.Any, typing.Any], typing.Any]] = [
+        lambda a, b, c, d, e: a @ b + c * 2,
+        lambda a, b, c, d, e: 3 - (c + c) * c - 1.5,
+        lambda a, b, c, d, e: a @ b @ d @ e,
+        lambda a, b, c, d, e: (a @ b - c) @ (d @ e),
+        lambda a, b, c, d, e: (a @ b).transpose() * 2 + c.transpose(),
+        lambda a, b, c, d, e: a.transpose().transpose() @ (b + b),
+        lambda a, b, c, d, e: 2 * (c - (c * (c + 1))),
+    ];
+    for case in cases:
+        expected: Matrix = case(a, b, c, d, e);
+        expr: lazy.Expr = case(*(m.lazy() for m in (a, b, c, d, e)));
+        assert isinstance(expr, lazy.Expr);
+        assert (expr.shape, expr.dtype) == (expected.shape, expected.dtype);
+        assert list(expr.evaluate().rows()) == list(expected.rows());
+        # mixing lazy and eager operands
+        mixed: lazy.Expr = case(a.lazy(), b, c.lazy(), d, e);
+        assert list(mixed.evaluate().rows()) == list(expected.rows());
+
+def testOutput(backend: str) -> None:
+    (a, c) = (_random(4, 4, 6), _random(4, 4, 7));
+    expected: typing.List = list((a @ c + c * 2).rows());
+    out: Matrix = Matrix.zeros(4, 4);
+    assert (a.lazy() @ c + c * 2).evaluate(out) is out;
+    assert list(out.rows()) == expected;
+    # into a view, and into an operand that is still read
+    big: Matrix = Matrix.zeros(6, 6);
+    (a.lazy() @ c + c * 2).evaluate(big[1:5, 2:]);
+    assert list(big[1:5, 2:].rows()) == expected;
+    (a.lazy() @ c + c * 2).evaluate(c);
+    assert list(c.rows()) == expected;
+    product: Matrix = Matrix.zeros(4, 4);
+    (a.lazy() @ a).evaluate(product);
+    assert list(product.rows()) == list((a @ a).rows());
+    with pytest.raises(ValueError):
+        (a.lazy() + 1).evaluate(Matrix.zeros(3, 4));
+
+def testSharedSubexpressions(backend: str, monkeypatch: pytest.MonkeyPatch) -> None:
+    (a, b) = (_random(3, 3, 8), _random(3, 3, 9));
+    calls: typing.List[int] = [];
+    matmul: typing.Callable = Matrix.__matmul__;
+    def counted(left: Matrix, right: Matrix) -> Matrix:
+        calls.append(1);
+        return matmul(left, right);
+    monkeypatch.setattr(Matrix, '__matmul__', counted);
+    shared: lazy.Expr = a.lazy() @ b;
+    result: Matrix = (shared + shared * shared).evaluate();
+    assert len(calls) == 1;
+    expected: Matrix = matmul(a, b);
+    assert list(result.rows()) == list((expected + expected * expected).rows());
+
+def testErrors() -> None:
+    a: lazy.Expr = Matrix.zeros(2, 3).lazy();
+    with pytest.raises(ValueError):
+        a + Matrix.zeros(3, 2);
+    with pytest.raises(ValueError):
+        a @ a;
+    with pytest.raises(TypeError):
+        a + 'x';
+    with pytest.raises(TypeError):
+        a @ 2;
@@ -0,0 +1,186 @@
+#!/usr/bin/env -S python3 -i
+'Tests of `matrix.linalg` against exact rational elimination'
+# pylint: disable=invalid-name
+# pylint: disable=protected-access
+
+import random;
+import typing;
+import fractions;
+
+import pytest;
+
+from ....data.matrix import Matrix;
+from ....data.matrix import kernels, linalg;
+
+_Rows = typing.List[typing.List[typing.Any]];
+
+def _random(height: int, width: int, seed: int) -> _Rows:
+    rng: random.Random = random.Random(seed);
+    return [[rng.randint(-9, 9) for _ in range(width)] for _ in range(height)];
+
+def _spd(size: int, seed: int) -> _Rows:
+    'A symmetric positive definite `B.T @ B + I`'
+    rows: _Rows = _random(size, size, seed);
+    return [
+        [sum(rows[k][i] * rows[k][j] for k in range(size)) + (i == j) for j in range(size)]
+        for i in range(size)
+    ];
+
+def _eliminate(rows: _Rows, rhs: _Rows) -> typing.Tuple[fractions.Fraction, _Rows]:
+    'Return the determinant and the solution by exact Gauss-Jordan elimination'
+    size: int = len(rows);
+    aug: _Rows = [
+        list(map(fractions.Fraction, row + extra)) for (row, extra) in zip(rows, rhs)
+    ];
+    det: fractions.Fraction = fractions.Fraction(1);
+    for col in range(size):
+        pivot: typing.Optional[int] = next(
+            (row for row in range(col, size) if aug[row][col]), None
+        );
+        if pivot is None:
+            return (fractions.Fraction(0), []);
+        if pivot != col:
+            (aug[col], aug[pivot]) = (aug[pivot], aug[col]);
+            det = -det;
+        det *= aug[col][col];
+        aug[col] = [elem / aug[col][col] for elem in aug[col]];
+        for row in range(size):
+            if row != col and aug[row][col]:
+                scale: fractions.Fraction = aug[row][col];
+                aug[row] = [x - scale * y for (x, y) in zip(aug[row], aug[col])];
+    return (det, [row[size:] for row in aug]);
+
+def _close(actual: typing.Any, expected: typing.Any) -> bool:
+    if isinstance(actual, Matrix):
+        actual = list(actual.rows());
+    return all(
+        x == pytest.approx([float(elem) for elem in y], abs=1e-9)
+        for (x, y) in zip(actual, expected)
+    ) and len(actual) == len(expected);
+
+@pytest.fixture(params=(64, 4, 1))
+def block(request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch) -> int:
+    'Run a test with several panel widths of the pure-Python LU'
+    monkeypatch.setattr(kernels, 'BLOCK', request.param);
+    return request.param;
+
+# region LU
+@pytest.mark.parametrize('size', (1, 2, 5, 9))
+def testLUReconstructs(backend: str, block: int, size: int) -> None:
+    rows: _Rows = _random(size, size, size);
+    factor: linalg.LU = Matrix.fromRows(rows).lu();
+    packed: _Rows = [list(map(float, row)) for row in factor._packed];
+    lower: _Rows = [
+        [packed[i][j] if j < i else float(i == j) for j in range(size)] for i in range(size)
+    ];
+    upper: _Rows = [[packed[i][j] if j >= i else 0.0 for j in range(size)] for i in range(size)];
+    product: _Rows = [
+        [sum(lower[i][k] * upper[k][j] for k in range(size)) for j in range(size)]
+        for i in range(size)
+    ];
+    assert _close(product, [rows[ind] for ind in factor.perm]);
+    assert all(abs(packed[i][j]) <= 1 + 1e-12 for i in range(size) for j in range(i));
+    assert sorted(factor.perm) == list(range(size));
+
+@pytest.mark.parametrize('size', (1, 3, 7, 10))
+def testSolveAndDet(backend: str, block: int, size: int) -> None:
+    rows: _Rows = _random(size, size, 10 + size);
+    rhs: _Rows = _random(size, 3, 20 + size);
+    (det, expected) = _eliminate(rows, rhs);
+    assert det, 'the seed gives a nonsingular matrix';
+    a: Matrix = Matrix.fromRows(rows);
+    assert a.det() == pytest.approx(float(det));
+    solved: Matrix = a.solve(rhs);
+    assert solved.shape == (size, 3) and solved.dtype == 'float64';
+    assert _close(solved, expected);
+    assert _close(a.solve(Matrix.fromRows(rhs)), expected);
+    vector: typing.List[float] = a.solve([row[0] for row in rhs]);
+    assert isinstance(vector, list);
+    assert vector == pytest.approx([float(row[0]) for row in expected]);
+
+def testInverse(backend: str, block: int) -> None:
+    rows: _Rows = _random(6, 6, 3);
+    identity: _Rows = [[int(i == j) for j in range(6)] for i in range(6)];
+    assert _close(Matrix.fromRows(rows).inverse(), _eliminate(rows, identity)[1]);
+
+def testSingular(backend: str, block: int) -> None:
+    rows: _Rows = _random(6, 6, 4);
+    rows[4] = [2 * elem for elem in rows[1]];
+    a: Matrix = Matrix.fromRows(rows);
+    assert a.lu().singular;
+    assert a.det() == 0.0;
+    with pytest.raises(ValueError):
+        a.solve([1] * 6);
+    with pytest.raises(ValueError):
+        a.inverse();
+    assert Matrix.fromRows([[0, 0], [0, 0]]).det() == 0.0;
+# endregion
+
+# region Cholesky and QR
+def testCholesky(backend: str) -> None:
+    rows: _Rows = _spd(6, 5);
+    rhs: _Rows = _random(6, 2, 6);
+    (det, expected) = _eliminate(rows, rhs);
+    a: Matrix = Matrix.fromRows(rows);
+    assert _close(a.solve(rhs, 'cholesky'), expected);
+    assert a.cholesky().det() == pytest.approx(float(det));
+    with pytest.raises(ValueError):
+        Matrix.fromRows([[1, 2], [2, 1]]).cholesky();
+
+def testQRFactors(backend: str) -> None:
+    rows: _Rows = _random(7, 4, 7);
+    factor: linalg.QR = Matrix.fromRows(rows).qr();
+    (q, r) = (list(factor.Q.rows()), list(factor.R.rows()));
+    assert _close([[sum(map(lambda x, y: x * y, row, col)) for col in zip(*r)] for row in q], rows);
+    assert _close(
+        [[sum(map(lambda x, y: x * y, a, b)) for b in zip(*q)] for a in zip(*q)],
+        [[int(i == j) for j in range(4)] for i in range(4)],
+    );
+    assert all(r[i][j] == pytest.approx(0) for i in range(4) for j in range(i));
+    assert factor.rank == 4;
+
+def testLstsq(backend: str) -> None:
+    rows: _Rows = _random(8, 3, 8);
+    rhs: _Rows = _random(8, 2, 9);
+    # the normal equations A.T @ A @ x = A.T @ b
+    normal: _Rows = [[sum(a * b for (a, b) in zip(x, y)) for y in zip(*rows)] for x in zip(*rows)];
+    projected: _Rows = [
+        [sum(a * b for (a, b) in zip(x, y)) for y in zip(*rhs)] for x in zip(*rows)
+    ];
+    expected: _Rows = _eliminate(normal, projected)[1];
+    a: Matrix = Matrix.fromRows(rows);
+    assert _close(a.lstsq(rhs), expected);
+    assert _close(a.solve(rhs, 'qr'), expected);
+
+def testQRErrors(backend: str) -> None:
+    with pytest.raises(ValueError):
+        Matrix.fromRows(_random(2, 3, 0)).qr();
+    deficient: Matrix = Matrix.fromRows([[1, 2], [2, 4], [3, 6]]);
+    assert deficient.qr().rank == 1;
+    with pytest.raises(ValueError):
+        deficient.lstsq([1, 2, 3]);
+# endregion
+
+# region caching and errors
+def testCacheInvalidation(backend: str) -> None:
+    a: Matrix = Matrix.fromRows([[4, 1], [1, 3]]);
+    factor: linalg.LU = a.lu();
+    assert a.lu() is factor and a.solve([1, 2]) == pytest.approx([1 / 11, 7 / 11]);
+    a[0, 0] = 2;
+    assert a.lu() is not factor;
+    assert a.solve([1, 2]) == pytest.approx([1 / 5, 3 / 5]);
+    assert a.det() == pytest.approx(5.0);
+    a[:, 1][0] = 0;
+    assert a.det() == pytest.approx(6.0);
+
+def testErrors(backend: str) -> None:
+    wide: Matrix = Matrix.fromRows(_random(2, 3, 1));
+    for func in (Matrix.lu, Matrix.cholesky, Matrix.det, Matrix.inverse):
+        with pytest.raises(ValueError):
+            func(wide);
+    square: Matrix = Matrix.fromRows([[2, 0], [0, 2]]);
+    with pytest.raises(ValueError):
+        square.solve([1, 2, 3]);
+    with pytest.raises(ValueError):
+        square.solve([1, 2], 'svd');
+# endregion
@@ -0,0 +1,59 @@
+#!/usr/bin/env -S python3 -i
+'Tests of memory-mapped `Matrix`'
+# pylint: disable=invalid-name
+
+import typing;
+
+import pytest;
+
+from ....data.matrix import Matrix;
+from ....data.matrix import fileIO;
+
+_rows: typing.List[typing.List[float]] = [[1.5, 2.0, 3.0], [4.0, 5.0, 6.5]];
+
+@pytest.fixture
+def path(tmp_path: typing.Any) -> typing.Any:
+    'A saved float matrix'
+    target: typing.Any = tmp_path / 'm.bin';
+    Matrix.fromRows(_rows).save(target);
+    return target;
+
+def testRead(backend: str, path: typing.Any) -> None:
+    mapped: Matrix = Matrix.mmap(path);
+    assert mapped.shape == (2, 3) and mapped.dtype == 'float64';
+    assert list(mapped.rows()) == _rows;
+    assert mapped[1, 2] == 6.5;
+    assert list(mapped[:, 1].rows()) == [[2.0], [5.0]];
+    # arithmetic results are ordinary in-memory matrices
+    doubled: Matrix = mapped * 2;
+    assert list(doubled.rows()) == [[2 * v for v in row] for row in _rows];
+    assert not isinstance(doubled._data.obj, type(mapped._data.obj));
+    with pytest.raises(TypeError):
+        mapped[0, 0] = 0.0;
+
+def testWriteThrough(path: typing.Any) -> None:
+    mapped: Matrix = Matrix.mmap(path, 'r+');
+    other: Matrix = Matrix.mmap(path);
+    mapped[0, 0] = 9.0;
+    mapped[1] = [7.0, 8.0, 9.0];
+    mapped.flush();
+    # mappings of the same file share the pages
+    assert other[0, 0] == 9.0;
+    assert list(Matrix.load(path).rows()) == [[9.0, 2.0, 3.0], [7.0, 8.0, 9.0]];
+
+def testCopyOnWrite(path: typing.Any) -> None:
+    mapped: Matrix = Matrix.mmap(path, 'c');
+    mapped[0, 0] = 9.0;
+    assert mapped[0, 0] == 9.0;
+    assert list(Matrix.load(path).rows()) == _rows;
+
+def testErrors(path: typing.Any) -> None:
+    with pytest.raises(ValueError):
+        Matrix.mmap(path, 'w');
+    data: bytes = path.read_bytes();
+    path.write_bytes(data[:-8]);
+    with pytest.raises(ValueError, match='Truncated'):
+        Matrix.mmap(path);
+    path.write_bytes(data[:fileIO.HEADER.size - 1]);
+    with pytest.raises(ValueError, match='header'):
+        Matrix.mmap(path);
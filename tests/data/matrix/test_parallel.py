@@ -0,0 +1,133 @@
+#!/usr/bin/env -S python3 -i
+'Tests of the process-parallel kernels of `data.matrix`'
+# pylint: disable=invalid-name
+# pylint: disable=protected-access
+
+import gc;
+import io;
+import os;
+import random;
+import typing;
+import operator as op;
+
+import pytest;
+
+from ....data.matrix import Matrix;
+from ....data.matrix import kernels, parallel;
+
+def _random(height: int, width: int, seed: int) -> Matrix:
+    rng: random.Random = random.Random(seed);
+    return Matrix.fromRows(
+        [[rng.randint(-9, 9) for _ in range(width)] for _ in range(height)]
+    );
+
+@pytest.fixture
+def workers() -> typing.Iterator[int]:
+    'Two workers for any size; the defaults are restored afterwards'
+    config: typing.Tuple = (
+        parallel._config.workers, parallel._config.threshold, parallel._config.auto
+    );
+    parallel.configure(workers=2, threshold=0);
+    yield 2;
+    parallel.configure(*config);
+    parallel.shutdown();
+
+def testMatmul(backend: str, workers: int) -> None:
+    for (height, inner, width) in ((1, 1, 1), (7, 5, 3), (9, 4, 11)):
+        (left, right) = (_random(height, inner, 0), _random(inner, width, 1));
+        product: Matrix = parallel.matmul(left, right);
+        assert list(product.rows()) == kernels.matmul(
+            list(left.rows()), list(right.rows()), width
+        );
+        # views are valid operands
+        assert list(parallel.matmul(left[::-1], right[:, ::2]).rows()) == list(
+            (left[::-1].copy() @ right[:, ::2].copy()).rows()
+        );
+    with pytest.raises(ValueError):
+        parallel.matmul(Matrix.zeros(2, 3), Matrix.zeros(2, 3));
+
+@pytest.mark.parametrize('func', (op.add, op.sub, op.mul))
+def testElementwise(backend: str, workers: int, func: typing.Callable) -> None:
+    (left, right) = (_random(9, 6, 2), _random(9, 6, 3));
+    expected: typing.List = [list(map(func, x, y)) for (x, y) in zip(left.rows(), right.rows())];
+    assert list(parallel.elementwise(left, right, func).rows()) == expected;
+    assert list(parallel.elementwise(left, 2.5, func, True).rows()) == [
+        [func(2.5, x) for x in row] for row in left.rows()
+    ];
+    with pytest.raises(ValueError):
+        parallel.elementwise(left, Matrix.zeros(6, 9), func);
+
+def testApplyAndReduce(workers: int) -> None:
+    matrix: Matrix = _random(8, 5, 4);
+    flat: typing.List[int] = list(matrix);
+    assert list(parallel.apply(abs, matrix)) == list(map(abs, flat));
+    assert parallel.apply(float, matrix, 'float64').dtype == 'float64';
+    assert parallel.reduce(op.add, matrix) == sum(flat);
+    assert parallel.reduce(max, matrix) == max(flat);
+    with pytest.raises(ValueError):
+        parallel.reduce(op.add, Matrix.zeros(0, 3));
+
+def testResultsAreShared(workers: int, monkeypatch: pytest.MonkeyPatch) -> None:
+    (left, right) = (_random(6, 6, 5), _random(6, 6, 6));
+    product: Matrix = parallel.matmul(left, right);
+    # the result is stored on the mapping the workers wrote
+    path: str = parallel._spec(product)[0];
+    assert os.path.exists(path);
+    assert parallel.share(product) is product;
+    assert parallel.share(product[2:4]) is not product;
+    assert parallel._spec(parallel.share(product[2:4]))[:2] == (path, 2 * 6 * 8);
+    assert parallel._spec(parallel.share(product[:, 1:]))[0] != path;
+    # shared operands are not copied: the output is the only new mapping
+    created: typing.List[Matrix] = [];
+    empty: typing.Callable = parallel._empty;
+    monkeypatch.setattr(
+        parallel, '_empty', lambda *args: created.append(empty(*args)) or created[-1]
+    );
+    again: Matrix = parallel.matmul(product, product);
+    assert created == [again];
+    assert list(again.rows()) == list((product.copy() @ product.copy()).rows());
+    # the file goes with the last view of the mapping
+    del product, again, created;
+    gc.collect();
+    assert not os.path.exists(path);
+
+def testSerialBelowThreshold(monkeypatch: pytest.MonkeyPatch) -> None:
+    parallel.configure(threshold=1 << 30);
+    try:
+        monkeypatch.setattr(parallel, '_pool', None);
+        (left, right) = (_random(3, 3, 7), _random(3, 3, 8));
+        assert list(parallel.matmul(left, right, workers=4).rows()) == list((left @ right).rows());
+        assert parallel.reduce(op.add, left, workers=4) == sum(left);
+        assert not parallel.enabled(1 << 20);
+    finally:
+        parallel.configure(threshold=1 << 20);
+
+def testMatrixOperators(backend: str, workers: int, monkeypatch: pytest.MonkeyPatch) -> None:
+    (left, right) = (_random(5, 4, 9), _random(4, 6, 10));
+    calls: typing.List[str] = [];
+    for name in ('matmul', 'elementwise'):
+        func: typing.Callable = getattr(parallel, name);
+        monkeypatch.setattr(
+            parallel, name,
+            lambda *args, _func=func, _name=name: calls.append(_name) or _func(*args)
+        );
+    # off by default: plain operators never start worker processes
+    assert not parallel._Config().auto;
+    parallel.configure(auto=False);
+    left @ right;
+    left + 1;
+    assert not calls;
+    parallel.configure(auto=True);
+    assert list((left @ right).rows()) == kernels.matmul(list(left.rows()), list(right.rows()), 6);
+    assert list((left + 1).rows()) == [[x + 1 for x in row] for row in left.rows()];
+    # with NumPy, Matrix operators keep using it
+    assert calls == ([] if backend == 'numpy' else ['matmul', 'elementwise']);
+
+def testFromCSV(workers: int) -> None:
+    rows: typing.List[typing.List[int]] = [[row, -row, row * row] for row in range(100)];
+    text: str = ''.join(','.join(map(str, row)) + '\n' for row in rows);
+    assert list(parallel.fromCSV(io.StringIO(text), chunkSize=32).rows()) == rows;
+
+def testConfigureErrors() -> None:
+    with pytest.raises(ValueError):
+        parallel.configure(workers=0);
@@ -0,0 +1,110 @@
+#!/usr/bin/env -S python3 -i
+'Tests of `matrix.rangeQuery` against brute-force rectangle scans'
+# pylint: disable=invalid-name
+
+import random;
+import typing;
+
+import pytest;
+
+from ....data.matrix import Matrix;
+from ....data.matrix import rangeQuery;
+
+_Rows = typing.List[typing.List[typing.Any]];
+_Rect = typing.Tuple[int, int, int, int];
+
+def _random(height: int, width: int, seed: int, floats: bool = False) -> _Rows:
+    rng: random.Random = random.Random(seed);
+    if floats:
+        return [[rng.uniform(-5, 5) for _ in range(width)] for _ in range(height)];
+    return [[rng.randint(-50, 50) for _ in range(width)] for _ in range(height)];
+
+def _cells(rows: _Rows, rect: _Rect) -> typing.List[typing.Any]:
+    (top, left, bottom, right) = rect;
+    return [elem for row in rows[top:bottom] for elem in row[left:right]];
+
+def _rects(height: int, width: int, empty: bool = True) -> typing.Iterator[_Rect]:
+    'Every rectangle of the shape, optionally including the empty ones'
+    for top in range(height + 1):
+        for bottom in range(top + (not empty), height + 1):
+            for left in range(width + 1):
+                for right in range(left + (not empty), width + 1):
+                    yield (top, left, bottom, right);
+
+_shapes: typing.Tuple = ((1, 1), (1, 6), (5, 1), (4, 7), (8, 5));
+
+@pytest.mark.parametrize('shape', _shapes)
+def testSums(backend: str, shape: typing.Tuple[int, int]) -> None:
+    rows: _Rows = _random(*shape, seed=sum(shape));
+    a: Matrix = Matrix.fromRows(rows);
+    (table, tree) = (a.summedArea(), a.fenwick());
+    for rect in _rects(*shape):
+        expected: int = sum(_cells(rows, rect));
+        assert table.sum(*rect) == expected;
+        assert tree.sum(*rect) == expected;
+        assert a.rangeSum(*rect) == expected;
+    assert type(table.sum(0, 0, *shape)) is int;
+
+def testFloatSums(backend: str) -> None:
+    rows: _Rows = _random(6, 6, 1, floats=True);
+    table: rangeQuery.SummedArea = Matrix.fromRows(rows).summedArea();
+    for rect in _rects(6, 6):
+        assert table.sum(*rect) == pytest.approx(sum(_cells(rows, rect)), abs=1e-9);
+
+@pytest.mark.parametrize('shape', _shapes)
+def testMinMax(backend: str, shape: typing.Tuple[int, int]) -> None:
+    rows: _Rows = _random(*shape, seed=2 * sum(shape));
+    a: Matrix = Matrix.fromRows(rows);
+    for rect in _rects(*shape, empty=False):
+        assert a.rangeMin(*rect) == min(_cells(rows, rect));
+        assert a.rangeMax(*rect) == max(_cells(rows, rect));
+
+def testErrors(backend: str) -> None:
+    a: Matrix = Matrix.fromRows(_random(3, 4, 3));
+    for rect in ((0, 0, 4, 4), (0, 0, 3, 5), (-1, 0, 2, 2), (2, 0, 1, 3), (0, 3, 2, 2)):
+        with pytest.raises(IndexError):
+            a.rangeSum(*rect);
+        with pytest.raises(IndexError):
+            a.fenwick().sum(*rect);
+        with pytest.raises(IndexError):
+            a.rangeMin(*rect);
+    with pytest.raises(ValueError):
+        a.rangeMax(1, 1, 1, 3);
+    with pytest.raises(ValueError):
+        a.sparseTable('sum');
+
+# region updates
+def testFenwickFollowsWrites(backend: str) -> None:
+    rows: _Rows = _random(5, 6, 4);
+    a: Matrix = Matrix.fromRows(rows);
+    tree: rangeQuery.Fenwick = a.fenwick();
+    rng: random.Random = random.Random(5);
+    for _ in range(30):
+        (row, col, value) = (rng.randrange(5), rng.randrange(6), rng.randint(-50, 50));
+        a[row, col] = value;
+        rows[row][col] = value;
+        assert a.fenwick() is tree;
+        rect: _Rect = (rng.randint(0, 2), rng.randint(0, 3), rng.randint(3, 5), rng.randint(3, 6));
+        assert a.rangeSum(*rect) == sum(_cells(rows, rect));
+    assert all(a.rangeSum(*rect) == sum(_cells(rows, rect)) for rect in _rects(5, 6));
+
+def testRebuiltAfterWrites(backend: str) -> None:
+    rows: _Rows = _random(4, 4, 6);
+    a: Matrix = Matrix.fromRows(rows);
+    (table, sparse) = (a.summedArea(), a.sparseTable('max'));
+    a[1:3, 1:3] = [[100, 100], [100, 100]];
+    for (row, col) in ((1, 1), (1, 2), (2, 1), (2, 2)):
+        rows[row][col] = 100;
+    assert a.summedArea() is not table and a.sparseTable('max') is not sparse;
+    assert all(a.rangeSum(*rect) == sum(_cells(rows, rect)) for rect in _rects(4, 4));
+    assert a.rangeMax(0, 0, 4, 4) == 100 and a.rangeMax(0, 0, 1, 4) == max(rows[0]);
+
+def testWriteThroughView(backend: str) -> None:
+    rows: _Rows = _random(4, 5, 7);
+    a: Matrix = Matrix.fromRows(rows);
+    assert a.rangeSum(0, 0, 4, 5) == sum(_cells(rows, (0, 0, 4, 5)));
+    a[:, 2][3] = 1000;
+    rows[3][2] = 1000;
+    assert a.rangeSum(0, 0, 4, 5) == sum(_cells(rows, (0, 0, 4, 5)));
+    assert a.rangeMax(2, 0, 4, 5) == 1000;
+# endregion
@@ -0,0 +1,119 @@
+#!/usr/bin/env -S python3 -i
+'Tests of the sparse matrices of `data.matrix`'
+# pylint: disable=invalid-name
+
+import random;
+import typing;
+
+import pytest;
+
+from ....data.matrix import Matrix, COOMatrix, CSRMatrix, CSCMatrix;
+
+_Rows = typing.List[typing.List[typing.Any]];
+_Triples = typing.List[typing.Tuple[int, int, int]];
+
+def _triples(height: int, width: int, count: int, seed: int) -> _Triples:
+    'Random triples, with duplicate coordinates'
+    rng: random.Random = random.Random(seed);
+    return [
+        (rng.randrange(height), rng.randrange(width), rng.randint(-5, 5))
+        for _ in range(count)
+    ];
+
+def _dense(height: int, width: int, triples: _Triples) -> _Rows:
+    'The reference: duplicates summed into a list of rows'
+    rows: _Rows = [[0] * width for _ in range(height)];
+    for (row, col, value) in triples:
+        rows[row][col] += value;
+    return rows;
+
+def _matmul(left: _Rows, right: _Rows) -> _Rows:
+    return [
+        [sum(x * y for (x, y) in zip(row, col)) for col in zip(*right)]
+        for row in left
+    ];
+
+@pytest.mark.parametrize(('height', 'width'), ((1, 1), (5, 8), (9, 3)))
+def testFormsMatchReference(height: int, width: int) -> None:
+    triples: _Triples = _triples(height, width, 3 * (height + width), 0);
+    expected: _Rows = _dense(height, width, triples);
+    coo: COOMatrix = COOMatrix((height, width), triples);
+    assert coo.nnz == len(triples);
+    for matrix in (coo, coo.toCSR(), coo.toCSC(), coo.toCSR().toCSC(), coo.toCSC().toCSR()):
+        assert matrix.shape == (height, width);
+        assert list(matrix.rows()) == expected;
+        assert list(matrix) == sum(expected, []);
+        assert list(matrix.toDense().rows()) == expected;
+        for row in range(-height, height):
+            for col in range(-width, width):
+                assert matrix[row, col] == expected[row][col];
+    csr: CSRMatrix = coo.toCSR();
+    assert csr.nnz <= len({(row, col) for (row, col, _) in triples});
+    assert [csr.row(row) for row in range(height)] == expected;
+    assert list(coo.toCSC().cols()) == [list(col) for col in zip(*expected)];
+    assert coo.toCSC().col(-1) == [row[-1] for row in expected];
+    assert str(csr) == str(Matrix.fromRows(expected));
+
+def testFromDense() -> None:
+    rows: _Rows = _dense(6, 4, _triples(6, 4, 5, 1));
+    for cls in (CSRMatrix, CSCMatrix):
+        sparse: typing.Any = cls.fromDense(Matrix.fromRows(rows));
+        assert isinstance(sparse, cls);
+        assert sparse.nnz == sum(map(bool, sum(rows, [])));
+        assert list(sparse.rows()) == rows;
+
+def testTransposeSharesArrays() -> None:
+    triples: _Triples = _triples(4, 7, 12, 2);
+    csr: CSRMatrix = COOMatrix((4, 7), triples).toCSR();
+    transposed: CSCMatrix = csr.transpose();
+    assert isinstance(transposed, CSCMatrix) and transposed.shape == (7, 4);
+    assert transposed._vals is csr._vals;
+    assert list(transposed.rows()) == [list(col) for col in zip(*_dense(4, 7, triples))];
+    assert isinstance(transposed.transpose(), CSRMatrix);
+
+def testProducts(backend: str) -> None:
+    (left, right) = (_triples(6, 5, 12, 3), _triples(5, 7, 12, 4));
+    (leftRows, rightRows) = (_dense(6, 5, left), _dense(5, 7, right));
+    expected: _Rows = _matmul(leftRows, rightRows);
+    (a, b) = (COOMatrix((6, 5), left), COOMatrix((5, 7), right));
+    for x in (a.toCSR(), a.toCSC()):
+        dense: Matrix = x @ Matrix.fromRows(rightRows);
+        assert isinstance(dense, Matrix) and list(dense.rows()) == expected;
+        for y in (b, b.toCSR(), b.toCSC()):
+            product: CSRMatrix = x @ y;
+            assert isinstance(product, CSRMatrix);
+            assert list(product.rows()) == expected;
+    for y in (b.toCSR(), b.toCSC()):
+        dense = Matrix.fromRows(leftRows) @ y;
+        assert isinstance(dense, Matrix) and list(dense.rows()) == expected;
+    floats: Matrix = Matrix.fromRows(rightRows) * 0.5;
+    # halves of ints are exact
+    assert list((a.toCSR() @ floats).rows()) == [[v / 2 for v in row] for row in expected];
+
+def testScalar() -> None:
+    triples: _Triples = _triples(3, 3, 6, 5);
+    csc: CSCMatrix = COOMatrix((3, 3), triples).toCSC();
+    assert list((2 * csc).rows()) == [[2 * v for v in row] for row in _dense(3, 3, triples)];
+    assert (csc * 0.5).dtype == 'float64' and isinstance(csc * 0.5, CSCMatrix);
+
+def testErrors() -> None:
+    with pytest.raises(ValueError):
+        COOMatrix((-1, 2));
+    with pytest.raises(TypeError):
+        COOMatrix((1.5, 2));
+    coo: COOMatrix = COOMatrix((2, 2));
+    with pytest.raises(IndexError):
+        coo.add(2, 0, 1);
+    with pytest.raises(IndexError):
+        coo.toCSR()[0, 2];
+    with pytest.raises(ValueError):
+        CSRMatrix((2, 2), [0, 1], [0], [1]);
+    with pytest.raises(ValueError):
+        CSRMatrix((2, 2), [0, 1, 2], [0], [1]);
+    assert list(CSRMatrix((2, 2), [0, 1, 2], [1, 0], [3, 4]).rows()) == [[0, 3], [4, 0]];
+    with pytest.raises(ValueError):
+        coo.toCSR() @ COOMatrix((3, 2));
+    with pytest.raises(TypeError):
+        coo.toCSR() @ [[1]];
+    with pytest.raises(TypeError):
+        coo.toCSR() * 'a';
@@ -0,0 +1,91 @@
+#!/usr/bin/env -S python3 -i
+'Tests of the contiguous storage of `Matrix`'
+# pylint: disable=invalid-name
+
+import io;
+import array;
+import typing;
+
+import pytest;
+
+from ....data.matrix import Matrix;
+from ....data.matrix import dtype as dt;
+
+def _nested(width: int, height: int, value: typing.Any = 0) -> typing.List[typing.List]:
+    'The list-of-lists storage of the original Matrix(width=, height=)'
+    return [[value] * height for _ in range(width)];
+
+def testKeywordConstructorKeepsItsMeaning() -> None:
+    for (width, height) in ((2, 3), (3, 2), (1, 4), (0, 2)):
+        matrix: Matrix = Matrix(width=width, height=height, value=7);
+        reference: typing.List[typing.List] = _nested(width, height, 7);
+        assert list(matrix.rows()) == reference;
+        assert matrix.height == len(reference);
+        assert matrix.shape == (width, height);
+        assert list(Matrix((width, height)).rows()) == _nested(width, height);
+    assert Matrix(width=2, height=2, value=1.5).dtype == 'float64';
+    assert Matrix(width=2, height=2, dtype='int8').dtype == 'int8';
+
+def testConstructorErrors() -> None:
+    with pytest.raises(TypeError):
+        Matrix(width=2.0, height=3);
+    with pytest.raises(ValueError):
+        Matrix(width=-1, height=3);
+    with pytest.raises(ValueError):
+        Matrix((2,));
+    with pytest.raises(TypeError):
+        Matrix((2, 'a'));
+    with pytest.raises(ValueError):
+        Matrix(width=2, height=2, dtype='complex');
+    with pytest.raises(ValueError):
+        Matrix.fromRows([[1, 2], [3]]);
+
+def testFileConstructor() -> None:
+    matrix: Matrix = Matrix(io.StringIO('1,2,3\n4,5,6\n'));
+    assert list(matrix.rows()) == [[1, 2, 3], [4, 5, 6]];
+    assert Matrix(io.StringIO('1;2\n'), delim=';').shape == (1, 2);
+
+def testStorageIsFlatAndTyped() -> None:
+    rows: typing.List[typing.List[int]] = [[1, 2, 3], [4, 5, 6]];
+    matrix: Matrix = Matrix.fromRows(rows);
+    assert matrix.dtype == dt.DEFAULT;
+    assert isinstance(matrix._data, memoryview);
+    assert matrix._data.nbytes == 6 * dt.itemsize(dt.DEFAULT);
+    assert matrix.strides == (3, 1) and matrix.offset == 0;
+    assert Matrix.fromRows([[1, 2.5]]).dtype == 'float64';
+    assert Matrix.fromRows(rows, dtype='int16')._data.nbytes == 12;
+
+def testItemAccess() -> None:
+    rows: typing.List[typing.List[int]] = [[1, 2, 3], [4, 5, 6]];
+    matrix: Matrix = Matrix.fromRows(rows);
+    for row in range(-2, 2):
+        for col in range(-3, 3):
+            assert matrix[row, col] == rows[row][col];
+    matrix[1, -1] = 9;
+    rows[1][-1] = 9;
+    assert list(matrix.rows()) == rows;
+    assert sorted(matrix) == sorted(sum(rows, []));
+    for index in ((2, 0), (0, 3), (-3, 0)):
+        with pytest.raises(IndexError):
+            matrix[index];
+    with pytest.raises(NotImplementedError):
+        matrix['a'];
+
+def testStrings() -> None:
+    matrix: Matrix = Matrix.fromRows([[1, 2], [3, 4]]);
+    assert str(matrix) == '[[1,2];[3,4]]';
+    assert matrix.prettyStr == '[[1,\t2]\n [3,\t4]]';
+    assert 'width=2, height=2' in repr(matrix);
+
+def testDtypes() -> None:
+    for name in ('int8', 'uint16', 'int32', 'int64', 'float32', 'float64'):
+        assert dt.fromTypecode(dt.typecode(name)) == name;
+        assert Matrix.zeros(2, 2, name).dtype == name;
+    assert dt.fromTypecode(array.array('l').typecode).startswith('int');
+    assert dt.promote('int8', 'int8') == 'int8';
+    assert dt.promote('int8', 'float32') == 'float64';
+    assert dt.promote('int8', 'int16') == 'int64';
+    with pytest.raises(ValueError):
+        dt.typecode('int128');
+    with pytest.raises(ValueError):
+        dt.fromTypecode('u');
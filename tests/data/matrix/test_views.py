@@ -0,0 +1,122 @@
+#!/usr/bin/env -S python3 -i
+'Tests of the views and slice indexing of `Matrix`'
+# pylint: disable=invalid-name
+
+import random;
+import typing;
+
+import pytest;
+
+from ....data.matrix import Matrix;
+
+_Rows = typing.List[typing.List[typing.Any]];
+
+def _rows(height: int, width: int) -> _Rows:
+    return [[row * width + col for col in range(width)] for row in range(height)];
+
+def _select(
+        rows: _Rows, rowKey: typing.Any,
+        colKey: typing.Any) -> typing.Tuple[_Rows, typing.Tuple[int, int]]:
+    'The reference: the rows and the shape selected by slicing index lists'
+    def axis(key: typing.Any, size: int) -> typing.List[int]:
+        indices: typing.List[int] = list(range(size));
+        return [indices[key]] if isinstance(key, int) else indices[key];
+    (rowInds, colInds) = (axis(rowKey, len(rows)), axis(colKey, len(rows[0])));
+    return (
+        [[rows[row][col] for col in colInds] for row in rowInds],
+        (len(rowInds), len(colInds))
+    );
+
+def _keys(size: int, rng: random.Random) -> typing.Iterator[typing.Any]:
+    yield rng.randrange(-size, size);
+    for _ in range(4):
+        (start, stop) = (rng.randrange(-size, size + 1), rng.randrange(-size, size + 1));
+        yield slice(start, stop, rng.choice((1, 2, 3, -1, -2)));
+    yield slice(None);
+    yield slice(None, None, -1);
+
+def testViewsMatchReference() -> None:
+    rng: random.Random = random.Random(0);
+    rows: _Rows = _rows(6, 5);
+    matrix: Matrix = Matrix.fromRows(rows);
+    for rowKey in _keys(6, rng):
+        for colKey in _keys(5, rng):
+            (expected, shape) = _select(rows, rowKey, colKey);
+            if isinstance(rowKey, int) and isinstance(colKey, int):
+                assert matrix[rowKey, colKey] == expected[0][0];
+                continue;
+            view: Matrix = matrix[rowKey, colKey];
+            assert view.shape == shape;
+            assert list(view.rows()) == expected;
+            # a view of a view selects on the view
+            assert list(view[::-1].rows()) == expected[::-1];
+            assert list(view[:, ::2].rows()) == [row[::2] for row in expected];
+        assert list(matrix[rowKey].rows()) == _select(rows, rowKey, slice(None))[0];
+
+def testViewsShareTheBuffer() -> None:
+    matrix: Matrix = Matrix.fromRows(_rows(4, 4));
+    block: Matrix = matrix[1:3, 1:3];
+    assert block._data.obj is matrix._data.obj;
+    assert block.offset == 5 and block.strides == (4, 1);
+    assert matrix[::2, ::-2].strides == (8, -2);
+    block[0, 0] = -1;
+    assert matrix[1, 1] == -1;
+    matrix[2, 2] = -2;
+    assert block[1, 1] == -2;
+    column: Matrix = matrix[:, -1];
+    assert list(column.rows()) == [[3], [7], [11], [15]];
+    copy: Matrix = block.copy();
+    copy[0, 0] = 0;
+    assert matrix[1, 1] == -1 and copy._data.obj is not matrix._data.obj;
+
+def testAssign(backend: str) -> None:
+    rows: _Rows = _rows(4, 6);
+    matrix: Matrix = Matrix.fromRows(rows);
+    matrix[1:3, ::2] = 0;
+    matrix[0] = [9] * 6;
+    matrix[3, 1::2] = [[7, 8, 9]];
+    matrix[-1:, :1] = Matrix.fromRows([[5]]);
+    matrix[::3, 2:4] = [1, 2, 3, 4];
+    expected: _Rows = [list(row) for row in rows];
+    for row in (1, 2):
+        expected[row][::2] = [0] * 3;
+    expected[0] = [9] * 6;
+    expected[3][1::2] = [7, 8, 9];
+    expected[3][0] = 5;
+    (expected[0][2:4], expected[3][2:4]) = ([1, 2], [3, 4]);
+    assert list(matrix.rows()) == expected;
+
+def testOverlappingAssign(backend: str) -> None:
+    rows: _Rows = _rows(5, 3);
+    matrix: Matrix = Matrix.fromRows(rows);
+    # shift the rows down by one: the source is read before it is overwritten
+    matrix[1:] = matrix[:-1];
+    assert list(matrix.rows()) == [rows[0], *rows[:-1]];
+    matrix = Matrix.fromRows(rows);
+    matrix[:, ::-1] = matrix;
+    assert list(matrix.rows()) == [row[::-1] for row in rows];
+
+def testAssignErrors(backend: str) -> None:
+    matrix: Matrix = Matrix.fromRows(_rows(3, 3));
+    with pytest.raises(ValueError):
+        matrix[0:2] = Matrix.zeros(3, 3);
+    with pytest.raises(ValueError):
+        matrix[0:2] = [1, 2, 3];
+    with pytest.raises(IndexError):
+        matrix[3];
+    with pytest.raises(IndexError):
+        matrix[0, 3] = 1;
+
+def testMemoryview(backend: str) -> None:
+    matrix: Matrix = Matrix.fromRows(_rows(4, 4));
+    view: memoryview = matrix[1:3].toMemoryview();
+    assert view.shape == (2, 4) and view.tolist() == _rows(4, 4)[1:3];
+    view[0, 0] = -1;
+    assert matrix[1, 0] == -1;
+    strided: Matrix = matrix[:, 1::2];
+    if backend == 'python':
+        with pytest.raises(BufferError):
+            strided.toMemoryview();
+    else:
+        assert strided.toMemoryview().tolist() == list(strided.rows());
+    assert strided.copy().toMemoryview().tolist() == list(strided.rows());
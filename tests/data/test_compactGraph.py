@@ -0,0 +1,124 @@
+#!/usr/bin/env -S python3 -i
+'Tests of `data.graph.CompactGraph` against `Graph`'
+# pylint: disable=invalid-name
+# pylint: disable=protected-access
+
+import random;
+import typing;
+import collections as c;
+
+import pytest;
+
+from ...data.graph import Vertex, Edge, Graph, CompactGraph;
+
+_Pairs = typing.List[typing.Tuple[int, int]];
+
+def _randomPairs(count: int, numVerts: int, seed: int) -> _Pairs:
+    rng: random.Random = random.Random(seed);
+    return [(rng.randrange(numVerts), rng.randrange(numVerts)) for _ in range(count)];
+
+def _sameAdjacency(compact: CompactGraph, graph: Graph, numVerts: int) -> None:
+    'Compare neighbors, degrees and edges with the reference `Graph`'
+    for vert in range(numVerts):
+        for (mine, theirs) in (
+                (compact.iterFromVert(vert), graph.iterFromVert(vert)),
+                (compact.iterToVert(vert), graph.iterToVert(vert))):
+            assert sorted(map(int, mine)) == sorted(map(int, theirs));
+        assert compact.outDegree(vert) == graph.outDegree(vert);
+        assert compact.inDegree(vert) == graph.inDegree(vert);
+        for other in range(numVerts):
+            assert compact.hasEdge(vert, other) == graph.hasEdge(vert, other);
+            if graph.hasEdge(vert, other):
+                assert compact.weight(vert, other) == graph.weight(vert, other);
+
+@pytest.mark.parametrize('bidir', (True, False))
+def testMatchesGraph(bidir: bool) -> None:
+    pairs: _Pairs = [(a, b) for (a, b) in _randomPairs(80, 12, 0) if a != b];
+    weights: typing.List[float] = [float(a + b) for (a, b) in pairs];
+    compact: CompactGraph = CompactGraph(12, pairs, weights, bidir=bidir);
+    graph: Graph = Graph(range(12), [], bidir);
+    for ((a, b), weight) in zip(pairs, weights):
+        graph.addEdge(a, b, weight);
+    assert compact.numEdges == graph.numEdges and compact.numVerts == 12;
+    _sameAdjacency(compact, graph, 12);
+    converted: CompactGraph = CompactGraph.fromGraph(graph);
+    assert converted.numEdges == graph.numEdges;
+    _sameAdjacency(converted, graph, 12);
+
+@pytest.mark.parametrize('bidir', (True, False))
+def testMutations(bidir: bool) -> None:
+    compact: CompactGraph = CompactGraph(10, bidir=bidir).freeze();
+    graph: Graph = Graph(range(10), [], bidir);
+    rng: random.Random = random.Random(1);
+    for (a, b) in _randomPairs(100, 10, 2):
+        if a == b:
+            continue;
+        if rng.random() < 0.4:
+            assert compact.removeEdge(a, b) == graph.removeEdge(a, b);
+        else:
+            weight: float = rng.choice((1.0, 2.0));
+            assert compact.addEdge(a, b, weight) == graph.addEdge(a, b, weight);
+        _sameAdjacency(compact, graph, 10);
+    assert sorted(edge.key() for edge in compact.edges()) == sorted(edge.key() for edge in graph._edges);
+
+def testParallelEdges() -> None:
+    pairs: _Pairs = [(0, 1), (0, 1), (1, 2), (0, 1)];
+    compact: CompactGraph = CompactGraph(3, pairs, bidir=False, unique=False);
+    assert compact.numEdges == 4 and compact._keys is None;
+    assert compact.outDegree(0) == 3 and compact.inDegree(1) == 3;
+    assert compact.hasEdge(0, 1) and not compact.hasEdge(1, 0);
+    assert compact.removeEdge(0, 1) and compact.outDegree(0) == 2;
+    assert not compact.removeEdge(2, 1);
+    counts: c.Counter = c.Counter(edge.key() for edge in compact.edges());
+    assert counts == {(0, 1): 2, (1, 2): 1};
+
+def testGrowthAndObjects() -> None:
+    compact: CompactGraph = CompactGraph();
+    assert compact.addEdge(Vertex(2), 5) and compact.numVerts == 6;
+    assert compact.addEdges([(7, 1), (1, 7), (5, 2)]) == 1 and compact.numVerts == 8;
+    assert compact.addVertex() == 8 and compact.numVerts == 9;
+    assert list(compact.vertices()) == list(range(9));
+    assert compact.edge(0) == Edge(5, 2) and compact.edge(1) == Edge(1, 7);
+    assert compact.weight(2, 5) == 1.0 and compact._weights is None;
+    assert compact.addEdge(0, 1, 3.5) and compact.weight(1, 0) == 3.5;
+    assert list(compact._weights) == [1.0, 1.0, 3.5];
+
+def testMissingVertices() -> None:
+    compact: CompactGraph = CompactGraph(3, [(1, 0)], bidir=False);
+    for vert in (-1, 3, 5, 1 << 40):
+        assert compact.outDegree(vert) == compact.inDegree(vert) == 0;
+        assert list(compact.iterFromVert(vert)) == list(compact.iterToVert(vert)) == [];
+        assert not compact.hasEdge(vert, 0) and not compact.removeEdge(vert, 0);
+        with pytest.raises(KeyError):
+            compact.weight(vert, 0);
+
+@pytest.mark.parametrize(('edges', 'weights', 'error'), (
+    ([(0, 2), (0, 1 << 32)], None, ValueError),
+    ([(0, 2), (-1, 0)], None, ValueError),
+    ([(0, 2), (0, 1.5)], None, TypeError),
+    ([(0, 2), ('1', 0)], None, TypeError),
+    ([(0, 2), (1, 2, 3)], None, ValueError),
+    ([(0, 2), (1, 2)], [2.0, -1.0], ValueError),
+))
+def testAddEdgesRollsBack(edges: _Pairs, weights: typing.Any, error: type) -> None:
+    for bidir in (True, False):
+        compact: CompactGraph = CompactGraph(3, [(1, 0)], bidir=bidir).freeze();
+        with pytest.raises(error):
+            compact.addEdges(edges, weights);
+        assert list(compact._src) == [1] and list(compact._dst) == [0];
+        assert compact._keys == {compact._key(1, 0)} and compact.numVerts == 3;
+        assert compact._weights is None or list(compact._weights) == [1.0];
+        assert not compact.hasEdge(0, 2) and compact.outDegree(0) == int(bidir);
+        # the rolled back edges can be added afterwards
+        assert compact.addEdges([(0, 2)]) == 1 and compact.hasEdge(0, 2);
+
+def testAddEdgeErrors() -> None:
+    compact: CompactGraph = CompactGraph(2);
+    for (pair, error) in (((0, 1 << 32), ValueError), ((-1, 0), ValueError), ((0, 0.5), TypeError)):
+        with pytest.raises(error):
+            compact.addEdge(*pair);
+    with pytest.raises(ValueError):
+        compact.addEdge(0, 1, -1.0);
+    with pytest.raises(ValueError):
+        CompactGraph(-1);
+    assert compact.numEdges == 0 and compact.numVerts == 2;
@@ -0,0 +1,110 @@
+#!/usr/bin/env -S python3 -i
+'Tests of the adjacency indexes of `data.graph.Graph`'
+# pylint: disable=invalid-name
+# pylint: disable=protected-access
+
+import random;
+import typing;
+
+import pytest;
+
+from ...data.graph import Vertex, Graph;
+
+_Pairs = typing.List[typing.Tuple[int, int]];
+
+def _randomPairs(count: int, numVerts: int, seed: int) -> _Pairs:
+    'Random pairs of vertex values 10, 20, ..., without loops'
+    rng: random.Random = random.Random(seed);
+    pairs: _Pairs = [];
+    while len(pairs) < count:
+        (a, b) = (rng.randrange(numVerts), rng.randrange(numVerts));
+        if a != b:
+            pairs.append((10 * a, 10 * b));
+    return pairs;
+
+def _scan(graph: Graph, vert: int, outgoing: bool) -> typing.Set[int]:
+    'The original neighbor query: a scan of every edge'
+    found: typing.Set[int] = set();
+    for edge in graph._edges:
+        (a, b) = (edge._from._int, edge._to._int);
+        for (x, y) in ((a, b), (b, a)) if graph._bidir else ((a, b),):
+            if outgoing and x == vert:
+                found.add(y);
+            elif not outgoing and y == vert:
+                found.add(x);
+    return found;
+
+def _check(graph: Graph, verts: typing.Iterable[int]) -> None:
+    for vert in verts:
+        succ: typing.List[Vertex] = list(graph.iterFromVert(vert));
+        pred: typing.List[Vertex] = list(graph.iterToVert(Vertex(vert)));
+        assert all(isinstance(elem, Vertex) for elem in succ + pred);
+        assert set(map(int, succ)) == _scan(graph, vert, True) and len(succ) == len(set(succ));
+        assert set(map(int, pred)) == _scan(graph, vert, False) and len(pred) == len(set(pred));
+        assert graph.outDegree(vert) == len(succ) and graph.inDegree(vert) == len(pred);
+        for other in succ:
+            assert graph.hasEdge(vert, other);
+
+@pytest.mark.parametrize('bidir', (True, False))
+def testNeighborsMatchScan(bidir: bool) -> None:
+    pairs: _Pairs = _randomPairs(60, 15, int(bidir));
+    graph: Graph = Graph(range(0, 150, 10), pairs, bidir);
+    assert graph.numVerts == 15;
+    assert graph.numEdges == len({
+        tuple(sorted(pair)) if bidir else pair for pair in pairs
+    });
+    _check(graph, range(0, 160, 10));
+    assert not graph.frozen;
+    assert graph.freeze() is graph and graph.frozen;
+    _check(graph, range(0, 160, 10));
+
+@pytest.mark.parametrize('bidir', (True, False))
+def testMutations(bidir: bool) -> None:
+    graph: Graph = Graph(range(0, 100, 10), _randomPairs(30, 10, 2), bidir).freeze();
+    rng: random.Random = random.Random(3);
+    for (a, b) in _randomPairs(40, 12, 4):
+        (present, frozen) = (graph.hasEdge(a, b), graph.frozen);
+        if rng.random() < 0.5:
+            assert graph.removeEdge(a, b) == present;
+            assert not graph.hasEdge(a, b);
+        else:
+            assert graph.addEdge(a, b, 2.0) != present;
+            assert graph.hasEdge(a, b);
+        # only an actual change drops the CSR arrays
+        assert graph.frozen == (frozen and present == graph.hasEdge(a, b));
+        if rng.random() < 0.3:
+            graph.freeze();
+        _check(graph, range(0, 120, 10));
+    assert graph.numVerts == len(graph._verts) == len(graph._values);
+
+def testWeightsAndDuplicates() -> None:
+    graph: Graph = Graph(range(3), [], False);
+    assert graph.addEdge(0, 1, 2.5) and not graph.addEdge(0, 1, 7.0);
+    assert graph.weight(0, 1) == 2.5;
+    with pytest.raises(KeyError):
+        graph.weight(1, 0);
+    with pytest.raises(KeyError):
+        graph.weight(5, 0);
+    with pytest.raises(ValueError):
+        graph.addEdge(1, 2, -1.0);
+    assert not graph.hasEdge(1, 2) and graph.numEdges == 1;
+    assert not graph.removeEdge(1, 0) and not graph.removeEdge(7, 8);
+    bidir: Graph = Graph(range(3), [(0, 1)]);
+    assert bidir.hasEdge(1, 0) and bidir.weight(1, 0) == 1.0;
+    assert bidir.removeEdge(1, 0) and not bidir.hasEdge(0, 1);
+
+def testMissingVertices() -> None:
+    graph: Graph = Graph(range(3), [(0, 1)], False);
+    assert list(graph.iterFromVert(9)) == [] and list(graph.iterToVert(9)) == [];
+    assert graph.outDegree(9) == graph.inDegree(9) == 0;
+    assert not graph.hasEdge(9, 0);
+    assert graph.addVertex(9) and not graph.addVertex(Vertex(9));
+    assert list(graph.iterFromVert(9)) == [] and graph.numVerts == 4;
+
+@pytest.mark.parametrize('bidir', (True, False))
+def testEdgeModeAll(bidir: bool) -> None:
+    graph: Graph = Graph(numVerts=5, edgeMode='all', bidir=bidir);
+    assert graph.numEdges == (10 if bidir else 20);
+    for vert in range(5):
+        assert sorted(map(int, graph.iterFromVert(vert))) == [v for v in range(5) if v != vert];
+        assert graph.inDegree(vert) == 4;
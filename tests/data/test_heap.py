@@ -0,0 +1,116 @@
+#!/usr/bin/env -S python3 -i
+'Tests of `data.heap.IndexedHeap` against `heapq` and a dict model'
+# pylint: disable=invalid-name
+# pylint: disable=protected-access
+
+import heapq;
+import random;
+import typing;
+
+import pytest;
+
+from ...data.heap import IndexedHeap;
+
+def _checkInvariants(heap: IndexedHeap) -> None:
+    'Every entry is no less than its parent and the index matches the positions'
+    (items, keys, arity) = (heap._items, heap._keys, heap._arity);
+    assert len(items) == len(keys) == len(heap._index);
+    for pos in range(1, len(keys)):
+        assert not keys[pos] < keys[(pos - 1) // arity];
+    assert all(heap._index[item] == pos for (pos, item) in enumerate(items));
+
+@pytest.mark.parametrize('arity', (2, 3, 4, 8))
+def testHeapSortMatchesHeapq(arity: int) -> None:
+    rng: random.Random = random.Random(arity);
+    keys: typing.List[int] = [rng.randint(0, 50) for _ in range(200)];
+    heap: IndexedHeap = IndexedHeap(enumerate(keys), arity=arity);
+    _checkInvariants(heap);
+    reference: typing.List[typing.Tuple[int, int]] = [(key, item) for (item, key) in enumerate(keys)];
+    heapq.heapify(reference);
+    popped: typing.List[int] = [];
+    while heap:
+        (item, key) = heap.pop();
+        assert keys[item] == key;
+        popped.append(key);
+    assert popped == [heapq.heappop(reference)[0] for _ in range(len(keys))];
+
+@pytest.mark.parametrize('arity', (2, 4, 5))
+def testRandomOperations(arity: int) -> None:
+    rng: random.Random = random.Random(10 + arity);
+    heap: IndexedHeap = IndexedHeap(arity=arity);
+    model: typing.Dict[int, float] = {};
+    for step in range(2000):
+        choice: float = rng.random();
+        item: int = rng.randrange(60);
+        if choice < 0.3:
+            key: float = rng.uniform(0, 100);
+            if item in model:
+                with pytest.raises(KeyError):
+                    heap.push(item, key);
+            else:
+                heap.push(item, key);
+                model[item] = key;
+        elif choice < 0.5 and model:
+            (top, key) = heap.pop();
+            assert key == min(model.values()) and model.pop(top) == key;
+        elif choice < 0.65:
+            if item in model:
+                assert heap.remove(item) == model.pop(item);
+            else:
+                with pytest.raises(KeyError):
+                    heap.remove(item);
+        elif choice < 0.8 and item in model:
+            key: float = model[item] - rng.uniform(0, 10);
+            heap.decreaseKey(item, key);
+            model[item] = key;
+        else:
+            key: float = rng.uniform(0, 100);
+            changed: bool = item not in model or key < model[item];
+            assert heap.pushOrDecrease(item, key) == changed;
+            if changed:
+                model[item] = key;
+        assert len(heap) == len(model) and all((item in heap) == (item in model) for item in range(60));
+        assert all(heap[item] == key for (item, key) in model.items());
+        if step % 50 == 0:
+            _checkInvariants(heap);
+    _checkInvariants(heap);
+
+def testHeapifyIntoNonEmpty() -> None:
+    heap: IndexedHeap = IndexedHeap([('a', 5), ('b', 3)], arity=2);
+    heap.heapify((chr(ord('c') + ind), 10 - ind) for ind in range(8));
+    _checkInvariants(heap);
+    assert [heap.pop()[1] for _ in range(len(heap))] == sorted([5, 3, *range(3, 11)]);
+
+@pytest.mark.parametrize('pairs', (
+    [(7, 0), (8, 9), (1, 1)],
+    [(7, 0), (8, 9), (7, 1)],
+    [(7, 0), (8,)],
+))
+def testHeapifyLeavesHeapUnchanged(pairs: typing.List[typing.Tuple]) -> None:
+    heap: IndexedHeap = IndexedHeap([(1, 5), (2, 3)]);
+    state: str = repr(heap);
+    with pytest.raises((KeyError, ValueError)):
+        heap.heapify(pairs);
+    assert repr(heap) == state and 7 not in heap and 8 not in heap;
+    _checkInvariants(heap);
+    assert heap.peek() == (2, 3) and heap.pop() == (2, 3) and heap.pop() == (1, 5);
+
+def testErrors() -> None:
+    with pytest.raises(ValueError):
+        IndexedHeap(arity=1);
+    with pytest.raises(KeyError):
+        IndexedHeap([(1, 0), (1, 2)]);
+    heap: IndexedHeap = IndexedHeap();
+    with pytest.raises(IndexError):
+        heap.peek();
+    with pytest.raises(IndexError):
+        heap.pop();
+    heap.push('x', 3);
+    with pytest.raises(ValueError):
+        heap.decreaseKey('x', 4);
+    with pytest.raises(KeyError):
+        heap.decreaseKey('y', 1);
+    with pytest.raises(KeyError):
+        heap['y'];
+    assert not heap.pushOrDecrease('x', 3) and heap['x'] == 3;
+    assert heap.pushOrDecrease('x', 1) and heap.peek() == ('x', 1);
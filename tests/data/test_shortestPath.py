@@ -0,0 +1,143 @@
+#!/usr/bin/env -S python3 -i
+'Tests of the shortest-path searches of `data.graph` against Bellman-Ford'
+# pylint: disable=invalid-name
+
+import math;
+import random;
+import typing;
+
+import pytest;
+
+from ...data.graph import Vertex, Graph, CompactGraph, Traversal;
+
+_Weighted = typing.List[typing.Tuple[int, int, float]];
+
+def _randomEdges(count: int, numVerts: int, seed: int) -> _Weighted:
+    'Random edges without loops or repeated pairs, with small integral weights'
+    rng: random.Random = random.Random(seed);
+    (edges, seen) = ([], set());
+    while len(edges) < count:
+        (a, b) = (rng.randrange(numVerts), rng.randrange(numVerts));
+        if a != b and (a, b) not in seen and (b, a) not in seen:
+            seen.add((a, b));
+            edges.append((a, b, float(rng.randint(0, 9))));
+    return edges;
+
+@pytest.fixture(params=('Graph', 'CompactGraph'))
+def build(request: pytest.FixtureRequest) -> typing.Callable[..., Traversal]:
+    'Build either graph class over the vertices `[0, numVerts)` from weighted edges'
+    def make(numVerts: int, edges: _Weighted, bidir: bool = False) -> Traversal:
+        if request.param == 'CompactGraph':
+            return CompactGraph(
+                numVerts, [(a, b) for (a, b, _) in edges],
+                [weight for (_, _, weight) in edges], bidir=bidir
+            );
+        graph: Graph = Graph(range(numVerts), [], bidir);
+        for (a, b, weight) in edges:
+            graph.addEdge(a, b, weight);
+        return graph;
+    return make;
+
+def _bellmanFord(
+        numVerts: int, edges: _Weighted, sources: typing.Iterable[int],
+        bidir: bool, exclude: typing.Container[int] = ()) -> typing.List[float]:
+    dist: typing.List[float] = [math.inf] * numVerts;
+    for source in sources:
+        if source not in exclude:
+            dist[source] = 0.0;
+    arcs: _Weighted = edges + [(b, a, weight) for (a, b, weight) in edges] if bidir else edges;
+    for _ in range(numVerts):
+        for (a, b, weight) in arcs:
+            if a not in exclude and b not in exclude and dist[a] + weight < dist[b]:
+                dist[b] = dist[a] + weight;
+    return dist;
+
+def _length(graph: Traversal, path: typing.Sequence[Vertex]) -> float:
+    return sum(graph.weight(a, b) for (a, b) in zip(path, path[1:]));
+
+@pytest.mark.parametrize('bidir', (True, False))
+@pytest.mark.parametrize('seed', range(3))
+def testDistancesMatchReference(build: typing.Callable, bidir: bool, seed: int) -> None:
+    edges: _Weighted = _randomEdges(60, 20, seed);
+    graph: Traversal = build(20, edges, bidir);
+    for source in range(0, 20, 3):
+        expected: typing.List[float] = _bellmanFord(20, edges, [source], bidir, {seed + 1});
+        (dist, parents) = graph.dijkstra(source, exclude=[seed + 1]);
+        assert dist == {vert: d for (vert, d) in enumerate(expected) if d < math.inf};
+        for (vert, parent) in parents.items():
+            assert (parent is None) == (vert == source);
+            if parent is not None:
+                assert dist[parent] + graph.weight(parent, vert) == dist[vert];
+        for target in range(20):
+            reach: float = expected[target];
+            for (length, path) in (
+                    graph.shortestPath(source, target, exclude=[seed + 1]),
+                    graph.aStar(source, target, lambda *_: 0.0, exclude=[seed + 1]),
+                    graph.bidirectionalDijkstra(source, target, exclude=[seed + 1])):
+                assert length == reach;
+                if reach == math.inf:
+                    assert path == ();
+                else:
+                    assert (path[0], path[-1]) == (source, target);
+                    assert _length(graph, path) == reach and seed + 1 not in path;
+
+def testAStarHeuristic(build: typing.Callable) -> None:
+    'A grid with unit steps: the Manhattan distance is admissible and consistent'
+    side: int = 8;
+    edges: _Weighted = [];
+    for row in range(side):
+        for col in range(side):
+            if col + 1 < side:
+                edges.append((row * side + col, row * side + col + 1, 1.0));
+            if row + 1 < side:
+                edges.append((row * side + col, (row + 1) * side + col, 1.0));
+    graph: Traversal = build(side * side, edges, True);
+    manhattan: typing.Callable = lambda a, b: float(
+        abs(a // side - b // side) + abs(a % side - b % side)
+    );
+    for target in (0, 9, 63, 36):
+        (length, path) = graph.aStar(27, target, manhattan);
+        assert length == manhattan(27, target) and len(path) == length + 1;
+
+def testMultiSource(build: typing.Callable) -> None:
+    edges: _Weighted = _randomEdges(50, 18, 7);
+    graph: Traversal = build(18, edges, True);
+    sources: typing.List[int] = [2, 11, 15];
+    expected: typing.List[float] = _bellmanFord(18, edges, sources, True);
+    assert graph.dijkstra(sources)[0] == {
+        vert: d for (vert, d) in enumerate(expected) if d < math.inf
+    };
+    for (vert, (source, distance)) in graph.nearestSources(sources).items():
+        assert source in sources and distance == expected[vert];
+        assert distance == _bellmanFord(18, edges, [source], True)[vert];
+    for target in range(18):
+        assert graph.shortestPath(sources, target)[0] == expected[target];
+
+@pytest.mark.parametrize('bidir', (True, False))
+def testBidirectionalBFS(build: typing.Callable, bidir: bool) -> None:
+    edges: _Weighted = _randomEdges(40, 25, 3);
+    graph: Traversal = build(25, edges, bidir);
+    for source in range(0, 25, 4):
+        depths: typing.Dict[int, int] = graph.depths(source, exclude=[6]);
+        for target in range(25):
+            path: typing.Tuple[Vertex, ...] = graph.bidirectionalBFS(source, target, exclude=[6]);
+            if target not in depths:
+                assert path == ();
+                continue;
+            assert len(path) == depths[target] + 1 and (path[0], path[-1]) == (source, target);
+            assert all(graph.hasEdge(a, b) for (a, b) in zip(path, path[1:])) and 6 not in path;
+
+def testMissingAndExcludedEnds(build: typing.Callable) -> None:
+    graph: Traversal = build(4, [(0, 1, 1.0), (1, 2, 1.0)]);
+    for target in (9, -1):
+        assert graph.shortestPath(0, target) == (math.inf, ());
+        assert graph.bidirectionalDijkstra(0, target) == (math.inf, ());
+        assert graph.bidirectionalBFS(0, target) == ();
+    assert graph.bidirectionalDijkstra(0, 3) == (math.inf, ()) and graph.bidirectionalBFS(0, 3) == ();
+    assert graph.bidirectionalDijkstra(0, 2, exclude=[2]) == (math.inf, ());
+    assert graph.bidirectionalBFS(0, 2, exclude=[0]) == ();
+    assert graph.bidirectionalDijkstra(1, 1) == (0.0, (Vertex(1),));
+    assert graph.bidirectionalBFS(2, 2) == (Vertex(2),);
+    for search in (graph.shortestPath, graph.bidirectionalDijkstra, graph.bidirectionalBFS):
+        with pytest.raises(KeyError):
+            search(9, 0);
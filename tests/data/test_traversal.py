@@ -0,0 +1,130 @@
+#!/usr/bin/env -S python3 -i
+'Tests of the iterative traversals of `data.graph` against textbook versions'
+# pylint: disable=invalid-name
+
+import random;
+import typing;
+import collections as c;
+
+import pytest;
+
+from ...data.graph import Vertex, Graph, CompactGraph, Traversal;
+
+_Pairs = typing.List[typing.Tuple[int, int]];
+
+@pytest.fixture(params=('Graph', 'CompactGraph'))
+def build(request: pytest.FixtureRequest) -> typing.Callable[..., Traversal]:
+    'Build either graph class over the vertices `[0, numVerts)` from pairs'
+    def make(numVerts: int, pairs: _Pairs, bidir: bool = False) -> Traversal:
+        if request.param == 'CompactGraph':
+            return CompactGraph(numVerts, pairs, bidir=bidir);
+        return Graph(range(numVerts), pairs, bidir);
+    return make;
+
+def _randomPairs(count: int, numVerts: int, seed: int) -> _Pairs:
+    rng: random.Random = random.Random(seed);
+    return [(rng.randrange(numVerts), rng.randrange(numVerts)) for _ in range(count)];
+
+def _neighbors(graph: Traversal, vert: int) -> typing.List[int]:
+    return list(map(int, graph.iterFromVert(vert)));
+
+def _recursiveDFS(
+        graph: Traversal, source: int, exclude: typing.Set[int],
+        depthLimit: typing.Optional[int] = None) -> typing.List[int]:
+    'Recursive preorder, visiting neighbors in `iterFromVert` order'
+    (order, seen) = ([], set(exclude));
+    def visit(vert: int, depth: int) -> None:
+        seen.add(vert);
+        order.append(vert);
+        if depthLimit is not None and depth >= depthLimit:
+            return;
+        for other in _neighbors(graph, vert):
+            if other not in seen:
+                visit(other, depth + 1);
+    if source not in seen:
+        visit(source, 0);
+    return order;
+
+def _queueBFS(
+        graph: Traversal, sources: typing.List[int],
+        exclude: typing.Set[int]) -> typing.Dict[int, int]:
+    'Depths by a deque-driven BFS; dicts keep the visit order'
+    depth: typing.Dict[int, int] = {};
+    queue: c.deque = c.deque();
+    for source in sources:
+        if source not in exclude and source not in depth:
+            depth[source] = 0;
+            queue.append(source);
+    while queue:
+        vert: int = queue.popleft();
+        for other in _neighbors(graph, vert):
+            if other not in exclude and other not in depth:
+                depth[other] = depth[vert] + 1;
+                queue.append(other);
+    return depth;
+
+def _isPath(graph: Traversal, path: typing.Sequence[Vertex]) -> bool:
+    return all(graph.hasEdge(a, b) for (a, b) in zip(path, path[1:]));
+
+@pytest.mark.parametrize('bidir', (True, False))
+@pytest.mark.parametrize('seed', range(4))
+def testOrdersMatchReference(build: typing.Callable, bidir: bool, seed: int) -> None:
+    graph: Traversal = build(30, _randomPairs(45, 30, seed), bidir);
+    exclude: typing.Set[int] = {seed + 3, seed + 7};
+    for source in range(0, 30, 4):
+        assert list(graph.iterDFS(source, exclude=exclude)) == _recursiveDFS(graph, source, exclude);
+        assert list(graph.iterDFS(source, depthLimit=2)) == _recursiveDFS(graph, source, set(), 2);
+        expected: typing.Dict[int, int] = _queueBFS(graph, [source], exclude);
+        assert list(graph.iterBFS(source, exclude=exclude)) == list(expected);
+        assert graph.depths(source, exclude=exclude) == expected;
+        assert graph.depths(source, exclude=exclude, depthLimit=2) == {
+            vert: depth for (vert, depth) in expected.items() if depth <= 2
+        };
+    sources: typing.List[int] = [5, 1, 5, 20];
+    assert graph.depths(sources) == _queueBFS(graph, sources, set());
+
+@pytest.mark.parametrize('mode', ('dfs', 'bfs'))
+def testTreesAndPaths(build: typing.Callable, mode: str) -> None:
+    graph: Traversal = build(25, _randomPairs(40, 25, 9));
+    depth: typing.Dict[int, int] = _queueBFS(graph, [0], {4});
+    parents: typing.Dict[int, typing.Optional[int]] = graph.parents(0, mode=mode, exclude=[4]);
+    assert set(parents) == set(depth) and parents[0] is None;
+    edges: _Pairs = list(graph.iterTreeEdges(0, mode=mode, exclude=[4]));
+    assert edges == [(parent, child) for (child, parent) in parents.items() if parent is not None];
+    assert all(graph.hasEdge(a, b) for (a, b) in edges);
+    search: typing.Callable = graph.dfs if mode == 'dfs' else graph.bfs;
+    for target in range(25):
+        path: typing.Sequence[Vertex] = search(0, target, [4]);
+        if target not in depth:
+            assert path == ();
+            continue;
+        assert path[0] == 0 and path[-1] == target and _isPath(graph, path);
+        assert all(isinstance(vert, Vertex) for vert in path) and 4 not in path;
+        if mode == 'bfs':
+            assert len(path) == depth[target] + 1;
+    if mode == 'bfs':
+        assert all(depth[parents[child]] == depth[child] - 1 for child in depth if child != 0);
+
+def testLimitsAndMissing(build: typing.Callable) -> None:
+    graph: Traversal = build(6, [(0, 1), (1, 2), (2, 3), (3, 4)]);
+    assert graph.bfs(0, 4) == tuple(map(Vertex, range(5)));
+    assert graph.bfs(0, 4, depthLimit=3) == () and graph.dfs(0, 4, depthLimit=3) == ();
+    assert graph.dfs(0, 5) == () and graph.bfs(0, 9) == () and graph.dfs(0, 9) == ();
+    assert graph.bfs(0, 4, [2]) == () and graph.dfs(0, 0) == (Vertex(0),);
+    assert graph.dfs(0, 0, [0]) == ();
+    with pytest.raises(KeyError):
+        graph.bfs(9, 0);
+    with pytest.raises(KeyError):
+        list(graph.iterDFS([0, 9]));
+    with pytest.raises(ValueError):
+        graph.parents(0, mode='dijkstra');
+
+def testLongPathAndEarlyExit(build: typing.Callable) -> None:
+    size: int = 20000;
+    graph: Traversal = build(size, [(ind, ind + 1) for ind in range(size - 1)]);
+    path: typing.Sequence[Vertex] = graph.dfs(0, size - 1);
+    assert len(path) == size and path[-1] == size - 1;
+    assert len(list(graph.iterDFS(0))) == size;
+    # generators stop when the caller does
+    walk: typing.Iterator[int] = graph.iterBFS(0);
+    assert [next(walk) for _ in range(3)] == [0, 1, 2];
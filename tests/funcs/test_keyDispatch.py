@@ -0,0 +1,68 @@
+#!/usr/bin/env -S python3 -i
+'Tests of `funcs.keyDispatch`'
+# pylint: disable=invalid-name
+# pylint: disable=function-redefined
+
+import typing;
+import asyncio;
+
+from ...funcs import keyDispatch as kd;
+
+def _make(base: type) -> typing.Callable:
+    'A dispatcher by keywords, with sync and async registrations'
+    @base
+    def area(**kwargs: typing.Any) -> str:
+        return f'default{sorted(kwargs)}';
+    @area.register('side')
+    async def area(*, side: int, **__) -> int:
+        await asyncio.sleep(0);
+        return side * side;
+    @area.register('width', 'height')
+    def area(*, width: int, height: int, **__) -> int:
+        return width * height;
+    @area.register('radius')
+    async def area(*, radius: int, **__) -> typing.Any:
+        return NotImplemented if radius < 0 else 3 * radius * radius;
+    @area.register('points')
+    def area(**__) -> int:
+        raise NotImplementedError;
+    return area;
+
+def testSyncDispatch() -> None:
+    @kd.keywordPriorityDispatch
+    def area(**__) -> str:
+        return 'default';
+    @area.register('width', 'height')
+    def area(*, width: int, height: int, **__) -> int:
+        return width * height;
+    @area.register('side', 'width', mode='or')
+    def area(**__) -> typing.Any:
+        return NotImplemented;
+    assert area(width=2, height=3) == 6;
+    assert area(side=2) == 'default';
+    assert area(width=2) == 'default';
+    assert area() == 'default';
+
+def testAsyncDispatch() -> None:
+    area: kd.asyncKeywordPriorityDispatch = _make(kd.asyncKeywordPriorityDispatch);
+    async def run() -> typing.List[typing.Any]:
+        return await asyncio.gather(
+            area(side=3),
+            area(width=2, height=5),
+            area(radius=2),
+            # NotImplemented and NotImplementedError are seen after awaiting
+            area(radius=-1),
+            area(points=()),
+            area(other=1),
+        );
+    assert asyncio.run(run()) == [
+        9, 10, 12, "default['radius']", "default['points']", "default['other']",
+    ];
+    # resolution is cached per set of keys
+    assert area._dispatch(*('side',)) is area._dispatch(*('side',));
+
+def testAsyncAlwaysAwaitable() -> None:
+    area: kd.asyncKeywordPriorityDispatch = _make(kd.asyncKeywordPriorityDispatch);
+    pending: typing.Any = area(width=1, height=1);
+    assert asyncio.iscoroutine(pending);
+    assert asyncio.run(pending) == 1;
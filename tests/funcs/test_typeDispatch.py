@@ -0,0 +1,184 @@
+#!/usr/bin/env -S python3 -i
+'Tests of `funcs.typeDispatch`'
+# pylint: disable=invalid-name
+# pylint: disable=function-redefined
+
+import abc;
+import typing;
+import asyncio;
+import collections as c;
+
+import pytest;
+
+from ...funcs import typeDispatch as td;
+from ...data.annoType import Union, Tuple, List, typeSignature;
+
+def _describer() -> typing.Callable:
+    'A dispatcher on Union and Tuple annotations and plain classes'
+    @td.staticMethodDispatch
+    def describe(_: typing.Any) -> str:
+        return 'default';
+    @describe.register(Union[int, float])
+    def _(_: typing.Any) -> str:
+        return 'number';
+    @describe.register(Tuple[int, str])
+    def _(_: typing.Any) -> str:
+        return 'pair';
+    @describe.register(Tuple[int, Tuple[int, int]])
+    def _(_: typing.Any) -> str:
+        return 'nested';
+    @describe.register(str)
+    def _(_: typing.Any) -> str:
+        return 'text';
+    return describe;
+
+def _reference(obj: typing.Any) -> str:
+    'What `_describer` should answer, using isinstance directly'
+    for (anno, name) in (
+            (Union[int, float], 'number'),
+            (Tuple[int, str], 'pair'),
+            (Tuple[int, Tuple[int, int]], 'nested')):
+        if isinstance(obj, anno):
+            return name;
+    return 'text' if isinstance(obj, str) else 'default';
+
+def testDispatchMatchesIsinstance() -> None:
+    describe: typing.Callable = _describer();
+    samples: typing.Tuple = (
+        1, 2.5, 'a', (1, 'a'), ('a', 1), (1, (2, 3)), (1, (2, 'x')),
+        (1, 'a', 2), (), None, [1, 'a'], True,
+    );
+    # twice: the second round is answered from the cache
+    for _ in range(2):
+        for obj in samples:
+            assert describe(obj) == _reference(obj), obj;
+
+def testPlainRegistrationByAnnotation() -> None:
+    @td.staticMethodDispatch
+    def kind(_: typing.Any) -> str:
+        return 'default';
+    @kind.register
+    def _(_: Tuple[int, int]) -> str:
+        return 'ints';
+    @kind.register
+    def _(_: bytes) -> str:
+        return 'bytes';
+    assert kind((1, 2)) == 'ints';
+    assert kind((1, 'a')) == 'default';
+    assert kind(b'') == 'bytes';
+    assert kind.dispatch(bytes)(b'') == 'bytes';
+
+def testSignatureBudget() -> None:
+    assert typeSignature((1, ('a', 2.0))) == (tuple, int, (tuple, str, float));
+    assert typeSignature((1, ('a', 2.0)), 5) == (tuple, int, (tuple, str, float));
+    assert typeSignature((1, ('a', 2.0)), 4) is None;
+    assert typeSignature(tuple(range(1000)), 32) is None;
+    assert typeSignature(7, 1) is int;
+
+def testCacheIsBounded(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(td, 'CACHE_SIZE', 4);
+    describe: typing.Callable = _describer();
+    dispatcher: td.annoSingleDispatch = describe.__wrapped__;
+    # one shape per tuple length
+    for size in range(3 * td.SIGNATURE_BUDGET // 4):
+        assert describe((0,) * size) == _reference((0,) * size);
+        assert len(dispatcher._cache) <= 4;
+    # the most recently used shapes are kept
+    describe((1, 'a'));
+    describe((1, (2, 3)));
+    assert (tuple, int, str) in dispatcher._cache;
+    assert next(reversed(dispatcher._cache)) == (tuple, int, (tuple, int, int));
+    assert describe((1, 'a')) == 'pair';
+    assert next(reversed(dispatcher._cache)) == (tuple, int, str);
+
+def testLargeObjectsAreNotCached() -> None:
+    describe: typing.Callable = _describer();
+    dispatcher: td.annoSingleDispatch = describe.__wrapped__;
+    big: tuple = tuple(range(10 * td.SIGNATURE_BUDGET));
+    assert describe(big) == 'default';
+    assert not dispatcher._cache;
+
+def testUncacheableAnnotations() -> None:
+    @td.staticMethodDispatch
+    def kind(_: typing.Any) -> str:
+        return 'default';
+    @kind.register(List[int])
+    def _(_: typing.Any) -> str:
+        return 'ints';
+    # the element types of lists are not in the signature
+    assert kind([1, 2]) == 'ints';
+    assert kind(['a']) == 'default';
+    assert kind([3]) == 'ints';
+
+def testNamedTupleSignatures() -> None:
+    Pair: type = c.namedtuple('Pair', 'a b');
+    @td.staticMethodDispatch
+    def kind(_: typing.Any) -> str:
+        return 'default';
+    @kind.register(Tuple[int, int])
+    def _(_: typing.Any) -> str:
+        return 'ints';
+    @kind.register(Tuple[str, str])
+    def _(_: typing.Any) -> str:
+        return 'strs';
+    assert typeSignature(Pair(1, 'a')) == (Pair, int, str);
+    assert typeSignature(Pair(1, 'a'), 3) == (Pair, int, str);
+    # twice: the second round is answered from the cache
+    for _ in range(2):
+        assert kind(Pair(1, 2)) == 'ints';
+        assert kind(Pair('a', 'b')) == 'strs';
+        assert kind(Pair(1, 'b')) == 'default';
+
+def testABCRegistrationClearsCache() -> None:
+    class Base(abc.ABC):
+        pass;
+    class Late:
+        pass;
+    @td.staticMethodDispatch
+    def kind(_: typing.Any) -> str:
+        return 'default';
+    @kind.register(Union[Base, int])
+    def _(_: typing.Any) -> str:
+        return 'base';
+    assert kind(Late()) == 'default';
+    Base.register(Late);
+    assert isinstance(Late(), Union[Base, int]);
+    assert kind(Late()) == 'base';
+
+def testMissingArgument() -> None:
+    describe: typing.Callable = _describer();
+    with pytest.raises(TypeError):
+        describe();
+
+def testAsyncDispatch() -> None:
+    @td.asyncStaticMethodDispatch
+    async def handle(obj: typing.Any) -> str:
+        return f'default:{obj}';
+    @handle.register(Union[int, float])
+    async def _(obj: typing.Any) -> str:
+        await asyncio.sleep(0);
+        return f'number:{obj}';
+    @handle.register(str)
+    def _(obj: typing.Any) -> str:
+        # sync implementations share the dispatcher
+        return f'text:{obj}';
+    @handle.register(Tuple[int, int])
+    async def _(_: typing.Any) -> typing.Any:
+        await asyncio.sleep(0);
+        return NotImplemented;
+    @handle.register(bytes)
+    async def _(_: typing.Any) -> str:
+        raise NotImplementedError;
+
+    async def run() -> typing.List[str]:
+        return await asyncio.gather(*map(handle, (1, 'a', (1, 2), b'x', None)));
+    assert asyncio.run(run()) == [
+        'number:1', 'text:a', 'default:(1, 2)', "default:b'x'", 'default:None',
+    ];
+
+def testAsyncDefaultErrors() -> None:
+    @td.asyncStaticMethodDispatch
+    async def handle(_: typing.Any) -> str:
+        raise NotImplementedError;
+    with pytest.raises(NotImplementedError):
+        asyncio.run(handle(1));